@@ -0,0 +1 @@
+"""Offline benchmark suite for AI Agents Hub."""
@@ -0,0 +1,362 @@
+"""Deterministic stand-in for a local Ollama server.
+
+The server speaks enough of the native Ollama API (``/api/*``) and of its
+OpenAI-compatible surface (``/v1/*``) for the agents to run offline. Every
+response is derived from a hash of the request, so repeated runs produce the
+same text and the same embeddings, while latency is shaped by a configurable
+fixed delay, prefill rate and generation rate.
+"""
+
+import hashlib
+import json
+import math
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+WORDS = [
+    "agent", "analysis", "code", "context", "data", "design", "function",
+    "improve", "issue", "knowledge", "learning", "model", "module", "review",
+    "quality", "result", "security", "structure", "test", "value",
+]
+
+@dataclass
+class FakeOllamaConfig:
+    """Latency and output shape of the stand-in server."""
+    latency: float = 0.0
+    tokens_per_second: float = 0.0
+    prefill_tokens_per_second: float = 0.0
+    response_tokens: int = 64
+    embedding_dims: int = 768
+    # Per-model multipliers for all delays, e.g. {"deepseek-r1": 5.0} for a slower large model
+    model_latency_factors: Dict[str, float] = field(default_factory=dict)
+
+def count_tokens(text: str) -> int:
+    """Approximate the token count of a text the same way for every request."""
+    return len(text.split())
+
+def deterministic_text(seed: str, n_tokens: int) -> List[str]:
+    """Build a reproducible list of words from a seed string."""
+    digest = hashlib.sha256(seed.encode("utf-8")).digest()
+    return [WORDS[digest[i % len(digest)] % len(WORDS)] for i in range(n_tokens)]
+
+def deterministic_embedding(text: str, dims: int) -> List[float]:
+    """Build a reproducible unit vector for a text."""
+    vector = [0.0] * dims
+    for token in text.lower().split():
+        digest = hashlib.md5(token.encode("utf-8")).digest()
+        index = int.from_bytes(digest[:4], "little") % dims
+        vector[index] += 1.0 if digest[4] % 2 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    """Request handler serving deterministic completions and embeddings."""
+
+    server_version = "FakeOllama/0.1"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        """Silence per-request logging."""
+
+    @property
+    def config(self) -> FakeOllamaConfig:
+        return self.server.fake_config
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send_json(self, payload: Dict, status: int = 200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_stream(self, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _end_stream(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _prefill(self, prompt_tokens: int, factor: float = 1.0):
+        """Sleep for the fixed latency plus the simulated prompt evaluation."""
+        delay = self.config.latency
+        if self.config.prefill_tokens_per_second > 0:
+            delay += prompt_tokens / self.config.prefill_tokens_per_second
+        if delay > 0:
+            time.sleep(delay * factor)
+
+    def _decode_delay(self, factor: float = 1.0):
+        if self.config.tokens_per_second > 0:
+            time.sleep(factor / self.config.tokens_per_second)
+
+    def _generate_tokens(self, seed: str, prompt_tokens: int, stream_writer=None) -> str:
+        model = seed.split("|", 1)[0]
+        factor = self.config.model_latency_factors.get(model, 1.0)
+        self.server.record("prompt_tokens", prompt_tokens)
+        self.server.record(f"requests:{model}", 1)
+        self._prefill(prompt_tokens, factor)
+        words = deterministic_text(seed, self.config.response_tokens)
+        pieces = []
+        for i, word in enumerate(words):
+            self._decode_delay(factor)
+            piece = word if i == 0 else " " + word
+            pieces.append(piece)
+            if stream_writer:
+                stream_writer(piece)
+        self.server.record("eval_tokens", len(words))
+        return "".join(pieces)
+
+    def do_GET(self):
+        self.server.record("requests", 1)
+        if self.path.startswith("/api/tags"):
+            self._send_json({"models": [{"name": name} for name in self.server.models]})
+        elif self.path.startswith("/api/version"):
+            self._send_json({"version": "0.0.0-fake"})
+        elif self.path.startswith("/v1/models"):
+            self._send_json({"object": "list", "data": [{"id": name, "object": "model"} for name in self.server.models]})
+        else:
+            self._send_json({"error": f"unknown endpoint {self.path}"}, status=404)
+
+    def do_POST(self):
+        self.server.record("requests", 1)
+        payload = self._read_json()
+        routes = {
+            "/api/generate": self._api_generate,
+            "/api/chat": self._api_chat,
+            "/api/embeddings": self._api_embeddings,
+            "/api/embed": self._api_embed,
+            "/v1/chat/completions": self._openai_chat,
+            "/v1/embeddings": self._openai_embeddings,
+        }
+        handler = routes.get(self.path.split("?")[0])
+        if handler is None:
+            self._send_json({"error": f"unknown endpoint {self.path}"}, status=404)
+            return
+        handler(payload)
+
+    def _api_generate(self, payload: Dict):
+        prompt = payload.get("prompt", "")
+        system = payload.get("system", "")
+        context = payload.get("context") or []
+        # Tokens already held in the context are not prefilled again.
+        new_tokens = count_tokens(prompt) + (0 if context else count_tokens(system))
+        model = payload.get("model", "")
+        seed = f"{model}|{system}|{len(context)}|{prompt}"
+        stream = payload.get("stream", True)
+
+        def done(text: str) -> Dict:
+            response_tokens = count_tokens(text)
+            return {
+                "model": model,
+                "response": "" if stream else text,
+                "done": True,
+                "context": list(context) + list(range(len(context), len(context) + new_tokens + response_tokens)),
+                "prompt_eval_count": new_tokens,
+                "eval_count": response_tokens,
+            }
+
+        if not stream:
+            self._send_json(done(self._generate_tokens(seed, new_tokens)))
+            return
+        self._start_stream("application/x-ndjson")
+        text = self._generate_tokens(
+            seed, new_tokens,
+            lambda piece: self._write_chunk(json.dumps({"model": model, "response": piece, "done": False}).encode("utf-8") + b"\n"),
+        )
+        self._write_chunk(json.dumps(done(text)).encode("utf-8") + b"\n")
+        self._end_stream()
+
+    def _api_chat(self, payload: Dict):
+        messages = payload.get("messages", [])
+        prompt = "\n".join(str(m.get("content", "")) for m in messages)
+        model = payload.get("model", "")
+        prompt_tokens = count_tokens(prompt)
+        stream = payload.get("stream", True)
+        if not stream:
+            text = self._generate_tokens(f"{model}|{prompt}", prompt_tokens)
+            self._send_json({
+                "model": model,
+                "message": {"role": "assistant", "content": text},
+                "done": True,
+                "prompt_eval_count": prompt_tokens,
+                "eval_count": count_tokens(text),
+            })
+            return
+        self._start_stream("application/x-ndjson")
+        self._generate_tokens(
+            f"{model}|{prompt}", prompt_tokens,
+            lambda piece: self._write_chunk(json.dumps({"model": model, "message": {"role": "assistant", "content": piece}, "done": False}).encode("utf-8") + b"\n"),
+        )
+        self._write_chunk(json.dumps({"model": model, "done": True, "prompt_eval_count": prompt_tokens}).encode("utf-8") + b"\n")
+        self._end_stream()
+
+    def _api_embeddings(self, payload: Dict):
+        self.server.record("embeddings", 1)
+        self._prefill(0)
+        self._send_json({"embedding": deterministic_embedding(payload.get("prompt", ""), self.config.embedding_dims)})
+
+    def _api_embed(self, payload: Dict):
+        inputs = payload.get("input", "")
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        self.server.record("embeddings", len(inputs))
+        self._prefill(0)
+        self._send_json({
+            "model": payload.get("model", ""),
+            "embeddings": [deterministic_embedding(text, self.config.embedding_dims) for text in inputs],
+        })
+
+    def _openai_chat(self, payload: Dict):
+        messages = payload.get("messages", [])
+        prompt = "\n".join(
+            m["content"] if isinstance(m.get("content"), str) else json.dumps(m.get("content"))
+            for m in messages
+        )
+        model = payload.get("model", "")
+        prompt_tokens = count_tokens(prompt)
+        created = int(time.time())
+        completion_id = "chatcmpl-" + hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:12]
+        if not payload.get("stream"):
+            text = self._generate_tokens(f"{model}|{prompt}", prompt_tokens)
+            self._send_json({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": count_tokens(text),
+                    "total_tokens": prompt_tokens + count_tokens(text),
+                },
+            })
+            return
+
+        def event(delta: Dict, finish_reason: Optional[str] = None) -> bytes:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            return b"data: " + json.dumps(chunk).encode("utf-8") + b"\n\n"
+
+        self._start_stream("text/event-stream")
+        self._write_chunk(event({"role": "assistant", "content": ""}))
+        self._generate_tokens(
+            f"{model}|{prompt}", prompt_tokens,
+            lambda piece: self._write_chunk(event({"content": piece})),
+        )
+        self._write_chunk(event({}, "stop"))
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._end_stream()
+
+    def _openai_embeddings(self, payload: Dict):
+        inputs = payload.get("input", "")
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        self.server.record("embeddings", len(inputs))
+        self._prefill(0)
+        data = [
+            {"object": "embedding", "index": i, "embedding": deterministic_embedding(str(text), self.config.embedding_dims)}
+            for i, text in enumerate(inputs)
+        ]
+        self._send_json({"object": "list", "data": data, "model": payload.get("model", "")})
+
+class FakeOllamaServer:
+    """Threaded stand-in Ollama server usable as a context manager.
+
+    Example:
+        with FakeOllamaServer(FakeOllamaConfig(latency=0.05, tokens_per_second=200)) as server:
+            os.environ["OLLAMA_BASE_URL"] = server.url
+            os.environ["OPENAI_BASE_URL"] = server.openai_url
+    """
+
+    def __init__(self, config: Optional[FakeOllamaConfig] = None, host: str = "127.0.0.1", port: int = 0,
+                 models: Optional[List[str]] = None):
+        self.config = config or FakeOllamaConfig()
+        self.models = models or [
+            "deepseek-r1:latest", "deepseek-r1:1.5b", "mistral:latest", "nomic-embed-text:latest",
+        ]
+        self._httpd = ThreadingHTTPServer((host, port), FakeOllamaHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake_config = self.config
+        self._httpd.models = self.models
+        self._httpd.record = self._record
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, int] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def _record(self, key: str, value: int):
+        with self._stats_lock:
+            self.stats[key] = self.stats.get(key, 0) + value
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def openai_url(self) -> str:
+        return f"{self.url}/v1"
+
+    def describe(self) -> Dict:
+        """Return the server configuration for inclusion in benchmark records."""
+        return asdict(self.config)
+
+    def start(self) -> "FakeOllamaServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-ollama", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a deterministic stand-in Ollama server.")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency", type=float, default=0.0, help="Fixed delay per request in seconds")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Generation rate (0 = unlimited)")
+    parser.add_argument("--prefill-tokens-per-second", type=float, default=0.0, help="Prompt evaluation rate (0 = unlimited)")
+    parser.add_argument("--response-tokens", type=int, default=64)
+    args = parser.parse_args()
+
+    server = FakeOllamaServer(FakeOllamaConfig(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        prefill_tokens_per_second=args.prefill_tokens_per_second,
+        response_tokens=args.response_tokens,
+    ), port=args.port)
+    print(f"Fake Ollama listening on {server.url} (OpenAI API at {server.openai_url})")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server._httpd.server_close()
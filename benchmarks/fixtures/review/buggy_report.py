@@ -0,0 +1,26 @@
+"""Ordinary bugs and style issues without security impact."""
+
+
+def average(values=[]):
+    total = 0
+    for i in range(len(values)):
+        if values[i] == None:
+            continue
+        total += values[i]
+    return total / len(values)
+
+
+def parse_scores(lines):
+    scores = {}
+    for line in lines:
+        try:
+            name, score = line.split(",")
+            scores[name] = int(score)
+        except:
+            pass
+    return scores
+
+
+def render(scores):
+    # TODO: sort by score
+    return "\n".join(f"{name}: {score}" for name, score in scores.items())
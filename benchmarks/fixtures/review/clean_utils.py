@@ -0,0 +1,32 @@
+"""Small, well-behaved helpers: the cascade should keep these on the triage model."""
+
+
+def chunked(items, size):
+    """Yield successive lists of at most ``size`` items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def slugify(title):
+    """Lower-case a title and join its words with dashes."""
+    words = [word for word in title.lower().split() if word.isalnum()]
+    return "-".join(words)
+
+
+class Counter:
+    """Count occurrences of hashable values."""
+
+    def __init__(self):
+        self.counts = {}
+
+    def add(self, value):
+        self.counts[value] = self.counts.get(value, 0) + 1
+
+    def most_common(self, n=1):
+        return sorted(self.counts.items(), key=lambda pair: pair[1], reverse=True)[:n]
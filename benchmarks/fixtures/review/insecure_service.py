@@ -0,0 +1,27 @@
+"""Security problems the cascade must always escalate."""
+import hashlib
+import pickle
+import sqlite3
+import subprocess
+
+API_KEY = "sk-live-1234567890"
+
+
+def find_user(conn, name):
+    return conn.execute(f"SELECT * FROM users WHERE name = '{name}'").fetchall()
+
+
+def load_session(blob):
+    return pickle.loads(blob)
+
+
+def archive(path):
+    subprocess.run(f"tar czf backup.tgz {path}", shell=True)
+
+
+def hash_password(password):
+    return hashlib.md5(password.encode()).hexdigest()
+
+
+def open_db(path):
+    return sqlite3.connect(path)
@@ -0,0 +1,184 @@
+"""Timing helpers and result history for the benchmark suite."""
+
+import json
+import math
+import platform
+import statistics
+import subprocess
+import time
+import traceback
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from fractions import Fraction
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_HISTORY_PATH = Path(__file__).parent / "results" / "history.jsonl"
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    # Exact arithmetic: in floats 7 / 100 * 100 is 7.000000000000001, one rank too high
+    rank = max(0, min(len(ordered) - 1, math.ceil(Fraction(str(pct)) * len(ordered) / 100) - 1))
+    return ordered[rank]
+
+@dataclass
+class BenchmarkResult:
+    """Timing samples and derived statistics for one benchmark case."""
+    name: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    samples: List[float] = field(default_factory=list)
+    units_per_sample: Optional[float] = None
+    unit: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        params = ",".join(f"{k}={self.params[k]}" for k in sorted(self.params))
+        return f"{self.name}[{params}]" if params else self.name
+
+    def stats(self) -> Dict[str, float]:
+        if not self.samples:
+            return {}
+        stats = {
+            "n": len(self.samples),
+            "mean": statistics.fmean(self.samples),
+            "median": statistics.median(self.samples),
+            "p95": percentile(self.samples, 95),
+            "min": min(self.samples),
+            "max": max(self.samples),
+        }
+        if self.units_per_sample and stats["median"] > 0:
+            stats["throughput"] = self.units_per_sample / stats["median"]
+        return stats
+
+    def to_record(self) -> Dict[str, Any]:
+        record = asdict(self)
+        record["key"] = self.key
+        record["stats"] = self.stats()
+        return record
+
+def measure(name: str, fn: Callable[[], Any], repeat: int = 5, warmup: int = 1,
+            params: Optional[Dict[str, Any]] = None, units_per_sample: Optional[float] = None,
+            unit: Optional[str] = None, setup: Optional[Callable[[], Any]] = None) -> BenchmarkResult:
+    """Time ``fn`` ``repeat`` times after ``warmup`` untimed calls.
+
+    ``setup`` runs before every call, outside the timed region, and its return
+    value is passed to ``fn`` when given. Exceptions are captured on the result
+    so one broken benchmark does not abort the whole run.
+    """
+    result = BenchmarkResult(name=name, params=params or {}, units_per_sample=units_per_sample, unit=unit)
+    try:
+        for i in range(warmup + repeat):
+            state = setup() if setup else None
+            start = time.perf_counter()
+            fn(state) if setup else fn()
+            elapsed = time.perf_counter() - start
+            if i >= warmup:
+                result.samples.append(elapsed)
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+        result.extra["traceback"] = traceback.format_exc(limit=5)
+    return result
+
+def git_revision() -> Optional[str]:
+    """Return the current git commit, if the suite runs inside a checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_metadata(server_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Describe the environment a benchmark run executed in."""
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "server": server_config or {},
+    }
+
+def load_history(path: Path = DEFAULT_HISTORY_PATH) -> List[Dict[str, Any]]:
+    """Load every recorded run from a JSON-lines history file."""
+    if not path.exists():
+        return []
+    with path.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def record_run(results: List[BenchmarkResult], metadata: Dict[str, Any],
+               path: Path = DEFAULT_HISTORY_PATH) -> Dict[str, Any]:
+    """Append one run, with all its results, to the history file."""
+    run = dict(metadata, results=[r.to_record() for r in results])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(run, default=str) + "\n")
+    return run
+
+def run_config(run: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the part of a run's metadata that makes its timings comparable.
+
+    That is the server configuration, without the request counts it served,
+    and the load test settings if any.
+    """
+    server = {key: value for key, value in (run.get("server") or {}).items() if key != "stats"}
+    return {"server": server, "load_test": run.get("load_test")}
+
+def find_regressions(results: List[BenchmarkResult], history: List[Dict[str, Any]],
+                     threshold: float = 0.2, metadata: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Compare medians against the latest recorded run of the same benchmark.
+
+    Args:
+        results: Results of the current run
+        history: Previously recorded runs, oldest first
+        threshold: Relative slowdown above which a result counts as a regression
+        metadata: Metadata of the current run; when given, only runs with the
+            same configuration (see ``run_config``) are compared
+
+    Returns:
+        List of regressions with the previous and current medians
+    """
+    config = run_config(metadata) if metadata is not None else None
+    previous: Dict[str, float] = {}
+    for run in history:
+        if config is not None and run_config(run) != config:
+            continue
+        for record in run.get("results", []):
+            median = record.get("stats", {}).get("median")
+            if median and not record.get("error"):
+                previous[record["key"]] = median
+
+    regressions = []
+    for result in results:
+        current = result.stats().get("median")
+        baseline = previous.get(result.key)
+        if current and baseline and current > baseline * (1 + threshold):
+            regressions.append({
+                "key": result.key,
+                "previous_median": baseline,
+                "current_median": current,
+                "slowdown": current / baseline - 1,
+            })
+    return regressions
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    """Render results as a plain-text table."""
+    lines = [f"{'benchmark':<58} {'median':>10} {'p95':>10} {'throughput':>16}"]
+    for result in results:
+        if result.error:
+            lines.append(f"{result.key:<58} ERROR {result.error}")
+            continue
+        stats = result.stats()
+        throughput = ""
+        if "throughput" in stats:
+            throughput = f"{stats['throughput']:.1f} {result.unit or 'ops'}/s"
+        line = f"{result.key:<58} {stats['median'] * 1000:>8.1f}ms {stats['p95'] * 1000:>8.1f}ms {throughput:>16}"
+        if result.extra:
+            line += "  " + " ".join(f"{key}={value}" for key, value in sorted(result.extra.items()))
+        lines.append(line)
+    return "\n".join(lines)
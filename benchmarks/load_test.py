@@ -0,0 +1,421 @@
+"""Drive many concurrent simulated user sessions through the agents' Python APIs.
+
+Each session follows a script modelled on how the Streamlit app is used: chat
+turns, knowledge questions, code reviews and learning sessions, separated by
+think time. Every session builds its own agents and chat state, as a browser
+session of the app does. By default the run goes against the stand-in Ollama
+server; pass --ollama-url to size a real deployment.
+
+Sessions follow the same scripts, so identical requests are often in flight
+at once. Request coalescing is off by default so that every request reaches
+the server; --coalesce process or shared measures it, and the number of
+requests that joined another one's call is reported.
+
+Example:
+    python benchmarks/load_test.py --sessions 1 10 50 --latency 0.05 --tokens-per-second 200
+    python benchmarks/load_test.py --sessions 20 --mix chat=1 --ollama-url http://localhost:11434
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT_DIR = Path(__file__).parent.parent
+REVIEW_FIXTURES_DIR = Path(__file__).parent / "fixtures" / "review"
+sys.path.insert(0, str(ROOT_DIR / "src"))
+sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks.fake_ollama import FakeOllamaConfig, FakeOllamaServer
+from benchmarks.harness import (
+    DEFAULT_HISTORY_PATH,
+    BenchmarkResult,
+    find_regressions,
+    load_history,
+    percentile,
+    record_run,
+    run_metadata,
+)
+
+CHAT_MESSAGES = [
+    "Can you help me organize my tasks for today?",
+    "What is a good way to structure a weekly review?",
+    "Summarize the pros and cons of working in short sprints.",
+    "How should I prioritize bugs against new features?",
+]
+KNOWLEDGE_QUESTIONS = [
+    "How do vision language models help document retrieval?",
+    "What are the main steps of the retrieval pipeline in the paper?",
+    "How is retrieval quality evaluated?",
+]
+LEARNING_TOPICS = ["Python Programming", "Data Structures", "Machine Learning"]
+
+# (operation, argument) steps; the argument picks a message, question, fixture or topic
+SCRIPTS: Dict[str, List[Tuple[str, int]]] = {
+    "chat": [("chat", 0), ("chat", 1), ("chat", 2), ("chat", 3)],
+    "research": [("knowledge", 0), ("knowledge", 1), ("chat", 2), ("knowledge", 2)],
+    "review": [("chat", 3), ("review", 0), ("review", 1), ("chat", 0)],
+    "learning": [("learning", 0), ("chat", 1), ("learning", 1)],
+}
+
+@dataclass
+class StepTiming:
+    """One request of a simulated session."""
+    session: int
+    script: str
+    operation: str
+    started: float
+    elapsed: float
+    error: Optional[str] = None
+
+@dataclass
+class LoadRun:
+    """Everything measured while running one concurrency level."""
+    sessions: int
+    wall_time: float
+    baseline_rss_kb: int
+    peak_rss_kb: int
+    timings: List[StepTiming] = field(default_factory=list)
+    coalesced: int = 0  # requests that joined another request's LLM call
+
+    @property
+    def memory_per_session_kb(self) -> float:
+        return max(0, self.peak_rss_kb - self.baseline_rss_kb) / max(1, self.sessions)
+
+def current_rss_kb() -> int:
+    """Resident set size of this process, in KiB."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        # ru_maxrss is the peak, not the current size, but it is the best portable stand-in
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+class RssSampler:
+    """Track the peak RSS of the process in a background thread."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak_kb = current_rss_kb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_kb = max(self.peak_kb, current_rss_kb())
+
+    def __enter__(self) -> "RssSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_kb = max(self.peak_kb, current_rss_kb())
+
+def parse_mix(items: List[str]) -> Dict[str, int]:
+    """Parse ``script=weight`` pairs into script weights."""
+    mix = {}
+    for item in items:
+        name, _, weight = item.partition("=")
+        if name not in SCRIPTS:
+            raise ValueError(f"Unknown script {name!r}; choose from {', '.join(sorted(SCRIPTS))}")
+        mix[name] = int(weight or 1)
+    return mix
+
+def assign_scripts(n_sessions: int, mix: Dict[str, int]) -> List[str]:
+    """Spread scripts over sessions in proportion to their weights, deterministically."""
+    cycle = [name for name, weight in sorted(mix.items()) for _ in range(weight)]
+    return [cycle[i % len(cycle)] for i in range(n_sessions)]
+
+class SimulatedSession:
+    """State of one browser session: its chat context, agents and user id."""
+
+    def __init__(self, index: int, client, memory, review_fixtures: List[str]):
+        from ai_agents_hub.agents.chat_agent import ChatSession
+        from ai_agents_hub.core.namespaces import namespace_for
+
+        now = datetime.now()
+        self.student_id = f"load-user-{index}"
+        self.chat = ChatSession(session_id=uuid.uuid4().hex, messages=[], start_time=now, last_activity=now,
+                                metadata={}, namespace=namespace_for(self.student_id))
+        self.client = client
+        self.memory = memory
+        self.review_fixtures = review_fixtures
+        self.agents: Dict[str, object] = {}
+
+    def _agent(self, name: str, factory: Callable):
+        if name not in self.agents:
+            self.agents[name] = factory()
+        return self.agents[name]
+
+    def run(self, operation: str, argument: int):
+        if operation == "chat":
+            from ai_agents_hub.agents.chat_agent import process_chat
+
+            process_chat(CHAT_MESSAGES[argument % len(CHAT_MESSAGES)], self.chat, client=self.client,
+                         memory=self.memory)
+        elif operation == "knowledge":
+            from ai_agents_hub.agents.knowledge_agent import create_knowledge_agent, process_knowledge_query
+
+            process_knowledge_query(KNOWLEDGE_QUESTIONS[argument % len(KNOWLEDGE_QUESTIONS)], self.chat,
+                                    agent=self._agent("knowledge", create_knowledge_agent), client=self.client,
+                                    memory=self.memory)
+        elif operation == "review":
+            from ai_agents_hub.agents.code_review_agent import create_code_review_agent, process_review
+
+            process_review(self.review_fixtures[argument % len(self.review_fixtures)],
+                           agent=self._agent("review", create_code_review_agent))
+        elif operation == "learning":
+            from ai_agents_hub.agents.adaptive_learning_agent import process_learning
+
+            results = process_learning(self.student_id, LEARNING_TOPICS[argument % len(LEARNING_TOPICS)],
+                                       memory=self.memory)
+            if results.get("error"):
+                raise RuntimeError(results["error"])
+        else:
+            raise ValueError(f"Unknown operation: {operation}")
+
+def run_sessions(n_sessions: int, mix: Dict[str, int], think_time: float = 0.5, ramp_up: float = 1.0,
+                 seed: int = 0, ollama_url: Optional[str] = None, memory_root: Optional[str] = None) -> LoadRun:
+    """Run ``n_sessions`` simulated sessions concurrently, one thread each.
+
+    The app serves every browser session from its own script thread, so a
+    thread per simulated session exercises the same locks and shared caches.
+    Session starts are spread evenly over ``ramp_up`` seconds, and each step
+    is followed by an exponentially distributed pause averaging ``think_time``.
+
+    Args:
+        n_sessions: Number of concurrent sessions
+        mix: Script weights, see parse_mix()
+        think_time: Mean pause between a session's requests, in seconds
+        ramp_up: Seconds over which sessions are started
+        seed: Seed for the think time of all sessions
+        ollama_url: Server for the chat and knowledge turns; defaults to the config
+        memory_root: Directory for the sessions' memory namespaces
+
+    Returns:
+        LoadRun: Timing of every step and the memory growth of the process
+    """
+    from ai_agents_hub.core.coalescing import get_coalescer
+    from ai_agents_hub.core.namespaces import NamespaceManager
+    from ai_agents_hub.core.ollama import OllamaClient
+
+    memory = NamespaceManager(root=memory_root or tempfile.mkdtemp(prefix="load-namespaces-"))
+    review_fixtures = [path.read_text() for path in sorted(REVIEW_FIXTURES_DIR.glob("*.py"))]
+    scripts = assign_scripts(n_sessions, mix)
+    timings: List[StepTiming] = []
+    lock = threading.Lock()
+    # Keep every session alive until the end so its state counts towards memory
+    sessions = [SimulatedSession(i, OllamaClient(base_url=ollama_url), memory, review_fixtures)
+                for i in range(n_sessions)]
+
+    def worker(index: int):
+        rng = random.Random(seed * 100003 + index)
+        time.sleep(ramp_up * index / n_sessions)
+        script = scripts[index]
+        for operation, argument in SCRIPTS[script]:
+            error = None
+            started = time.perf_counter()
+            try:
+                sessions[index].run(operation, argument)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            elapsed = time.perf_counter() - started
+            with lock:
+                timings.append(StepTiming(index, script, operation, started, elapsed, error))
+            if think_time:
+                time.sleep(rng.expovariate(1 / think_time))
+
+    # Import the agents up front so the baseline already includes the libraries
+    import ai_agents_hub.agents.adaptive_learning_agent  # noqa: F401
+    import ai_agents_hub.agents.code_review_agent  # noqa: F401
+    import ai_agents_hub.agents.knowledge_agent  # noqa: F401
+
+    coalescer = get_coalescer()
+    saved_before = coalescer.stats().saved_calls if coalescer else 0
+    baseline = current_rss_kb()
+    threads = [threading.Thread(target=worker, args=(i,), name=f"load-session-{i}") for i in range(n_sessions)]
+    with RssSampler() as sampler:
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall_time = time.perf_counter() - start
+    memory.close()
+    return LoadRun(sessions=n_sessions, wall_time=wall_time, baseline_rss_kb=baseline,
+                   peak_rss_kb=sampler.peak_kb, timings=timings,
+                   coalesced=coalescer.stats().saved_calls - saved_before if coalescer else 0)
+
+def summarize(run: LoadRun) -> List[BenchmarkResult]:
+    """Turn a run into one result per operation plus one for all requests.
+
+    Samples are the latencies of successful requests. Throughput is completed
+    requests per second of wall time, which includes think time.
+    """
+    by_operation: Dict[str, List[StepTiming]] = {}
+    for timing in run.timings:
+        by_operation.setdefault(timing.operation, []).append(timing)
+    by_operation["all"] = run.timings
+
+    results = []
+    for operation, timings in sorted(by_operation.items()):
+        samples = [t.elapsed for t in timings if not t.error]
+        errors = [t.error for t in timings if t.error]
+        result = BenchmarkResult(name="load_test", params={"sessions": run.sessions, "operation": operation},
+                                 samples=samples, unit="requests")
+        result.extra.update({
+            "requests": len(timings),
+            "errors": len(errors),
+            "p50_ms": round(percentile(samples, 50) * 1000, 1),
+            "p95_ms": round(percentile(samples, 95) * 1000, 1),
+            "p99_ms": round(percentile(samples, 99) * 1000, 1),
+            "throughput": round(len(samples) / run.wall_time, 2) if run.wall_time else 0.0,
+        })
+        if errors:
+            result.extra["first_error"] = errors[0]
+            if not samples:
+                result.error = errors[0]
+        if operation == "all":
+            result.extra.update({
+                "wall_time_s": round(run.wall_time, 2),
+                "peak_rss_mb": round(run.peak_rss_kb / 1024, 1),
+                "memory_per_session_kb": round(run.memory_per_session_kb, 1),
+                "coalesced": run.coalesced,
+            })
+        results.append(result)
+    return results
+
+def format_load_results(results: List[BenchmarkResult]) -> str:
+    """Render load results as a plain-text table."""
+    lines = [
+        f"{'sessions':>8} {'operation':<10} {'requests':>8} {'errors':>6} {'p50':>9} {'p95':>9} {'p99':>9} "
+        f"{'req/s':>7} {'mem/session':>12}"
+    ]
+    for result in results:
+        extra = result.extra
+        memory = f"{extra['memory_per_session_kb'] / 1024:.1f}MB" if "memory_per_session_kb" in extra else ""
+        lines.append(
+            f"{result.params['sessions']:>8} {result.params['operation']:<10} {extra['requests']:>8} "
+            f"{extra['errors']:>6} {extra['p50_ms']:>7.1f}ms {extra['p95_ms']:>7.1f}ms {extra['p99_ms']:>7.1f}ms "
+            f"{extra['throughput']:>7.2f} {memory:>12}"
+        )
+        if extra.get("coalesced"):
+            lines.append(f"{'':>8} {'':<10} coalesced: {extra['coalesced']} requests shared another one's call")
+        if "first_error" in extra:
+            lines.append(f"{'':>8} {'':<10} first error: {extra['first_error'][:100]}")
+    return "\n".join(lines)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 50], help="Concurrency levels to run")
+    parser.add_argument("--mix", nargs="+", default=["chat=4", "research=2", "review=2", "learning=1"],
+                        metavar="SCRIPT=WEIGHT", help=f"Session scripts: {', '.join(sorted(SCRIPTS))}")
+    parser.add_argument("--think-time", type=float, default=0.5, help="Mean pause between requests (s)")
+    parser.add_argument("--ramp-up", type=float, default=1.0, help="Seconds over which sessions start")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ollama-url", help="Use this Ollama server instead of the stand-in")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake server delay per request (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0, help="Fake generation rate (0 = unlimited)")
+    parser.add_argument("--prefill-tokens-per-second", type=float, default=2000.0, help="Fake prompt evaluation rate")
+    parser.add_argument("--response-tokens", type=int, default=64, help="Tokens per fake completion")
+    parser.add_argument("--model-latency-factor", nargs="+", default=["deepseek-r1=4"], metavar="MODEL=FACTOR",
+                        help="Slow down the fake server for specific models, e.g. the full review model")
+    parser.add_argument("--coalesce", choices=["off", "process", "shared"], default="off",
+                        help="Request coalescing scope; off makes every request reach the server")
+    parser.add_argument("--verbose", action="store_true", help="Show the agents' own output")
+    parser.add_argument("--json", type=Path, help="Also write every request's timing to this JSON file")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY_PATH, help="JSON-lines history file")
+    parser.add_argument("--no-record", action="store_true", help="Do not append this run to the history")
+    parser.add_argument("--regression-threshold", type=float, default=0.2)
+    return parser.parse_args(argv)
+
+def _run_level(n_sessions: int, mix: Dict[str, int], args, ollama_url: Optional[str]) -> LoadRun:
+    # The agents print every task and response; with many sessions that is only noise
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(sys.stdout if args.verbose else devnull):
+        return run_sessions(n_sessions, mix, think_time=args.think_time, ramp_up=args.ramp_up,
+                            seed=args.seed, ollama_url=ollama_url)
+
+def run_levels(args, ollama_url: Optional[str]) -> Tuple[List[BenchmarkResult], List[LoadRun]]:
+    """Run every concurrency level in a fresh process.
+
+    Memory freed by one level is not returned to the OS, so running levels in
+    the same process would hide the growth of all but the first one.
+    """
+    mix = parse_mix(args.mix)
+    results, runs = [], []
+    for n_sessions in args.sessions:
+        print(f"Running {n_sessions} sessions...", file=sys.stderr)
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            run = pool.submit(_run_level, n_sessions, mix, args, ollama_url).result()
+        runs.append(run)
+        results.extend(summarize(run))
+    return results, runs
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix="load-run-")
+    previous_cwd = os.getcwd()
+    # Agents persist their stores relative to the working directory.
+    os.chdir(workdir)
+    # The levels run in spawned processes, which read the scope from the environment
+    os.environ["AI_AGENTS_HUB_COALESCE"] = args.coalesce
+    try:
+        if args.ollama_url:
+            os.environ["OLLAMA_BASE_URL"] = args.ollama_url
+            results, runs = run_levels(args, args.ollama_url)
+            metadata = run_metadata({"url": args.ollama_url})
+        else:
+            server_config = FakeOllamaConfig(
+                latency=args.latency,
+                tokens_per_second=args.tokens_per_second,
+                prefill_tokens_per_second=args.prefill_tokens_per_second,
+                response_tokens=args.response_tokens,
+                model_latency_factors={
+                    model: float(factor) for model, factor in (item.split("=", 1) for item in args.model_latency_factor)
+                },
+            )
+            with FakeOllamaServer(server_config) as server:
+                os.environ["OLLAMA_BASE_URL"] = server.url
+                os.environ["OPENAI_BASE_URL"] = server.openai_url
+                os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+                results, runs = run_levels(args, server.url)
+                metadata = run_metadata(dict(server.describe(), stats=dict(server.stats)))
+    finally:
+        os.chdir(previous_cwd)
+    metadata["load_test"] = {"mix": args.mix, "think_time": args.think_time, "ramp_up": args.ramp_up,
+                             "coalesce": args.coalesce}
+
+    print(format_load_results(results))
+    if args.json:
+        args.json.write_text(json.dumps(
+            {"metadata": metadata, "runs": [asdict(run) for run in runs]}, default=str, indent=2
+        ))
+    regressions = find_regressions(results, load_history(args.history), args.regression_threshold, metadata)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['key']}: {regression['previous_median'] * 1000:.1f}ms -> "
+            f"{regression['current_median'] * 1000:.1f}ms (+{regression['slowdown']:.0%})"
+        )
+    if not args.no_record:
+        record_run(results, metadata, args.history)
+        print(f"Recorded run in {args.history}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
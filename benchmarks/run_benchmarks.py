@@ -0,0 +1,503 @@
+"""Run the AI Agents Hub benchmark suite against a stand-in Ollama server.
+
+Example:
+    python benchmarks/run_benchmarks.py --latency 0.02 --tokens-per-second 500
+    python benchmarks/run_benchmarks.py --only chat_turn review_latency --no-record
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT_DIR = Path(__file__).parent.parent
+REVIEW_FIXTURES_DIR = Path(__file__).parent / "fixtures" / "review"
+sys.path.insert(0, str(ROOT_DIR / "src"))
+sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks.fake_ollama import FakeOllamaConfig, FakeOllamaServer
+from benchmarks.harness import (
+    DEFAULT_HISTORY_PATH,
+    BenchmarkResult,
+    find_regressions,
+    format_results,
+    load_history,
+    measure,
+    record_run,
+    run_metadata,
+)
+
+def synthetic_code(n_lines: int) -> str:
+    """Generate deterministic Python source of roughly ``n_lines`` lines."""
+    lines = []
+    i = 0
+    while len(lines) < n_lines:
+        lines.extend([
+            f"def process_{i}(data):",
+            f"    \"\"\"Process batch {i}.\"\"\"",
+            "    result = []",
+            "    for item in data:",
+            "        if item == None:",
+            "            continue",
+            f"        result.append(item * {i + 1})",
+            "    return result",
+            "",
+        ])
+        i += 1
+    return "\n".join(lines[:n_lines])
+
+def synthetic_documents(n_docs: int) -> List[str]:
+    """Generate deterministic knowledge snippets."""
+    topics = ["retrieval", "embeddings", "vision models", "indexing", "ranking", "chunking"]
+    return [
+        f"Document {i} explains {topics[i % len(topics)]} in the context of section {i // len(topics)}. "
+        f"It covers fact number {i} and relates it to {topics[(i + 1) % len(topics)]}."
+        for i in range(n_docs)
+    ]
+
+def knowledge_config(collection: str, path: str) -> Dict:
+    from ai_agents_hub.config import get_agent_config
+
+    config = get_agent_config()
+    config["vector_store"]["config"]["collection_name"] = collection
+    config["vector_store"]["config"]["path"] = path
+    return config
+
+def bench_agent_construction(args) -> List[BenchmarkResult]:
+    from ai_agents_hub.agents.adaptive_learning_agent import create_adaptive_learning_agent
+    from ai_agents_hub.agents.chat_agent import create_chat_agent
+    from ai_agents_hub.agents.code_analysis_agent import create_code_analysis_agent
+    from ai_agents_hub.agents.code_review_agent import create_code_review_agent
+    from ai_agents_hub.agents.knowledge_agent import create_knowledge_agent
+
+    factories = {
+        "chat": create_chat_agent,
+        "knowledge": create_knowledge_agent,
+        "code_analysis": create_code_analysis_agent,
+        "code_review": create_code_review_agent,
+        "adaptive_learning": create_adaptive_learning_agent,
+    }
+    return [
+        measure("agent_construction", factory, repeat=args.repeat, params={"agent": name})
+        for name, factory in factories.items()
+    ]
+
+def bench_chat_turn(args) -> List[BenchmarkResult]:
+    from ai_agents_hub.agents.chat_agent import process_chat
+
+    return [measure(
+        "chat_turn", lambda: process_chat("Can you help me organize my tasks for today?"),
+        repeat=args.repeat,
+    )]
+
+def bench_chat_session_ttft(args) -> List[BenchmarkResult]:
+    """Time to first token per turn, re-sending the transcript vs. continuing the context."""
+    from datetime import datetime
+
+    from ai_agents_hub.agents.chat_agent import (
+        CHAT_INSTRUCTIONS, CHAT_MODEL, ChatMessage, ChatSession, process_chat, transcript,
+    )
+    from ai_agents_hub.core.ollama import OllamaClient
+
+    # This benchmark needs a prefill cost to be meaningful, so it runs its own server.
+    config = FakeOllamaConfig(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        prefill_tokens_per_second=args.prefill_tokens_per_second or 2000,
+        response_tokens=args.response_tokens,
+    )
+    checkpoints = sorted({1, args.session_turns // 2, args.session_turns})
+    samples: Dict[tuple, List[float]] = {}
+    with FakeOllamaServer(config) as server:
+        client = OllamaClient(base_url=server.url)
+        for _ in range(max(1, min(args.repeat, 3))):
+            for mode in ("rebuild", "context"):
+                now = datetime.now()
+                session = ChatSession(session_id=uuid.uuid4().hex, messages=[], start_time=now,
+                                      last_activity=now, metadata={})
+                for turn in range(1, args.session_turns + 1):
+                    message = f"Turn {turn}: can you expand on step {turn} of the plan with an example?"
+                    if mode == "context":
+                        reply = process_chat(message, session, client=client)
+                        ttft = float(reply.context["time_to_first_token"])
+                    else:
+                        # What process_chat used to do: re-send instructions and history every turn.
+                        prompt = f"{transcript(session.messages)}\nuser: {message}"
+                        result = client.generate(CHAT_MODEL, prompt, system=CHAT_INSTRUCTIONS)
+                        ttft = result.time_to_first_token
+                        session.messages.append(ChatMessage(content=message, timestamp=now, type="user"))
+                        session.messages.append(ChatMessage(content=result.text, timestamp=now, type="assistant"))
+                    if turn in checkpoints:
+                        samples.setdefault((mode, turn), []).append(ttft)
+    return [
+        BenchmarkResult(name="chat_session_ttft", params={"mode": mode, "turn": turn}, samples=values,
+                        extra={"prefill_tokens_per_second": config.prefill_tokens_per_second})
+        for (mode, turn), values in sorted(samples.items())
+    ]
+
+def bench_router_latency(args) -> List[BenchmarkResult]:
+    from ai_agents_hub.core.router import get_intent_router
+
+    router = get_intent_router()
+    messages = {
+        "chat": "Can you help me organize my tasks for today?",
+        "code": "```python\n" + synthetic_code(40) + "\n```\nCan you review this?",
+        "learning": "Teach me about recursion in Python",
+    }
+    return [
+        measure("router_latency", lambda: router.route(message), repeat=args.repeat * 20, params={"input": name})
+        for name, message in messages.items()
+    ]
+
+def bench_history_window(args) -> List[BenchmarkResult]:
+    from ai_agents_hub.ui.history import ChatHistory
+
+    code_message = "Analyzing code:\n```\n" + synthetic_code(300) + "\n```"
+    results = []
+    for n_messages in args.history_sizes:
+        history = ChatHistory()
+        for i in range(n_messages):
+            history.append("Code Analysis", "user" if i % 2 == 0 else "assistant", code_message if i % 2 == 0 else f"Report {i}")
+
+        def render():
+            # What a rerun touches: the displayed window and each message's markdown.
+            return [entry.display for _, entry in history.window("Code Analysis", 20)]
+
+        result = measure("history_window", render, repeat=args.repeat * 20, params={"messages": n_messages})
+        result.extra["stored_bytes"] = history.stored_bytes()
+        results.append(result)
+    return results
+
+def bench_namespace_search(args) -> List[BenchmarkResult]:
+    """Memory search for one user while the number of other users grows."""
+    from ai_agents_hub.core.namespaces import NamespaceManager, namespace_for
+
+    documents = synthetic_documents(args.namespace_entries)
+    results = []
+    for n_users in args.namespace_users:
+        manager = NamespaceManager(root=tempfile.mkdtemp(prefix="bench-namespaces-"))
+        for user in range(n_users):
+            namespace = namespace_for(f"user-{user}")
+            for doc in documents:
+                manager.remember(namespace, doc)
+        target = namespace_for("user-0")
+        results.append(measure(
+            "namespace_search", lambda: manager.search(target, "how does ranking relate to embeddings?"),
+            repeat=args.repeat * 10, params={"users": n_users, "entries_per_user": args.namespace_entries},
+        ))
+        manager.close()
+    return results
+
+def bench_knowledge_ingestion(args) -> List[BenchmarkResult]:
+    from praisonaiagents.knowledge import Knowledge
+
+    results = []
+    for n_docs in args.corpus_sizes:
+        documents = synthetic_documents(n_docs)
+
+        def setup():
+            path = tempfile.mkdtemp(prefix="bench-knowledge-")
+            return Knowledge(config=knowledge_config(f"bench_{uuid.uuid4().hex[:8]}", path))
+
+        def ingest(knowledge):
+            for doc in documents:
+                # Knowledge.store logs and swallows failures, returning an empty result.
+                if not knowledge.store(doc, user_id="bench"):
+                    raise RuntimeError("knowledge store rejected a document; check the server and vector store")
+
+        results.append(measure(
+            "knowledge_ingestion", ingest, repeat=max(1, args.repeat // 2), warmup=0,
+            params={"docs": n_docs}, units_per_sample=n_docs, unit="docs", setup=setup,
+        ))
+    return results
+
+def bench_retrieval_latency(args) -> List[BenchmarkResult]:
+    from praisonaiagents.knowledge import Knowledge
+
+    results = []
+    for n_docs in args.corpus_sizes:
+        path = tempfile.mkdtemp(prefix="bench-retrieval-")
+        try:
+            knowledge = Knowledge(config=knowledge_config(f"bench_{uuid.uuid4().hex[:8]}", path))
+            for doc in synthetic_documents(n_docs):
+                knowledge.store(doc, user_id="bench")
+        except Exception as e:
+            results.append(BenchmarkResult(
+                name="retrieval_latency", params={"docs": n_docs}, error=f"{type(e).__name__}: {e}",
+            ))
+            continue
+        results.append(measure(
+            "retrieval_latency", lambda: knowledge.search("how does ranking relate to embeddings?", user_id="bench"),
+            repeat=args.repeat, params={"docs": n_docs},
+        ))
+    return results
+
+def synthetic_messy_code(n_lines: int) -> str:
+    """Synthetic code wrapped in the boilerplate users tend to paste along with it."""
+    header = [
+        "# Copyright (c) 2024 Example Corp. All rights reserved.",
+        "# Licensed under the Apache License, Version 2.0 (the \"License\");",
+        "# you may not use this file except in compliance with the License.",
+        *[f"# License text line {i}." for i in range(12)],
+        "",
+    ]
+    generated = ["# BEGIN GENERATED CODE"] + [f"CONSTANT_{i} = {i * 7}" for i in range(80)] + ["# END GENERATED CODE"]
+    minified = ["BUNDLE = '" + "eyJhIjoxfQ" * 60 + "'", "a=1;" * 200]
+    body = ["    " + line for line in synthetic_code(n_lines).splitlines()]
+    return "\n".join(header + generated + minified + body)
+
+def bench_prompt_compaction(args) -> List[BenchmarkResult]:
+    """Compaction time and tokens saved for plain and boilerplate-heavy code."""
+    from ai_agents_hub.core.prompt_compactor import compact_code
+
+    inputs = {f"fixture_{path.stem}": path.read_text() for path in sorted(REVIEW_FIXTURES_DIR.glob("*.py"))}
+    for n_lines in args.code_sizes:
+        inputs[f"messy_{n_lines}"] = synthetic_messy_code(n_lines)
+    results = []
+    for name, code in inputs.items():
+        result = measure("prompt_compaction", lambda: compact_code(code), repeat=args.repeat * 10,
+                         params={"input": name})
+        compacted = compact_code(code)
+        result.extra.update({
+            "original_tokens": compacted.original_tokens,
+            "compact_tokens": compacted.compact_tokens,
+            "saved": round(compacted.tokens_saved / compacted.original_tokens, 3) if compacted.original_tokens else 0.0,
+        })
+        results.append(result)
+    return results
+
+def bench_review_latency(args) -> List[BenchmarkResult]:
+    from ai_agents_hub.agents.code_review_agent import process_review
+
+    results = []
+    for n_lines in args.code_sizes:
+        code = synthetic_code(n_lines)
+        results.append(measure(
+            "review_latency", lambda: process_review(code), repeat=args.repeat,
+            params={"lines": n_lines}, units_per_sample=n_lines, unit="lines",
+        ))
+    return results
+
+# Issue categories looked for in review text when comparing two reviews
+REVIEW_CATEGORIES = {
+    "security": re.compile(r"(?i)secur|vulnerab|inject|credential|unsafe"),
+    "bug": re.compile(r"(?i)\bbugs?\b|error|exception|incorrect|issue"),
+    "performance": re.compile(r"(?i)perform|slow|complexity|memory"),
+    "style": re.compile(r"(?i)style|readab|naming|quality|pep ?8"),
+    "testing": re.compile(r"(?i)\btests?\b|coverage"),
+}
+
+def review_categories(review: str) -> set:
+    return {name for name, pattern in REVIEW_CATEGORIES.items() if pattern.search(review)}
+
+def bench_review_cascade(args) -> List[BenchmarkResult]:
+    """Full-model review vs. cascade review of the review fixtures.
+
+    Reports the escalation rate, the latency saved by the cascade and how well
+    its review agrees with the full model's (Jaccard similarity of the issue
+    categories each review mentions).
+    """
+    from ai_agents_hub.agents.code_review_agent import (
+        TRIAGE_MODEL, create_code_review_agent, process_review, process_review_cascade,
+    )
+
+    review_agent = create_code_review_agent()
+    triage_agent = create_code_review_agent(llm=TRIAGE_MODEL)
+    results = []
+    for fixture in sorted(REVIEW_FIXTURES_DIR.glob("*.py")):
+        code = fixture.read_text()
+        full = measure(
+            "review_cascade", lambda: process_review(code, agent=review_agent),
+            repeat=args.repeat, params={"fixture": fixture.stem, "mode": "full"},
+        )
+        cascade = measure(
+            "review_cascade", lambda: process_review_cascade(code, triage_agent=triage_agent, review_agent=review_agent),
+            repeat=args.repeat, params={"fixture": fixture.stem, "mode": "cascade"},
+        )
+        results.extend([full, cascade])
+        if full.error or cascade.error:
+            continue
+        full_categories = review_categories(str(process_review(code, agent=review_agent)))
+        outcome = process_review_cascade(code, triage_agent=triage_agent, review_agent=review_agent)
+        cascade_categories = review_categories(outcome.review)
+        union = full_categories | cascade_categories
+        full_median = full.stats()["median"]
+        cascade.extra.update({
+            "escalation_rate": round(outcome.escalation_rate, 3),
+            "latency_saved": round(1 - cascade.stats()["median"] / full_median, 3) if full_median else 0.0,
+            "agreement": round(len(full_categories & cascade_categories) / len(union), 3) if union else 1.0,
+        })
+    return results
+
+def bench_batch_analysis(args) -> List[BenchmarkResult]:
+    """Local pre-analysis of a synthetic repository with a growing worker pool."""
+    from ai_agents_hub.agents.batch_analysis import analyze_repository
+
+    repo = Path(tempfile.mkdtemp(prefix="bench-repo-"))
+    for i in range(args.batch_files):
+        package = repo / f"pkg{i % 10}"
+        package.mkdir(exist_ok=True)
+        (package / f"module_{i}.py").write_text(synthetic_code(300))
+    results = []
+    for workers in args.batch_workers:
+        # A fresh cache per sample, so every run does the full analysis
+        results.append(measure(
+            "batch_analysis", lambda cache_dir: analyze_repository(repo, workers=workers, cache_dir=cache_dir),
+            repeat=max(1, args.repeat // 2), params={"workers": workers, "files": args.batch_files},
+            units_per_sample=args.batch_files, unit="files",
+            setup=lambda: tempfile.mkdtemp(prefix="bench-analysis-cache-"),
+        ))
+    results[-1].extra["cpu_count"] = os.cpu_count()
+    return results
+
+def bench_request_coalescing(args) -> List[BenchmarkResult]:
+    """Concurrent sessions asking the same question vs. different questions."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from ai_agents_hub.core.coalescing import SingleFlight
+    from ai_agents_hub.core.ollama import OllamaClient
+
+    # Calls only overlap when they take a while, so this benchmark runs its own slower server.
+    config = FakeOllamaConfig(latency=args.latency or 0.2, tokens_per_second=args.tokens_per_second,
+                              response_tokens=args.response_tokens)
+    results = []
+    with FakeOllamaServer(config) as server:
+        for prompts in ("identical", "distinct"):
+            coalescer = SingleFlight()
+            client = OllamaClient(base_url=server.url, coalescer=coalescer)
+
+            def burst():
+                questions = [
+                    "How do vision language models help document retrieval?"
+                    + ("" if prompts == "identical" else f" (session {i})")
+                    for i in range(args.coalesce_sessions)
+                ]
+                with ThreadPoolExecutor(max_workers=len(questions)) as pool:
+                    list(pool.map(lambda question: client.generate("deepseek-r1:1.5b", question), questions))
+
+            result = measure("request_coalescing", burst, repeat=args.repeat,
+                             params={"prompts": prompts, "sessions": args.coalesce_sessions},
+                             units_per_sample=args.coalesce_sessions, unit="requests")
+            stats = coalescer.stats()
+            result.extra.update({"llm_calls": stats.calls, "requests": stats.requests, "coalesced": stats.coalesced})
+            results.append(result)
+    return results
+
+def bench_adaptive_workflow(args) -> List[BenchmarkResult]:
+    """A learning session with local scoring vs. the full assessor/evaluator/adapter workflow."""
+    from datetime import datetime
+
+    from ai_agents_hub.agents.adaptive_learning_agent import LearningContent, PerformanceMetric, process_learning
+    from ai_agents_hub.core.content_bank import ContentBank
+
+    history = [
+        PerformanceMetric(score=score, topic="Python Programming", timestamp=datetime.now(), difficulty="beginner")
+        for score in (1.0, 0.8, 1.0, 0.6, 1.0)
+    ]
+
+    def setup():
+        # An empty bank per sample, so every session generates its content
+        return ContentBank(LearningContent, path=Path(tempfile.mkdtemp(prefix="bench-bank-")) / "bank.sqlite3")
+
+    results = []
+    for llm_evaluation in (False, True):
+        def run(bank):
+            results = process_learning("bench-student", "Python Programming", content_bank=bank, history=history,
+                                       llm_evaluation=llm_evaluation)
+            if results.get("error"):
+                raise RuntimeError(results["error"])
+
+        results.append(measure("adaptive_workflow", run, repeat=max(1, args.repeat // 2), setup=setup,
+                               params={"llm_evaluation": llm_evaluation}))
+    return results
+
+BENCHMARKS: Dict[str, Callable] = {
+    "agent_construction": bench_agent_construction,
+    "chat_turn": bench_chat_turn,
+    "chat_session_ttft": bench_chat_session_ttft,
+    "router_latency": bench_router_latency,
+    "history_window": bench_history_window,
+    "namespace_search": bench_namespace_search,
+    "knowledge_ingestion": bench_knowledge_ingestion,
+    "retrieval_latency": bench_retrieval_latency,
+    "prompt_compaction": bench_prompt_compaction,
+    "review_latency": bench_review_latency,
+    "review_cascade": bench_review_cascade,
+    "request_coalescing": bench_request_coalescing,
+    "batch_analysis": bench_batch_analysis,
+    "adaptive_workflow": bench_adaptive_workflow,
+}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Run a subset of benchmarks")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per case")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake server delay per request (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Fake generation rate (0 = unlimited)")
+    parser.add_argument("--prefill-tokens-per-second", type=float, default=0.0, help="Fake prompt evaluation rate")
+    parser.add_argument("--response-tokens", type=int, default=64, help="Tokens per fake completion")
+    parser.add_argument("--session-turns", type=int, default=20, help="Turns per simulated chat session")
+    parser.add_argument("--corpus-sizes", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--history-sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--namespace-users", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--namespace-entries", type=int, default=100, help="Memory entries per user")
+    parser.add_argument("--coalesce-sessions", type=int, default=10, help="Concurrent requests per burst")
+    parser.add_argument("--code-sizes", type=int, nargs="+", default=[20, 200, 1000])
+    parser.add_argument("--batch-files", type=int, default=200, help="Files in the synthetic repository")
+    parser.add_argument("--batch-workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--model-latency-factor", nargs="+", default=["deepseek-r1=4"], metavar="MODEL=FACTOR",
+                        help="Slow down the fake server for specific models, e.g. the full review model")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY_PATH, help="JSON-lines history file")
+    parser.add_argument("--no-record", action="store_true", help="Do not append this run to the history")
+    parser.add_argument("--regression-threshold", type=float, default=0.2)
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    server_config = FakeOllamaConfig(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        prefill_tokens_per_second=args.prefill_tokens_per_second,
+        response_tokens=args.response_tokens,
+        model_latency_factors={
+            model: float(factor) for model, factor in (item.split("=", 1) for item in args.model_latency_factor)
+        },
+    )
+    results: List[BenchmarkResult] = []
+    workdir = tempfile.mkdtemp(prefix="bench-run-")
+    with FakeOllamaServer(server_config) as server:
+        os.environ["OLLAMA_BASE_URL"] = server.url
+        os.environ["OPENAI_BASE_URL"] = server.openai_url
+        os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+        # Agents persist their vector stores relative to the working directory.
+        previous_cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for name in args.only or list(BENCHMARKS):
+                print(f"Running {name}...", file=sys.stderr)
+                try:
+                    results.extend(BENCHMARKS[name](args))
+                except Exception as e:
+                    results.append(BenchmarkResult(name=name, error=f"{type(e).__name__}: {e}"))
+        finally:
+            os.chdir(previous_cwd)
+        metadata = run_metadata(dict(server.describe(), stats=dict(server.stats)))
+
+    print(format_results(results))
+    regressions = find_regressions(results, load_history(args.history), args.regression_threshold, metadata)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['key']}: {regression['previous_median'] * 1000:.1f}ms -> "
+            f"{regression['current_median'] * 1000:.1f}ms (+{regression['slowdown']:.0%})"
+        )
+    if not args.no_record:
+        record_run(results, metadata, args.history)
+        print(f"Recorded run in {args.history}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,15 @@
+"""Script to analyze a whole repository with the batch code analysis runner."""
+
+import sys
+from pathlib import Path
+
+def main():
+    """Run the batch analysis command line."""
+    root_dir = Path(__file__).parent.parent
+    sys.path.append(str(root_dir / "src"))
+
+    from ai_agents_hub.agents.batch_analysis import main as analyze
+    sys.exit(analyze())
+
+if __name__ == "__main__":
+    main()
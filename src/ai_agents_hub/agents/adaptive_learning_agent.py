@@ -2,11 +2,31 @@
 
 from praisonaiagents import Agent, Task, PraisonAIAgents
 from ai_agents_hub.config import get_agent_config
+from ai_agents_hub.core.coalescing import run_agent
+from ai_agents_hub.core.content_bank import ContentBank
+from ai_agents_hub.core.namespaces import SHARED_NAMESPACE, NamespaceManager, get_namespace_manager, namespace_for
+from ai_agents_hub.core.scoring import (
+    DifficultyRecommendation,
+    grade_answer,
+    parse_number,
+    performance_band,
+    recommend_difficulty,
+)
+from functools import lru_cache
 from pydantic import BaseModel, ConfigDict
-from typing import List, Dict, Optional, Union, Any
+from typing import List, Dict, Optional, Tuple, Union, Any
 from pathlib import Path
 from datetime import datetime
-import time
+import re
+
+# Namespace entry kind of graded answers, see record_performance()
+PERFORMANCE_KIND = "performance"
+
+# "Q: ..." / "A: ..." lines of the exercises section, with optional numbering and markdown
+EXERCISE_LINE = re.compile(r"^\s*(?:[-*]\s*|\d+[.)]\s*)?\**(Q|A|Question|Answer)\s*\d*\**\s*:\**\s*(.*\S)\s*$", re.I)
+EXERCISES_HEADING = re.compile(r"^\s*#*\s*\**exercises\**:?\s*$", re.I)
+EXERCISES_REQUEST = ("End with an Exercises section of 3 to 5 questions, each written as a line "
+                     "'Q: <question>' followed by a line 'A: <short answer>'.")
 
 class PerformanceMetric(BaseModel):
     """Model for tracking performance metrics."""
@@ -46,11 +66,14 @@ class LearningContent(BaseModel):
     exercises: List[Exercise]
     estimated_duration: int
 
-def assess_student_level() -> str:
-    """Simulates student assessment."""
-    levels = ["beginner", "intermediate", "advanced"]
-    current_time = int(time.time())
-    return levels[current_time % 3]
+def performance_observations(history: List[PerformanceMetric], topic: Optional[str] = None) -> List[tuple]:
+    """(difficulty, score) pairs of a student's graded answers on a topic, oldest first."""
+    metrics = [metric for metric in history if topic is None or metric.topic == topic]
+    return [(metric.difficulty, metric.score) for metric in sorted(metrics, key=lambda metric: metric.timestamp)]
+
+def assess_student_level(history: Optional[List[PerformanceMetric]] = None) -> str:
+    """Assesses the student's level from their graded answers; new students start at beginner."""
+    return recommend_difficulty(performance_observations(history or [])).level
 
 def generate_content(level: str) -> Dict[str, str]:
     """Generates appropriate learning content based on level."""
@@ -61,11 +84,9 @@ def generate_content(level: str) -> Dict[str, str]:
     }
     return {"content": content_types.get(level, "basic concepts")}
 
-def evaluate_performance() -> str:
-    """Evaluates student performance."""
-    scores = ["low", "medium", "high"]
-    current_time = int(time.time())
-    return scores[current_time % 3]
+def evaluate_performance(scores: Optional[List[float]] = None) -> str:
+    """Evaluates student performance from their latest scores between 0 and 1."""
+    return performance_band(scores or [])
 
 def adapt_difficulty(performance: str) -> str:
     """Adapts content difficulty based on performance."""
@@ -76,7 +97,136 @@ def adapt_difficulty(performance: str) -> str:
     }
     return adaptations.get(performance, "maintain")
 
-def create_adaptive_learning_agent():
+@lru_cache(maxsize=1)
+def get_content_bank() -> ContentBank:
+    """Get the shared content bank for generated learning material."""
+    return ContentBank(model=LearningContent)
+
+def grade_exercise(exercise: Exercise, response: str, topic: str, completion_time: Optional[int] = None,
+                   embedder=None) -> PerformanceMetric:
+    """Grade a student's answer to an exercise locally (see core.scoring.grade_answer).
+    
+    Args:
+        exercise: The exercise that was answered
+        response: The student's answer
+        topic: Topic the exercise belongs to
+        completion_time: Seconds the student took, if known
+        embedder: Embedder for free-text answers; HashingEmbedder by default
+        
+    Returns:
+        PerformanceMetric: The graded answer, ready for the student's history
+    """
+    grade = grade_answer(exercise.answer, response, exercise.type, embedder=embedder)
+    return PerformanceMetric(
+        score=grade.score,
+        topic=topic,
+        timestamp=datetime.now(),
+        difficulty=exercise.difficulty,
+        completion_time=completion_time,
+        feedback=f"{'correct' if grade.correct else 'incorrect'} ({grade.method} match)"
+    )
+
+def record_performance(student_id: str, metric: PerformanceMetric,
+                       memory: Optional[NamespaceManager] = None) -> str:
+    """Keep a graded answer in the student's namespace, where process_learning finds it."""
+    return (memory or get_namespace_manager()).remember(
+        namespace_for(student_id), metric.model_dump_json(), kind=PERFORMANCE_KIND
+    )
+
+def load_performance_history(student_id: str, memory: Optional[NamespaceManager] = None,
+                             limit: int = 500) -> List[PerformanceMetric]:
+    """Return a student's latest graded answers, oldest first."""
+    entries = (memory or get_namespace_manager()).entries(namespace_for(student_id), PERFORMANCE_KIND, limit)
+    return [PerformanceMetric.model_validate_json(entry.text) for entry in entries]
+
+def exercise_type(answer: str) -> str:
+    """Classify a reference answer so grading knows whether partial credit applies."""
+    if parse_number(answer) is not None:
+        return "numeric"
+    return "short_answer" if len(answer.split()) <= 3 else "open"
+
+def extract_exercises(text: str, difficulty: str) -> Tuple[str, List[Exercise]]:
+    """Split generated material into the lesson and its question/answer exercises.
+    
+    The answers must not be shown with the lesson, so the exercise lines, and
+    the heading above them, are removed from the returned text.
+    
+    Args:
+        text: Material written by the Content Generator
+        difficulty: Level of the material, given to every exercise
+        
+    Returns:
+        Tuple of the lesson text and the exercises that have an answer
+    """
+    lesson, exercises, question = [], [], None
+    for line in text.splitlines():
+        match = EXERCISE_LINE.match(line)
+        if match is None:
+            if question is None:
+                lesson.append(line)
+            elif line.strip():
+                # Choices and other continuation lines of the question
+                question = f"{question}\n{line.strip()}"
+            continue
+        label, value = match.group(1).lower(), match.group(2)
+        if label.startswith("q"):
+            question = value
+        elif question is not None:
+            exercises.append(Exercise(question=question, answer=value, difficulty=difficulty,
+                                      type=exercise_type(value)))
+            question = None
+    while lesson and (not lesson[-1].strip() or EXERCISES_HEADING.match(lesson[-1])):
+        lesson.pop()
+    return "\n".join(lesson), exercises
+
+def estimate_duration(text: str) -> int:
+    """Estimate study time in minutes at roughly 200 words per minute."""
+    return max(5, len(text.split()) // 200)
+
+def create_content_generator(config: Optional[Dict[str, Any]] = None) -> Agent:
+    """Create the sub-agent that writes learning content."""
+    return Agent(
+        name="Content Generator",
+        instructions="""Create personalized learning content:
+        1. Match content to student level
+        2. Incorporate learning preferences
+        3. Design engaging exercises
+        4. Include practical examples""",
+        tools=[generate_content],
+        knowledge_config=config or get_agent_config(),
+        user_id=SHARED_NAMESPACE,
+        llm="mistral:latest"
+    )
+
+def generate_learning_content(topic: str, difficulty: str, content_type: str = "lesson") -> LearningContent:
+    """Generate one piece of learning content with the Content Generator agent.
+    
+    Args:
+        topic: The topic to cover
+        difficulty: Student level the content targets
+        content_type: Kind of material to produce
+        
+    Returns:
+        LearningContent: The generated material
+    """
+    generator = create_content_generator()
+    raw = run_agent(
+        generator,
+        f"Create {difficulty} level {content_type} material on {topic}, including practical examples. "
+        f"{EXERCISES_REQUEST}"
+    )
+    lesson, exercises = extract_exercises(raw, difficulty)
+    return LearningContent(
+        topic=topic,
+        difficulty=difficulty,
+        content_type=content_type,
+        materials=[lesson],
+        exercises=exercises,
+        estimated_duration=estimate_duration(raw)
+    )
+
+def create_adaptive_learning_agent(topic: Optional[str] = None, include_generation: bool = True,
+                                   scores: Optional[List[float]] = None):
     """Create an adaptive learning agent that personalizes content and tracks progress.
     
     This agent provides:
@@ -85,6 +235,12 @@ def create_adaptive_learning_agent():
     - Performance tracking
     - Dynamic difficulty adjustment
     
+    Args:
+        topic: Optional topic the generated content should cover
+        include_generation: Whether the workflow generates content itself.
+            Disable it when the content is served from the content bank.
+        scores: The student's latest scores, passed to the evaluator's tool
+    
     Returns:
         Agent: An adaptive learning agent with comprehensive learning capabilities.
     """
@@ -102,22 +258,11 @@ def create_adaptive_learning_agent():
         4. Track progress over time""",
         tools=[assess_student_level],
         knowledge_config=config,
-        user_id="assessor",
+        user_id=SHARED_NAMESPACE,
         llm="mistral:latest"
     )
     
-    generator = Agent(
-        name="Content Generator",
-        instructions="""Create personalized learning content:
-        1. Match content to student level
-        2. Incorporate learning preferences
-        3. Design engaging exercises
-        4. Include practical examples""",
-        tools=[generate_content],
-        knowledge_config=config,
-        user_id="generator",
-        llm="mistral:latest"
-    )
+    generator = create_content_generator(config)
     
     evaluator = Agent(
         name="Performance Evaluator",
@@ -128,7 +273,7 @@ def create_adaptive_learning_agent():
         4. Generate progress reports""",
         tools=[evaluate_performance],
         knowledge_config=config,
-        user_id="evaluator",
+        user_id=SHARED_NAMESPACE,
         llm="mistral:latest"
     )
     
@@ -141,7 +286,7 @@ def create_adaptive_learning_agent():
         4. Recommend next steps""",
         tools=[adapt_difficulty],
         knowledge_config=config,
-        user_id="adapter",
+        user_id=SHARED_NAMESPACE,
         llm="mistral:latest"
     )
     
@@ -152,12 +297,13 @@ def create_adaptive_learning_agent():
         expected_output="Student's proficiency level",
         agent=assessor,
         is_start=True,
-        next_tasks=["generate_content"]
+        next_tasks=["generate_content" if include_generation else "evaluate_performance"]
     )
     
     generation_task = Task(
         name="generate_content",
-        description="Generate appropriate content",
+        description=(f"Generate appropriate content on {topic}. " if topic else "Generate appropriate content. ")
+        + EXERCISES_REQUEST,
         expected_output="Learning content",
         agent=generator,
         next_tasks=["evaluate_performance"]
@@ -165,7 +311,8 @@ def create_adaptive_learning_agent():
     
     evaluation_task = Task(
         name="evaluate_performance",
-        description="Evaluate student's performance",
+        description=f"Evaluate student's performance; latest scores: {scores}" if scores
+        else "Evaluate student's performance",
         expected_output="Performance assessment",
         agent=evaluator,
         next_tasks=["adapt_difficulty"]
@@ -178,61 +325,155 @@ def create_adaptive_learning_agent():
         agent=adapter,
         task_type="decision",
         condition={
-            "decrease": ["generate_content"],
+            "decrease": ["generate_content"] if include_generation else "",
             "maintain": "",
-            "increase": ["generate_content"]
+            "increase": ["generate_content"] if include_generation else ""
         }
     )
     
+    agents = [assessor, generator, evaluator, adapter]
+    tasks = [assessment_task, generation_task, evaluation_task, adaptation_task]
+    if not include_generation:
+        agents.remove(generator)
+        tasks.remove(generation_task)
+    
     # Create workflow
     workflow = PraisonAIAgents(
-        agents=[assessor, generator, evaluator, adapter],
-        tasks=[assessment_task, generation_task, evaluation_task, adaptation_task],
+        agents=agents,
+        tasks=tasks,
         process="workflow",
         verbose=True
     )
     
     return workflow
 
-def process_learning(student_id: str, topic: str) -> Dict[str, any]:
+def describe_evaluation(recommendation: DifficultyRecommendation, level: str,
+                        scores: List[float]) -> Dict[str, Optional[str]]:
+    """Render a local evaluation in the shape of the workflow's task results."""
+    if not recommendation.answers:
+        return {
+            "assessment": f"{level} (no graded answers yet)",
+            "performance": None,
+            "adaptation": None
+        }
+    recent = scores[-5:]
+    return {
+        "assessment": f"{level} (ability {recommendation.ability:+.2f} from {recommendation.answers} graded answers)",
+        "performance": f"{performance_band(scores)} (average {sum(recent) / len(recent):.0%} "
+                       f"over the last {len(recent)} answers)",
+        "adaptation": f"{recommendation.adjustment} difficulty: next session at {recommendation.level} level "
+                      f"(expected success {recommendation.expected_success:.0%})"
+    }
+
+def process_learning(student_id: str, topic: str, difficulty: Optional[str] = None,
+                     content_type: str = "lesson", content_bank: Optional[ContentBank] = None,
+                     memory: Optional[NamespaceManager] = None,
+                     history: Optional[List[PerformanceMetric]] = None,
+                     llm_evaluation: bool = False) -> Dict[str, any]:
     """Process a learning session for a student.
     
+    Content for the topic and difficulty is served from the content bank when
+    available, so the Content Generator only runs on a miss. When the bank's
+    coverage for the key is thin, a fresh variant is generated in the
+    background for later sessions. A summary of the session is remembered in
+    the student's own namespace.
+    
+    The student's level, performance and next difficulty are computed locally
+    from their graded answers (see core.scoring), so a session costs at most
+    the one LLM call that generates content. With ``llm_evaluation`` the
+    assessor, evaluator and adapter agents run as well.
+    
     Args:
         student_id: Unique identifier for the student
         topic: The topic to learn
+        difficulty: Student level; estimated from the history if omitted
+        content_type: Kind of material to serve
+        content_bank: Bank to serve from; defaults to the shared bank
+        memory: Namespace manager to use instead of the process-wide one
+        history: The student's graded answers, e.g. from grade_exercise();
+            the answers kept by record_performance() if omitted
+        llm_evaluation: Run the full multi-agent workflow
         
     Returns:
-        Dict containing the learning session results and recommendations
+        Dict containing the learning session results and recommendations,
+        including the exercises to answer (with their reference answers)
     """
-    workflow = create_adaptive_learning_agent()
+    bank = content_bank or get_content_bank()
+    if history is None:
+        try:
+            history = load_performance_history(student_id, memory)
+        except Exception:
+            # Without stored answers the student is placed as a new one
+            history = []
+    observations = performance_observations(history, topic)
+    scores = [score for _, score in observations]
+    recommendation = recommend_difficulty(observations, current_level=difficulty)
+    level = difficulty or recommendation.level
+    try:
+        banked = bank.lookup(topic, level, content_type)
+    except Exception:
+        # A locked or corrupt bank only costs the cache hit; generate instead
+        banked, bank = None, None
     
     try:
-        # Run the adaptive learning workflow
-        results = workflow.start()
-        
         # Process and structure the results
         session_results = {
             "student_id": student_id,
             "topic": topic,
             "timestamp": datetime.now(),
-            "assessment": None,
-            "content": None,
-            "performance": None,
-            "adaptation": None
+            "difficulty": level,
+            "ability": recommendation.ability,
+            "content": "\n\n".join(banked.materials) if banked else None,
+            "content_source": "bank" if banked else "generated",
+            **describe_evaluation(recommendation, level, scores)
         }
+        exercises = list(banked.exercises) if banked else []
+        
+        if llm_evaluation:
+            # Run the adaptive learning workflow
+            workflow = create_adaptive_learning_agent(topic=topic, include_generation=banked is None,
+                                                      scores=scores)
+            results = workflow.start(return_dict=True)
+            
+            # Extract results from each task
+            for task_id, result in results["task_results"].items():
+                if result:
+                    # Results are keyed by task index; map them back to task names
+                    task_id = workflow.tasks[task_id].name
+                    if task_id == "assess_level":
+                        session_results["assessment"] = result.raw
+                    elif task_id == "generate_content":
+                        session_results["content"], exercises = extract_exercises(result.raw, level)
+                    elif task_id == "evaluate_performance":
+                        session_results["performance"] = result.raw
+                    elif task_id == "adapt_difficulty":
+                        session_results["adaptation"] = result.raw
+        elif banked is None:
+            generated = generate_learning_content(topic, level, content_type)
+            session_results["content"] = "\n\n".join(generated.materials)
+            exercises = generated.exercises
         
-        # Extract results from each task
-        for task_id, result in results["task_results"].items():
-            if result:
-                if task_id == "assess_level":
-                    session_results["assessment"] = result.raw
-                elif task_id == "generate_content":
-                    session_results["content"] = result.raw
-                elif task_id == "evaluate_performance":
-                    session_results["performance"] = result.raw
-                elif task_id == "adapt_difficulty":
-                    session_results["adaptation"] = result.raw
+        if banked is None and bank is not None and session_results["content"]:
+            bank.add(LearningContent(
+                topic=topic,
+                difficulty=level,
+                content_type=content_type,
+                materials=[session_results["content"]],
+                exercises=exercises,
+                estimated_duration=estimate_duration(session_results["content"])
+            ))
+        elif banked is not None and bank.needs_generation(topic, level, content_type):
+            bank.generate_in_background(
+                topic, level, content_type,
+                lambda: generate_learning_content(topic, level, content_type)
+            )
         
+        (memory or get_namespace_manager()).remember(
+            namespace_for(student_id),
+            f"Learning session on {topic} at {level} level; next steps: {session_results['adaptation'] or 'none'}",
+            kind="learning"
+        )
+        session_results["exercises"] = [exercise.model_dump() for exercise in exercises]
         return session_results
         
     except Exception as e:
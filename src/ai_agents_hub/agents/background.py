@@ -0,0 +1,79 @@
+"""Background job handlers for long-running agent work."""
+
+import os
+import threading
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict
+
+from ai_agents_hub.agents.adaptive_learning_agent import PerformanceMetric, process_learning
+from ai_agents_hub.agents.code_analysis_agent import create_code_analysis_agent, process_analysis
+from ai_agents_hub.agents.code_review_agent import (
+    TRIAGE_MODEL,
+    create_code_review_agent,
+    process_review,
+    process_review_cascade,
+)
+from ai_agents_hub.core.jobs import JobQueue
+from ai_agents_hub.core.prompt_compactor import compact_code
+
+# Each worker thread keeps its own warm agents; praisonaiagents agents are not thread-safe
+_agents = threading.local()
+
+def _worker_agent(name: str, factory):
+    agent = getattr(_agents, name, None)
+    if agent is None:
+        agent = factory()
+        setattr(_agents, name, agent)
+    # Agents resend their whole chat_history with every prompt; a job must not
+    # see the code and reviews of the jobs the worker ran before it
+    agent.chat_history = []
+    return agent
+
+def tokens_note(original_tokens: int, compact_tokens: int) -> str:
+    saved = (original_tokens - compact_tokens) / original_tokens if original_tokens else 0.0
+    return f"\n\n*Prompt code: {compact_tokens} tokens instead of {original_tokens} ({saved:.0%} saved)*"
+
+def run_code_review(payload: Dict[str, Any]) -> str:
+    """Job handler for process_review, in cascade mode when the payload asks for it."""
+    agent = _worker_agent("code_review", create_code_review_agent)
+    if payload.get("cascade"):
+        triage_agent = _worker_agent("code_review_triage", lambda: create_code_review_agent(llm=TRIAGE_MODEL))
+        result = process_review_cascade(payload["code"], triage_agent=triage_agent, review_agent=agent)
+        return result.review + tokens_note(result.original_tokens, result.compact_tokens)
+    compacted = compact_code(payload["code"])
+    review = process_review(payload["code"], agent=agent, compacted=compacted)
+    return str(review) + tokens_note(compacted.original_tokens, compacted.compact_tokens)
+
+def run_code_analysis(payload: Dict[str, Any]) -> str:
+    """Job handler for code analysis."""
+    agent = _worker_agent("code_analysis", create_code_analysis_agent)
+    compacted = compact_code(payload["code"])
+    report = process_analysis(payload["code"], agent=agent, compacted=compacted)
+    return str(report) + tokens_note(compacted.original_tokens, compacted.compact_tokens)
+
+def run_learning(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Job handler for process_learning; the payload may carry the student's graded answers."""
+    history = [PerformanceMetric(**metric) for metric in payload["history"]] if "history" in payload else None
+    results = process_learning(payload["student_id"], payload["topic"], history=history,
+                               llm_evaluation=payload.get("llm_evaluation", False))
+    return {key: value.isoformat() if isinstance(value, datetime) else value for key, value in results.items()}
+
+JOB_HANDLERS = {
+    "code_review": run_code_review,
+    "code_analysis": run_code_analysis,
+    "learning": run_learning,
+}
+
+@lru_cache(maxsize=1)
+def get_job_queue() -> JobQueue:
+    """Get the process-wide job queue with its worker pool running.
+
+    The number of workers is read from AI_AGENTS_HUB_JOB_WORKERS (default 2).
+    """
+    # A learning session is a new session each time; only merge it with one still in flight
+    queue = JobQueue(handlers=JOB_HANDLERS, dedupe_ttls={"learning": 0.0})
+    # Jobs whose worker stopped renewing the lease belong to a worker that died; run them again.
+    queue.requeue_stale()
+    queue.start_workers(int(os.environ.get("AI_AGENTS_HUB_JOB_WORKERS", "2")))
+    return queue
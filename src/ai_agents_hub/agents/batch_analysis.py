@@ -0,0 +1,462 @@
+"""Repository-scale code analysis sharded across a process pool.
+
+Example:
+    python scripts/analyze_repo.py path/to/repo --workers 8 --llm-files 10 --llm-concurrency 2
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from ai_agents_hub.agents.code_analysis_agent import (
+    ANALYSIS_INSTRUCTIONS,
+    ANALYSIS_MODEL,
+    ANALYSIS_PROMPT,
+    CodeAnalysisReport,
+    CodeMetrics,
+    create_code_analysis_agent,
+    process_analysis,
+)
+from ai_agents_hub.core.static_checks import BRANCH_NODES, StaticFinding, analyze_code
+
+DEFAULT_CACHE_DIR = Path(".praison") / "analysis_cache"
+
+# Bump when the pre-analysis changes so cached results are not reused
+ANALYZER_VERSION = "1"
+
+LANGUAGES = {
+    ".py": "Python", ".js": "JavaScript", ".jsx": "JavaScript", ".ts": "TypeScript", ".tsx": "TypeScript",
+    ".java": "Java", ".kt": "Kotlin", ".go": "Go", ".rb": "Ruby", ".rs": "Rust", ".c": "C", ".h": "C",
+    ".cpp": "C++", ".hpp": "C++", ".cs": "C#", ".php": "PHP", ".swift": "Swift", ".scala": "Scala",
+    ".sh": "Shell",
+}
+EXCLUDED_DIRS = {
+    ".git", ".hg", ".svn", "__pycache__", "node_modules", ".venv", "venv", "env", ".tox", ".nox",
+    ".praison", "build", "dist", ".mypy_cache", ".pytest_cache", "site-packages",
+}
+BRANCH_KEYWORDS = re.compile(r"\b(if|for|while|case|catch|except|elif)\b|&&|\|\|")
+SEVERITY_WEIGHTS = {"high": 10.0, "medium": 4.0, "low": 1.0}
+
+class FileAnalysis(BaseModel):
+    """Local pre-analysis of one file, plus the LLM report if it was a hotspot."""
+    path: str
+    language: str
+    sha256: str
+    lines: int
+    code_lines: int
+    functions: int
+    documented_functions: int
+    max_complexity: int
+    total_complexity: int
+    findings: List[StaticFinding]
+    imports: List[str]
+    is_test: bool
+    parse_error: bool = False
+    hotspot_score: float = 0.0
+    llm_report: Optional[str] = None
+    cached: bool = False
+
+class Hotspot(BaseModel):
+    """File ranked among the riskiest of the repository."""
+    path: str
+    score: float
+    reasons: List[str]
+
+class RepositoryAnalysis(BaseModel):
+    """Repository-level report with the per-file results it was built from."""
+    root: str
+    report: CodeAnalysisReport
+    hotspots: List[Hotspot]
+    files: List[FileAnalysis]
+    cache_hits: int
+    elapsed: Dict[str, float]
+
+def discover_files(root: Path, extensions: Sequence[str] = tuple(LANGUAGES),
+                   max_file_bytes: int = 1_000_000) -> List[Path]:
+    """List source files under ``root``, skipping VCS, virtualenv and build directories."""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in EXCLUDED_DIRS and not d.endswith(".egg-info"))
+        for filename in sorted(filenames):
+            path = Path(dirpath) / filename
+            if path.suffix in extensions and path.stat().st_size <= max_file_bytes:
+                files.append(path)
+    return files
+
+def make_shards(sizes: Dict[str, int], n_shards: int) -> List[List[str]]:
+    """Split files into ``n_shards`` groups of similar total size, largest files first."""
+    shards: List[List[str]] = [[] for _ in range(max(1, n_shards))]
+    loads = [0] * len(shards)
+    for path in sorted(sizes, key=lambda p: (-sizes[p], p)):
+        lightest = loads.index(min(loads))
+        shards[lightest].append(path)
+        loads[lightest] += sizes[path]
+    return [shard for shard in shards if shard]
+
+def is_test_file(path: str) -> bool:
+    parts = Path(path).parts
+    name = parts[-1]
+    return (any(part in ("test", "tests", "__tests__", "spec") for part in parts[:-1])
+            or name.startswith("test_") or bool(re.search(r"[._](test|spec)\.\w+$", name)))
+
+def hotspot_reasons(analysis: FileAnalysis) -> Tuple[float, List[str]]:
+    """Score how much attention a file needs, and say why."""
+    reasons = []
+    finding_weight = sum(SEVERITY_WEIGHTS.get(f.severity, 1.0) for f in analysis.findings)
+    score = finding_weight + analysis.max_complexity + analysis.code_lines / 100
+    high = sum(f.severity == "high" for f in analysis.findings)
+    if high:
+        reasons.append(f"{high} high-severity finding{'s' if high > 1 else ''}")
+    if analysis.max_complexity > 10:
+        reasons.append(f"complexity {analysis.max_complexity}")
+    if analysis.code_lines > 500:
+        reasons.append(f"{analysis.code_lines} lines of code")
+    if analysis.parse_error:
+        reasons.append("does not parse")
+        score += 5
+    if analysis.is_test:
+        score /= 2
+    return round(score, 2), reasons
+
+def pre_analyze(relative_path: str, text: str) -> FileAnalysis:
+    """Analyze one file locally, without a model."""
+    suffix = Path(relative_path).suffix
+    lines = text.splitlines()
+    code_lines = sum(1 for line in lines if line.strip() and not line.strip().startswith(("#", "//", "*", "/*")))
+    findings = [finding for signals in analyze_code(text) for finding in signals.findings]
+    functions = documented = max_complexity = 0
+    total_complexity = 0
+    imports: List[str] = []
+    parse_error = False
+    if suffix == ".py":
+        try:
+            tree = ast.parse(text)
+        except SyntaxError:
+            parse_error = True
+        else:
+            for node in ast.walk(tree):
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    functions += 1
+                    documented += ast.get_docstring(node) is not None
+                    complexity = 1 + sum(isinstance(child, BRANCH_NODES) for child in ast.walk(node))
+                    max_complexity = max(max_complexity, complexity)
+                    total_complexity += complexity
+                elif isinstance(node, ast.Import):
+                    imports.extend(alias.name.split(".")[0] for alias in node.names)
+                elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                    imports.append(node.module.split(".")[0])
+    else:
+        # No parser for other languages: count branch keywords for the whole file
+        total_complexity = max_complexity = 1 + len(BRANCH_KEYWORDS.findall(text))
+    analysis = FileAnalysis(
+        path=relative_path,
+        language=LANGUAGES.get(suffix, suffix.lstrip(".")),
+        sha256=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        lines=len(lines),
+        code_lines=code_lines,
+        functions=functions,
+        documented_functions=documented,
+        max_complexity=max_complexity,
+        total_complexity=total_complexity,
+        findings=findings,
+        imports=sorted(set(imports)),
+        is_test=is_test_file(relative_path),
+        parse_error=parse_error,
+    )
+    analysis.hotspot_score = hotspot_reasons(analysis)[0]
+    return analysis
+
+class ResultCache:
+    """Content-addressed cache of analysis results on the local disk.
+
+    Entries are keyed by file content, so unchanged files are not analyzed
+    again in later runs, and renamed or duplicated files reuse the result.
+    Writes go through a rename, so concurrent workers never see partial files.
+    """
+
+    def __init__(self, directory: Path = DEFAULT_CACHE_DIR):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._memory: Dict[str, Dict] = {}
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        if key in self._memory:
+            return self._memory[key]
+        try:
+            value = json.loads(self._path(key).read_text())
+        except (OSError, ValueError):
+            return None
+        self._memory[key] = value
+        return value
+
+    def put(self, key: str, value: Dict):
+        self._memory[key] = value
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(value))
+        os.replace(tmp, path)
+
+# Per-process worker state, set by _init_worker
+_worker: Dict = {}
+
+def _init_worker(cache_dir: str, llm_semaphore):
+    _worker["cache"] = ResultCache(Path(cache_dir))
+    _worker["llm_semaphore"] = llm_semaphore
+    _worker["agent"] = None
+
+def _pre_analyze_shard(root: str, paths: List[str]) -> List[FileAnalysis]:
+    """Worker task: pre-analyze a shard of files, using the cache."""
+    cache: ResultCache = _worker["cache"]
+    results = []
+    for relative_path in paths:
+        text = (Path(root) / relative_path).read_text(encoding="utf-8", errors="replace")
+        # The language, and with it parsing and complexity, follows the suffix
+        key = f"{ANALYZER_VERSION}-{Path(relative_path).suffix}-{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+        cached = cache.get(key)
+        if cached is not None:
+            # Test detection depends on the path, which is not part of the key
+            analysis = FileAnalysis(**dict(cached, path=relative_path, is_test=is_test_file(relative_path), cached=True))
+            analysis.hotspot_score = hotspot_reasons(analysis)[0]
+        else:
+            analysis = pre_analyze(relative_path, text)
+            cache.put(key, analysis.model_dump(exclude={"path", "cached"}))
+        results.append(analysis)
+    return results
+
+def llm_cache_key(sha256: str) -> str:
+    """Cache key of a file's LLM report; a new model, prompt or analyzer version invalidates it."""
+    setup = "\0".join([ANALYZER_VERSION, ANALYSIS_MODEL, ANALYSIS_INSTRUCTIONS, ANALYSIS_PROMPT])
+    return f"llm-{hashlib.sha256(setup.encode('utf-8')).hexdigest()[:16]}-{sha256}"
+
+def _llm_analyze_shard(root: str, files: List[Tuple[str, str]]) -> Dict[str, str]:
+    """Worker task: run the warm analysis agent on hotspot files, within the global cap."""
+    cache: ResultCache = _worker["cache"]
+    reports = {}
+    for relative_path, sha256 in files:
+        key = llm_cache_key(sha256)
+        cached = cache.get(key)
+        if cached is not None:
+            reports[relative_path] = cached["report"]
+            continue
+        if _worker["agent"] is None:
+            _worker["agent"] = create_code_analysis_agent()
+        # The agent resends its chat_history; each file's report must only depend on that file
+        _worker["agent"].chat_history = []
+        code = (Path(root) / relative_path).read_text(encoding="utf-8", errors="replace")
+        with _worker["llm_semaphore"]:
+            report = str(process_analysis(code, agent=_worker["agent"]))
+        cache.put(key, {"report": report})
+        reports[relative_path] = report
+    return reports
+
+def _percent(part: float, whole: float, default: int = 100) -> int:
+    return int(round(100 * part / whole)) if whole else default
+
+def _clamp(value: float) -> int:
+    return int(max(0, min(100, round(value))))
+
+def build_report(files: List[FileAnalysis], hotspots: List[Hotspot]) -> CodeAnalysisReport:
+    """Aggregate per-file results into a repository-level CodeAnalysisReport.
+
+    Scores are heuristics over the static findings: finding density per
+    thousand lines of code, function complexity, docstring coverage, file
+    sizes, and the ratio of test code to other code for test coverage.
+    """
+    source = [f for f in files if not f.is_test]
+    code_lines = sum(f.code_lines for f in source)
+    kloc = max(code_lines / 1000, 1.0)
+    findings = [(f.path, finding) for f in files for finding in f.findings]
+
+    def density(issue_type: str) -> float:
+        return sum(SEVERITY_WEIGHTS[x.severity] for _, x in findings if x.type == issue_type) / kloc
+
+    functions = sum(f.functions for f in files)
+    average_complexity = sum(f.total_complexity for f in files) / max(functions, 1)
+    max_complexity = max((f.max_complexity for f in files), default=0)
+    security_score = _clamp(100 - 2 * density("security"))
+    maintainability_score = _clamp(100 - 4 * max(0.0, average_complexity - 5) - density("bug") - density("maintainability"))
+    performance_score = _clamp(100 - 2 * max(0, max_complexity - 15) - density("performance"))
+    architecture_score = _percent(sum(f.code_lines <= 500 for f in source), len(source))
+    documentation_quality = _percent(sum(f.documented_functions for f in files), functions)
+    test_coverage = _clamp(_percent(sum(f.code_lines for f in files if f.is_test), code_lines, default=0))
+    style_score = _clamp(100 - 2 * density("style"))
+    bug_score = _clamp(100 - 2 * density("bug"))
+    scores = {
+        "security": security_score,
+        "maintainability": maintainability_score,
+        "performance": performance_score,
+        "architecture": architecture_score,
+        "documentation": documentation_quality,
+        "testing": test_coverage,
+    }
+
+    code_metrics = [
+        CodeMetrics(category=category, score=score, findings=[
+            f"{path}:{x.line_number} {x.description}" for path, x in findings if x.type == issue_type
+        ][:10])
+        for category, issue_type, score in (
+            ("security", "security", security_score),
+            ("bugs", "bug", bug_score),
+            ("style", "style", style_score),
+            ("maintainability", "maintainability", maintainability_score),
+        )
+    ]
+    languages = Counter(f.language for f in files)
+    packages = Counter(name for f in files for name in f.imports)
+    bare_excepts = sum(x.description == "Bare except hides errors" for _, x in findings)
+    credentials = sum(x.description == "Hard-coded credential" for _, x in findings)
+    recommendations = [f"Review {h.path} first: {', '.join(h.reasons) or 'highest combined risk'}" for h in hotspots]
+    recommendations += [
+        f"{path}: {report.strip().splitlines()[0]}"
+        for path, report in ((f.path, f.llm_report) for f in files if f.llm_report and f.llm_report.strip())
+    ]
+    return CodeAnalysisReport(
+        overall_quality=_clamp(sum(scores.values()) / len(scores)),
+        code_metrics=code_metrics,
+        architecture_score=architecture_score,
+        maintainability_score=maintainability_score,
+        performance_score=performance_score,
+        security_score=security_score,
+        test_coverage=test_coverage,
+        key_strengths=[f"{name.capitalize()} score {score}" for name, score in scores.items() if score >= 80],
+        improvement_areas=[f"{name.capitalize()} score {score}" for name, score in scores.items() if score < 60],
+        tech_stack=[language for language, _ in languages.most_common()] + [name for name, _ in packages.most_common(10)],
+        recommendations=recommendations,
+        complexity_metrics={
+            "files": len(files),
+            "lines": sum(f.lines for f in files),
+            "code_lines": code_lines,
+            "functions": functions,
+            "max_complexity": max_complexity,
+            "average_complexity": int(round(average_complexity)),
+        },
+        best_practices=[
+            {"practice": "Docstrings on functions", "status": f"{documentation_quality}% documented"},
+            {"practice": "No bare except", "status": "followed" if not bare_excepts else f"{bare_excepts} violations"},
+            {"practice": "No hard-coded credentials", "status": "followed" if not credentials else f"{credentials} violations"},
+        ],
+        potential_risks=[f"{path}:{x.line_number} {x.description}" for path, x in findings if x.severity == "high"][:20],
+        documentation_quality=documentation_quality,
+    )
+
+def analyze_repository(root: Path, workers: Optional[int] = None, top_n: int = 10, llm_files: int = 0,
+                       llm_concurrency: int = 1, cache_dir: Path = DEFAULT_CACHE_DIR,
+                       extensions: Sequence[str] = tuple(LANGUAGES),
+                       shards_per_worker: int = 4) -> RepositoryAnalysis:
+    """Analyze every source file of a repository.
+
+    Files are split into shards of similar size and pre-analyzed locally by a
+    pool of processes, which scales with the number of cores. The ``llm_files``
+    highest-ranked hotspots are then analyzed by the Code Analysis agent; each
+    worker process keeps one warm agent, and a semaphore shared by all
+    processes keeps at most ``llm_concurrency`` model calls in flight. Both
+    phases go through a content-addressed cache on disk.
+
+    Args:
+        root: Repository directory
+        workers: Worker processes; defaults to the number of CPUs
+        top_n: Number of hotspots to report
+        llm_files: Hotspots to analyze with the model (0 = local analysis only)
+        llm_concurrency: Maximum concurrent model calls across all workers
+        cache_dir: Directory of the result cache
+        extensions: File extensions to analyze
+        shards_per_worker: Shards per worker; more shards balance uneven files better
+
+    Returns:
+        RepositoryAnalysis: Repository report, hotspots and per-file results
+    """
+    root = Path(root).resolve()
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    sizes = {str(path.relative_to(root)): path.stat().st_size for path in discover_files(root, extensions)}
+    shards = make_shards(sizes, workers * shards_per_worker)
+    llm_semaphore = multiprocessing.Semaphore(max(1, llm_concurrency))
+    elapsed: Dict[str, float] = {}
+
+    if workers == 1:
+        # Run in this process; the pool would only add start-up and pickling costs
+        _init_worker(str(cache_dir), llm_semaphore)
+        pool = None
+        run = lambda fn, tasks: [fn(*task) for task in tasks]
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(str(cache_dir), llm_semaphore))
+        run = lambda fn, tasks: list(pool.map(fn, *zip(*tasks))) if tasks else []
+    try:
+        files = [analysis for shard in run(_pre_analyze_shard, [(str(root), shard) for shard in shards])
+                 for analysis in shard]
+        elapsed["pre_analysis"] = time.perf_counter() - started
+
+        ranked = sorted(files, key=lambda f: (-f.hotspot_score, f.path))
+        if llm_files > 0:
+            llm_started = time.perf_counter()
+            targets = ranked[:llm_files]
+            llm_shards = [targets[i::workers] for i in range(min(workers, len(targets)))]
+            reports: Dict[str, str] = {}
+            for shard_reports in run(_llm_analyze_shard, [
+                (str(root), [(f.path, f.sha256) for f in shard]) for shard in llm_shards
+            ]):
+                reports.update(shard_reports)
+            for analysis in files:
+                analysis.llm_report = reports.get(analysis.path)
+            elapsed["llm_analysis"] = time.perf_counter() - llm_started
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    hotspots = [Hotspot(path=f.path, score=f.hotspot_score, reasons=hotspot_reasons(f)[1]) for f in ranked[:top_n]]
+    report = build_report(files, hotspots)
+    elapsed["total"] = time.perf_counter() - started
+    return RepositoryAnalysis(
+        root=str(root),
+        report=report,
+        hotspots=hotspots,
+        files=sorted(files, key=lambda f: f.path),
+        cache_hits=sum(f.cached for f in files),
+        elapsed={name: round(seconds, 3) for name, seconds in elapsed.items()},
+    )
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Analyze a whole repository with a pool of worker processes")
+    parser.add_argument("root", type=Path, help="Repository directory")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--top", type=int, default=10, help="Hotspots to report")
+    parser.add_argument("--llm-files", type=int, default=0, help="Hotspots to analyze with the model")
+    parser.add_argument("--llm-concurrency", type=int, default=1, help="Concurrent model calls across workers")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--output", type=Path, help="Write the full analysis as JSON")
+    args = parser.parse_args(argv)
+
+    analysis = analyze_repository(args.root, workers=args.workers, top_n=args.top, llm_files=args.llm_files,
+                                  llm_concurrency=args.llm_concurrency, cache_dir=args.cache_dir)
+    report = analysis.report
+    print(f"Analyzed {len(analysis.files)} files in {analysis.elapsed['total']:.2f}s "
+          f"({analysis.cache_hits} from cache)")
+    print(f"Overall quality {report.overall_quality}, security {report.security_score}, "
+          f"maintainability {report.maintainability_score}, documentation {report.documentation_quality}")
+    print("Hotspots:")
+    for hotspot in analysis.hotspots:
+        print(f"  {hotspot.score:>8.1f}  {hotspot.path}  {', '.join(hotspot.reasons)}")
+    if args.output:
+        args.output.write_text(analysis.model_dump_json(indent=2))
+        print(f"Wrote {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,11 +2,56 @@
 
 from praisonaiagents import Agent
 from ai_agents_hub.config import get_agent_config
+from ai_agents_hub.core.namespaces import SHARED_NAMESPACE, NamespaceManager, get_namespace_manager
+from ai_agents_hub.core.ollama import OllamaClient
+from ai_agents_hub.core.prompt_compactor import estimate_tokens
 from pydantic import BaseModel
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 
+CHAT_MODEL = "deepseek-r1:1.5b"
+
+# Ollama's default context window is 2048 tokens; restart the context well before it fills
+CONTEXT_TOKEN_BUDGET = 1536
+# Latest history replayed when a context is restarted
+RESTART_TRANSCRIPT_TOKENS = 512
+
+# Kept constant so every turn shares the same cacheable prompt prefix
+CHAT_INSTRUCTIONS = """You are a versatile chat assistant. Your role is to:
+
+        1. Communication:
+           - Maintain natural, engaging conversation
+           - Provide clear, concise responses
+           - Use appropriate tone and formality
+           - Maintain context awareness
+
+        2. Knowledge & Assistance:
+           - Answer general knowledge questions
+           - Help with task planning and organization
+           - Provide explanations and examples
+           - Guide users through processes
+
+        3. Context Management:
+           - Track conversation context
+           - Reference previous interactions
+           - Maintain coherent dialogue flow
+           - Adapt responses based on context
+
+        4. Response Quality:
+           - Ensure accuracy and relevance
+           - Provide structured information
+           - Include sources when appropriate
+           - Maintain appropriate detail level
+
+        5. Special Abilities:
+           - Recognize when to defer to specialized agents
+           - Handle multi-turn conversations
+           - Manage topic transitions
+           - Support various query types
+
+        Always aim to be helpful while maintaining a professional and friendly demeanor."""
+
 class ChatMessage(BaseModel):
     """Model for chat messages."""
     content: str
@@ -21,6 +66,9 @@ class ChatSession(BaseModel):
     start_time: datetime
     last_activity: datetime
     metadata: Dict[str, str]
+    llm_context: Optional[List[int]] = None
+    namespace: Optional[str] = None  # Per-user memory namespace, see core.namespaces
+    notes_in_context: List[str] = []  # Recalled notes already sent in llm_context
 
 def create_chat_agent():
     """Create a general-purpose chat agent for handling various queries and tasks.
@@ -41,85 +89,144 @@ def create_chat_agent():
     
     return Agent(
         name="General Assistant",
-        instructions="""You are a versatile chat assistant. Your role is to:
-
-        1. Communication:
-           - Maintain natural, engaging conversation
-           - Provide clear, concise responses
-           - Use appropriate tone and formality
-           - Maintain context awareness
+        instructions=CHAT_INSTRUCTIONS,
+        # knowledge=[str(docs_path)] if docs_path.exists() else [],
+        knowledge_config=config,
+        user_id=SHARED_NAMESPACE,
+        llm=CHAT_MODEL
+    )
 
-        2. Knowledge & Assistance:
-           - Answer general knowledge questions
-           - Help with task planning and organization
-           - Provide explanations and examples
-           - Guide users through processes
+def transcript(messages: List[ChatMessage]) -> str:
+    """Render chat messages as a plain transcript, oldest first."""
+    return "\n".join(f"{m.type}: {m.content}" for m in messages)
 
-        3. Context Management:
-           - Track conversation context
-           - Reference previous interactions
-           - Maintain coherent dialogue flow
-           - Adapt responses based on context
+def trimmed_transcript(messages: List[ChatMessage], max_tokens: int) -> str:
+    """Render the latest messages that fit in about ``max_tokens`` tokens, oldest first."""
+    lines, used = [], 0
+    for m in reversed(messages):
+        line = f"{m.type}: {m.content}"
+        cost = estimate_tokens(line)
+        if lines and used + cost > max_tokens:
+            break
+        lines.append(line)
+        used += cost
+    return "\n".join(reversed(lines))
 
-        4. Response Quality:
-           - Ensure accuracy and relevance
-           - Provide structured information
-           - Include sources when appropriate
-           - Maintain appropriate detail level
+def recall_memories(session: ChatSession, message: str, memory: Optional[NamespaceManager] = None) -> List[str]:
+    """Return notes from the user's earlier sessions that relate to a message.
+    
+    Only the session's own namespace is searched. Entries written by the
+    session itself, and notes already sent in its context, are skipped
+    because the model has seen them.
+    """
+    if not session.namespace:
+        return []
+    memory = memory or get_namespace_manager()
+    return [
+        entry.text for entry in memory.search(session.namespace, message, exclude_source=session.session_id)
+        if entry.text not in session.notes_in_context
+    ]
 
-        5. Special Abilities:
-           - Recognize when to defer to specialized agents
-           - Handle multi-turn conversations
-           - Manage topic transitions
-           - Support various query types
+def turn_prompt(session: ChatSession, message: str, memory: Optional[NamespaceManager] = None,
+                max_context_tokens: int = CONTEXT_TOKEN_BUDGET) -> Tuple[str, List[str]]:
+    """Build the prompt for the next turn of a session.
+    
+    Once the session's context holds more than ``max_context_tokens`` tokens
+    it is dropped, and the conversation restarts from a transcript of the
+    latest messages. Notes recalled from earlier sessions follow the message
+    on the turn that first finds them; a restart leaves out the old ones.
+    The caller adds the returned notes to ``session.notes_in_context`` once
+    the turn went through, so a failed turn sends them again.
+    
+    Args:
+        session: Chat session to continue; its context may be reset
+        message: The user's new message
+        memory: Namespace manager to use instead of the process-wide one
+        max_context_tokens: Context size from which the context is restarted
+        
+    Returns:
+        Tuple of the prompt to send with the session's context and the
+        recalled notes it carries
+    """
+    if session.llm_context and len(session.llm_context) > max_context_tokens:
+        session.llm_context = None
+        session.notes_in_context = []
+    prompt = message
+    if not session.llm_context and session.messages:
+        # Restored or restarted session: replay the latest history once as a prefix
+        prompt = f"{trimmed_transcript(session.messages, RESTART_TRANSCRIPT_TOKENS)}\nuser: {message}"
+    notes = recall_memories(session, message, memory)
+    if notes:
+        prompt = f"{prompt}\n\nNotes from earlier conversations:\n" + "\n".join(f"- {note}" for note in notes)
+    return prompt, notes
 
-        Always aim to be helpful while maintaining a professional and friendly demeanor.""",
-        # knowledge=[str(docs_path)] if docs_path.exists() else [],
-        knowledge_config=config,
-        user_id="general_assistant",
-        llm="deepseek-r1:1.5b"
-    )
+def remember_exchange(session: ChatSession, message: str, reply: str, kind: str,
+                      memory: Optional[NamespaceManager] = None):
+    """Store a question and its answer in the session's namespace."""
+    if session.namespace:
+        memory = memory or get_namespace_manager()
+        memory.remember(session.namespace, f"user: {message}\nassistant: {reply}", kind=kind,
+                        source=session.session_id)
 
-def process_chat(message: str, session: Optional[ChatSession] = None) -> ChatMessage:
+def process_chat(message: str, session: Optional[ChatSession] = None,
+                 client: Optional[OllamaClient] = None,
+                 memory: Optional[NamespaceManager] = None) -> ChatMessage:
     """Process a chat message and generate a response.
     
+    With a session, the conversation is continued through Ollama's context:
+    the system instructions and history form a stable prefix that is only
+    prefilled once, and each turn sends just the new message. The session's
+    messages are append-only and updated in place. The context is restarted
+    from the latest messages when it outgrows CONTEXT_TOKEN_BUDGET.
+    
+    If the session has a namespace, related notes from the user's earlier
+    sessions are added after the message and the exchange is remembered.
+    
     Args:
         message: The user's input message
         session: Optional chat session for context
+        client: Ollama client to use; one is created from the config if omitted
+        memory: Namespace manager to use instead of the process-wide one
         
     Returns:
         ChatMessage: The agent's response with metadata
     """
-    agent = create_chat_agent()
+    if session is None:
+        response = create_chat_agent().start(message)
+        return ChatMessage(
+            content=response,
+            timestamp=datetime.now(),
+            type="assistant"
+        )
     
-    # Format the chat request with context if available
-    context = ""
-    if session and session.messages:
-        # Add relevant context from previous messages
-        recent_messages = session.messages[-3:]  # Last 3 messages for context
-        context = "\n".join([f"{m.type}: {m.content}" for m in recent_messages])
-        
-    prompt = f"""Previous context:
-    {context}
-    
-    User message: {message}
-    
-    Please provide a helpful and contextually appropriate response."""
+    client = client or OllamaClient()
+    prompt, notes = turn_prompt(session, message, memory)
     
-    # Get the response
-    response = agent.start(prompt)
-    
-    # Create a chat message
-    context_dict = None
-    if session and session.session_id:
-        context_dict = {"session_id": session.session_id}
+    result = client.generate(
+        CHAT_MODEL,
+        prompt,
+        system=CHAT_INSTRUCTIONS,
+        context=session.llm_context
+    )
+    session.llm_context = result.context
+    session.notes_in_context.extend(notes)
     
-    return ChatMessage(
-        content=response,
-        timestamp=datetime.now(),
+    now = datetime.now()
+    reply = ChatMessage(
+        content=result.text,
+        timestamp=now,
         type="assistant",
-        context=context_dict
+        context={
+            "session_id": session.session_id,
+            "prompt_eval_count": str(result.prompt_eval_count),
+            "time_to_first_token": f"{result.time_to_first_token:.3f}"
+        }
     )
+    session.messages.append(ChatMessage(content=message, timestamp=now, type="user"))
+    session.messages.append(reply)
+    session.last_activity = now
+    remember_exchange(session, message, result.text, "chat", memory)
+    return reply
 
 if __name__ == "__main__":
     # Example usage
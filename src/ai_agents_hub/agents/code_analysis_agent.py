@@ -2,8 +2,11 @@
 
 from praisonaiagents import Agent
 from ai_agents_hub.config import get_agent_config
+from ai_agents_hub.core.coalescing import run_agent
+from ai_agents_hub.core.namespaces import SHARED_NAMESPACE
+from ai_agents_hub.core.prompt_compactor import CompactedCode, compact_code, remap_line_references
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, Optional
 from pathlib import Path
 
 class CodeMetrics(BaseModel):
@@ -30,19 +33,9 @@ class CodeAnalysisReport(BaseModel):
     potential_risks: List[str]
     documentation_quality: int
 
-def create_code_analysis_agent():
-    """Create a code analysis agent for evaluating code quality.
-    
-    Returns:
-        Agent: A specialized agent for code analysis with comprehensive evaluation capabilities.
-    """
-    config = get_agent_config()
-    root_dir = Path(__file__).parent.parent.parent.parent
-    docs_path = root_dir / "docs" / "resources" / "code_analysis_docs.md"
-    
-    return Agent(
-        name="Code Analysis Expert",
-        instructions="""Analyze code quality, maintainability, and security with these specific focuses:
+ANALYSIS_MODEL = "deepseek-r1:1.5b"
+
+ANALYSIS_INSTRUCTIONS = """Analyze code quality, maintainability, and security with these specific focuses:
 
         1. Quality Metrics (0-100 scale):
            - Overall code quality
@@ -74,9 +67,49 @@ def create_code_analysis_agent():
            - Provide actionable feedback
            - Prioritize recommendations
 
-        Always provide specific examples and line references in your analysis.""",
+        Always provide specific examples and line references in your analysis."""
+
+def create_code_analysis_agent():
+    """Create a code analysis agent for evaluating code quality.
+    
+    Returns:
+        Agent: A specialized agent for code analysis with comprehensive evaluation capabilities.
+    """
+    config = get_agent_config()
+    root_dir = Path(__file__).parent.parent.parent.parent
+    docs_path = root_dir / "docs" / "resources" / "code_analysis_docs.md"
+    
+    return Agent(
+        name="Code Analysis Expert",
+        instructions=ANALYSIS_INSTRUCTIONS,
         knowledge=[str(docs_path)] if docs_path.exists() else [],
         knowledge_config=config,
-        user_id="code_analyst",
-        llm="deepseek-r1:1.5b"
+        user_id=SHARED_NAMESPACE,
+        llm=ANALYSIS_MODEL
     )
+
+ANALYSIS_PROMPT = """Please analyze this code and provide a detailed report:
+```
+{code}
+```"""
+
+def process_analysis(code_content: str, agent: Optional[Agent] = None,
+                     compacted: Optional[CompactedCode] = None) -> str:
+    """Analyze a piece of code and return the agent's report.
+    
+    The code is compacted before it goes into the prompt, and line numbers in
+    the report are mapped back to the submitted code.
+    
+    Args:
+        code_content: The code to analyze
+        agent: Code analysis agent to reuse; a new one is created if omitted
+        compacted: Result of compact_code(code_content), if the caller
+            already has it
+        
+    Returns:
+        str: The analysis report
+    """
+    agent = agent or create_code_analysis_agent()
+    compacted = compacted or compact_code(code_content)
+    report = run_agent(agent, ANALYSIS_PROMPT.format(code=compacted.text))
+    return remap_line_references(report, compacted)
@@ -2,9 +2,22 @@
 
 from praisonaiagents import Agent
 from ai_agents_hub.config import get_agent_config
+from ai_agents_hub.core.coalescing import run_agent
+from ai_agents_hub.core.namespaces import SHARED_NAMESPACE
+from ai_agents_hub.core.prompt_compactor import CompactedCode, compact_code, remap_line_references
+from ai_agents_hub.core.static_checks import ChunkSignals, CodeChunk, analyze_code
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 from pathlib import Path
+import re
+
+REVIEW_MODEL = "deepseek-r1"
+TRIAGE_MODEL = "deepseek-r1:1.5b"
+
+# Triage replies matching this are escalated to the full review model, unless
+# the match is negated earlier in the same clause ("no critical issues")
+HIGH_SEVERITY_REPLY = re.compile(r"(?i)(severity\W{0,3}high|high\W{0,3}severity|critical|vulnerab)")
+NEGATED_CLAUSE = re.compile(r"(?i)(\b(no|not|none|never|without|zero)\b|n't\b)[^.;:,!?\n]*$")
 
 class CodeIssue(BaseModel):
     """Model for individual code issues found during review."""
@@ -24,9 +37,29 @@ class CodeReviewReport(BaseModel):
     automated_fixes_applied: int
     manual_review_needed: List[str]
 
-def create_code_review_agent():
+class ChunkReview(BaseModel):
+    """Routing of one chunk in a cascade review."""
+    start_line: int
+    end_line: int
+    model: str
+    escalated: bool
+    reasons: List[str]
+
+class CascadeReview(BaseModel):
+    """Result of a cascade review with per-chunk routing details."""
+    review: str
+    chunks: List[ChunkReview]
+    static_issues: List[CodeIssue]
+    escalation_rate: float
+    original_tokens: int = 0
+    compact_tokens: int = 0
+
+def create_code_review_agent(llm: str = REVIEW_MODEL):
     """Create a code review agent for detailed code analysis.
     
+    Args:
+        llm: Model to review with; the cascade uses the small triage model
+    
     Returns:
         Agent: A specialized agent for code review with comprehensive evaluation capabilities.
     """
@@ -64,43 +97,175 @@ def create_code_review_agent():
         Always provide specific examples and line references.""",
         knowledge=[str(docs_path)] if docs_path.exists() else [],
         knowledge_config=config,
-        user_id="code_reviewer",
-        llm="deepseek-r1"
+        user_id=SHARED_NAMESPACE,
+        llm=llm
     )
 
-def process_review(code_content: str) -> CodeReviewReport:
+REVIEW_PROMPT = """Please review this code and provide a detailed analysis:
+```
+{code}
+```
+Focus on:
+1. Code quality and style
+2. Potential bugs and issues
+3. Security concerns
+4. Performance improvements
+5. Best practices
+
+Provide the response in a structured format that can be parsed into a CodeReviewReport."""
+
+def build_review_prompt(code_content: str) -> str:
+    """Build the review request for a piece of code."""
+    return REVIEW_PROMPT.format(code=code_content)
+
+def process_review(code_content: str, agent: Optional[Agent] = None, cascade: bool = False,
+                   compacted: Optional[CompactedCode] = None) -> CodeReviewReport:
     """Process a code review request and generate a structured report.
     
+    The code is compacted before it goes into the prompt (see
+    core.prompt_compactor), and line numbers in the reply are mapped back to
+    the submitted code.
+    
     Args:
         code_content: The code to review
+        agent: Code review agent to reuse; a new one is created if omitted
+        cascade: Triage with the small model and static checks first, and
+            escalate to the full model only where needed
+            (see process_review_cascade)
+        compacted: Result of compact_code(code_content), if the caller
+            already has it, e.g. to report the tokens saved
         
     Returns:
         CodeReviewReport: Structured review results with detailed analysis
     """
-    agent = create_code_review_agent()
-    
-    # Format the review request
-    prompt = f"""Please review this code and provide a detailed analysis:
-    ```
-    {code_content}
-    ```
-    Focus on:
-    1. Code quality and style
-    2. Potential bugs and issues
-    3. Security concerns
-    4. Performance improvements
-    5. Best practices
-    
-    Provide the response in a structured format that can be parsed into a CodeReviewReport.
-    """
+    if cascade:
+        return process_review_cascade(code_content, review_agent=agent).review
+    
+    agent = agent or create_code_review_agent()
+    compacted = compacted or compact_code(code_content)
     
     # Get the review results
-    review_result = agent.start(prompt)
+    review_result = run_agent(agent, build_review_prompt(compacted.text))
     
     # Parse and structure the results
     # Note: This is a placeholder. In a real implementation, you would need to
     # parse the agent's response into a proper CodeReviewReport structure
-    return review_result
+    return remap_line_references(str(review_result), compacted)
+
+def reports_high_severity(reply: str) -> bool:
+    """Tell whether a triage reply reports a high-severity issue, ignoring negated mentions."""
+    return any(
+        not NEGATED_CLAUSE.search(reply[max(0, match.start() - 60):match.start()])
+        for match in HIGH_SEVERITY_REPLY.finditer(reply)
+    )
+
+def escalation_reasons(signals: ChunkSignals, min_parse_confidence: float = 0.6) -> List[str]:
+    """List the static signals that send a chunk straight to the full model."""
+    reasons = []
+    if signals.max_severity == "high":
+        reasons.append("high-severity static finding")
+    if signals.parse_confidence < min_parse_confidence:
+        reasons.append(f"low parse confidence ({signals.parse_confidence:.2f})")
+    if signals.security_sensitive:
+        reasons.append("security-sensitive code")
+    return reasons
+
+def compact_chunks(chunks: List[CodeChunk]) -> CompactedCode:
+    """Compact chunks into one review input, keeping a map to their original line numbers.
+    
+    The text carries no line numbers of its own: the model cites lines of the
+    prompt, which remap_line_references then maps back once.
+    """
+    lines, numbers = [], []
+    for chunk in chunks:
+        for offset, line in enumerate(chunk.text.splitlines()):
+            lines.append(line)
+            numbers.append(chunk.start_line + offset)
+        lines.append("")
+        numbers.append(chunk.end_line)
+    return compact_code("\n".join(lines), line_numbers=numbers)
+
+def process_review_cascade(code_content: str, triage_agent: Optional[Agent] = None,
+                           review_agent: Optional[Agent] = None, max_chunk_lines: int = 80,
+                           min_parse_confidence: float = 0.6) -> CascadeReview:
+    """Review code with a small model first and escalate risky chunks.
+    
+    The code is split at top-level definitions and every chunk goes through
+    local static checks. Chunks with high-severity findings, low parse
+    confidence or security-sensitive constructs go to the full review model.
+    The others are reviewed together by the triage model, and are escalated as
+    well if its review reports high-severity problems. Each model is called at
+    most once.
+    
+    Args:
+        code_content: The code to review
+        triage_agent: Agent running the small model; created on first use
+        review_agent: Agent running the full model; created on first escalation
+        max_chunk_lines: Maximum lines per chunk
+        min_parse_confidence: Parse confidence below which a chunk escalates
+        
+    Returns:
+        CascadeReview: Combined review text and per-chunk routing details
+    """
+    static_issues = []
+    routing = []
+    for signals in analyze_code(code_content, max_chunk_lines):
+        static_issues.extend(
+            CodeIssue(
+                type=finding.type,
+                severity=finding.severity,
+                file="input",
+                line_number=finding.line_number,
+                description=finding.description,
+                suggested_fix=None
+            )
+            for finding in signals.findings
+        )
+        routing.append((signals.chunk, escalation_reasons(signals, min_parse_confidence)))
+    
+    sections = []
+    prompts: List[CompactedCode] = []
+    
+    def review_with(agent: Agent, chunks: List[CodeChunk]) -> str:
+        compacted = compact_chunks(chunks)
+        prompts.append(compacted)
+        return remap_line_references(run_agent(agent, build_review_prompt(compacted.text)), compacted)
+    
+    triage_chunks = [chunk for chunk, reasons in routing if not reasons]
+    if triage_chunks:
+        triage_review = review_with(triage_agent or create_code_review_agent(llm=TRIAGE_MODEL), triage_chunks)
+        if reports_high_severity(triage_review):
+            routing = [(chunk, reasons or ["triage model reported high severity"]) for chunk, reasons in routing]
+        else:
+            sections.append(f"### Reviewed by {TRIAGE_MODEL}\n\n{triage_review}")
+    
+    escalated_chunks = [chunk for chunk, reasons in routing if reasons]
+    if escalated_chunks:
+        review = review_with(review_agent or create_code_review_agent(), escalated_chunks)
+        sections.insert(0, f"### Reviewed by {REVIEW_MODEL}\n\n{review}")
+    
+    if static_issues:
+        sections.append("### Static checks\n\n" + "\n".join(
+            f"- Line {issue.line_number}: [{issue.severity}] {issue.description}" for issue in static_issues
+        ))
+    chunks = [
+        ChunkReview(
+            start_line=chunk.start_line,
+            end_line=chunk.end_line,
+            model=REVIEW_MODEL if reasons else TRIAGE_MODEL,
+            escalated=bool(reasons),
+            reasons=reasons
+        )
+        for chunk, reasons in routing
+    ]
+    return CascadeReview(
+        review="\n\n".join(sections),
+        chunks=chunks,
+        static_issues=static_issues,
+        escalation_rate=len(escalated_chunks) / len(chunks) if chunks else 0.0,
+        original_tokens=sum(p.original_tokens for p in prompts),
+        compact_tokens=sum(p.compact_tokens for p in prompts)
+    )
 
 if __name__ == "__main__":
     # Example usage
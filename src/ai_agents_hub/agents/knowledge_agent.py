@@ -2,7 +2,15 @@
 
 from praisonaiagents import Agent
 from ai_agents_hub.config import get_agent_config
+from ai_agents_hub.agents.chat_agent import ChatMessage, ChatSession, remember_exchange, turn_prompt
+from ai_agents_hub.core.namespaces import SHARED_NAMESPACE, NamespaceManager
+from ai_agents_hub.core.ollama import OllamaClient
 from pathlib import Path
+from datetime import datetime
+from typing import Optional
+
+KNOWLEDGE_MODEL = "deepseek-r1:1.5b"
+KNOWLEDGE_INSTRUCTIONS = "You answer questions based on the provided knowledge."
 
 def create_knowledge_agent():
     """Create a knowledge agent specifically for handling PDF and knowledge-based queries"""
@@ -11,9 +19,73 @@ def create_knowledge_agent():
     docs_path = root_dir / "docs" / "resources" / "Efficient Document Retrieval with Vision Language Models.pdf"
     return Agent(
         name="Knowledge Agent",
-        instructions="You answer questions based on the provided knowledge.",
+        instructions=KNOWLEDGE_INSTRUCTIONS,
         knowledge=[str(docs_path)],
         knowledge_config=config,
-        user_id="user1",
-        llm="deepseek-r1:1.5b"
+        user_id=SHARED_NAMESPACE,
+        llm=KNOWLEDGE_MODEL
+    )
+
+def retrieve_knowledge(agent: Agent, question: str) -> str:
+    """Search the agent's knowledge base the same way Agent.chat does."""
+    # Knowledge sources are ingested lazily on the agent's first chat
+    if getattr(agent, "_knowledge_sources", None) and not getattr(agent, "_knowledge_processed", True):
+        agent._ensure_knowledge_processed()
+    if not agent.knowledge:
+        return ""
+    search_results = agent.knowledge.search(question, agent_id=agent.agent_id)
+    if isinstance(search_results, dict) and "results" in search_results:
+        return "\n".join(result["memory"] for result in search_results["results"])
+    return "\n".join(search_results or [])
+
+def process_knowledge_query(question: str, session: ChatSession, agent: Optional[Agent] = None,
+                            client: Optional[OllamaClient] = None,
+                            memory: Optional[NamespaceManager] = None) -> ChatMessage:
+    """Answer a question from the knowledge base, continuing the session's context.
+
+    Retrieved passages follow the question in the new turn, so the instructions
+    and earlier turns stay a stable prefix that Ollama does not prefill again.
+    Like process_chat, the context is restarted once it outgrows its budget.
+
+    Args:
+        question: The user's question
+        session: Chat session carrying the Ollama context between turns
+        agent: Knowledge agent whose knowledge base is searched
+        client: Ollama client to use; one is created from the config if omitted
+        memory: Namespace manager to use instead of the process-wide one
+
+    Returns:
+        ChatMessage: The answer with metadata
+    """
+    agent = agent or create_knowledge_agent()
+    client = client or OllamaClient()
+    knowledge_content = retrieve_knowledge(agent, question)
+    prompt, notes = turn_prompt(session, question, memory)
+    if knowledge_content:
+        prompt = f"{prompt}\n\nKnowledge: {knowledge_content}"
+
+    result = client.generate(
+        KNOWLEDGE_MODEL,
+        prompt,
+        system=KNOWLEDGE_INSTRUCTIONS,
+        context=session.llm_context
+    )
+    session.llm_context = result.context
+    session.notes_in_context.extend(notes)
+
+    now = datetime.now()
+    reply = ChatMessage(
+        content=result.text,
+        timestamp=now,
+        type="assistant",
+        context={
+            "session_id": session.session_id,
+            "prompt_eval_count": str(result.prompt_eval_count),
+            "time_to_first_token": f"{result.time_to_first_token:.3f}"
+        }
     )
+    session.messages.append(ChatMessage(content=question, timestamp=now, type="user"))
+    session.messages.append(reply)
+    session.last_activity = now
+    remember_exchange(session, question, result.text, "knowledge", memory)
+    return reply
@@ -1,7 +1,20 @@
 """Configuration management for AI Agents Hub."""
 
+import os
+
+DEFAULT_OLLAMA_BASE_URL = "http://localhost:11434"
+
+def get_ollama_base_url():
+    """Get the Ollama base URL, overridable through the OLLAMA_BASE_URL variable."""
+    return os.environ.get("OLLAMA_BASE_URL", DEFAULT_OLLAMA_BASE_URL).rstrip("/")
+
+def get_ollama_keep_alive():
+    """Get how long Ollama keeps a model and its context loaded between requests."""
+    return os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+
 def get_agent_config():
     """Get the base configuration for AI agents."""
+    ollama_base_url = get_ollama_base_url()
     return {
         "vector_store": {
             "provider": "chroma",
@@ -16,14 +29,14 @@ def get_agent_config():
                 "model": "deepseek-r1:latest",
                 "temperature": 0,
                 "max_tokens": 8000,
-                "ollama_base_url": "http://localhost:11434",
+                "ollama_base_url": ollama_base_url,
             },
         },
         "embedder": {
             "provider": "ollama",
             "config": {
                 "model": "nomic-embed-text:latest",
-                "ollama_base_url": "http://localhost:11434",
+                "ollama_base_url": ollama_base_url,
                 "embedding_dims": 1536
             },
         },
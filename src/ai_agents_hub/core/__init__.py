@@ -0,0 +1 @@
+"""Shared infrastructure used by the agents and the UI."""
@@ -0,0 +1,367 @@
+"""Share one LLM call between identical requests that are in flight at the same time."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+DEFAULT_FLIGHT_DB_PATH = Path(".praison") / "inflight.sqlite3"
+
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS flights (
+    id TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    status TEXT NOT NULL,
+    text TEXT NOT NULL DEFAULT '',
+    result TEXT,
+    error TEXT,
+    followers INTEGER NOT NULL DEFAULT 0,
+    started_at REAL NOT NULL,
+    heartbeat_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_flights_key ON flights (key, status);
+"""
+
+class CoalescingStats(BaseModel):
+    """Counts of requests and of the LLM calls they needed."""
+    requests: int = 0
+    calls: int = 0
+    coalesced: int = 0  # joined a call running in this process
+    coalesced_shared: int = 0  # joined a call running in another worker
+    failures: int = 0
+
+    @property
+    def saved_calls(self) -> int:
+        return self.coalesced + self.coalesced_shared
+
+def normalize_prompt(prompt: str) -> str:
+    """Drop trailing whitespace and surrounding blank lines, which do not change the answer."""
+    return "\n".join(line.rstrip() for line in prompt.strip().splitlines())
+
+def request_key(kind: str, **fields: Any) -> str:
+    """Hash everything that determines an LLM call's output into a coalescing key."""
+    fields = {name: normalize_prompt(value) if name == "prompt" and isinstance(value, str) else value
+              for name, value in fields.items()}
+    canonical = json.dumps({"kind": kind, **fields}, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class _Flight:
+    """A call in progress in this process, with the text it has streamed so far."""
+
+    def __init__(self):
+        self.changed = threading.Condition()
+        self.pieces: List[str] = []
+        self.finished = False
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+    def emit(self, piece: str):
+        with self.changed:
+            self.pieces.append(piece)
+            self.changed.notify_all()
+
+    def finish(self, result: Any = None, error: Optional[BaseException] = None):
+        with self.changed:
+            self.result, self.error, self.finished = result, error, True
+            self.changed.notify_all()
+
+    def follow(self, on_token: Optional[Callable[[str], None]]) -> Any:
+        """Replay the pieces streamed so far, then stream the rest until the call finishes."""
+        seen = 0
+        while True:
+            with self.changed:
+                while seen == len(self.pieces) and not self.finished:
+                    self.changed.wait()
+                new, finished = self.pieces[seen:], self.finished
+            seen += len(new)
+            if on_token:
+                for piece in new:
+                    on_token(piece)
+            if finished and seen == len(self.pieces):
+                if self.error is not None:
+                    raise self.error
+                return self.result
+
+class FlightStore:
+    """Calls in flight across worker processes, recorded in a shared SQLite file.
+
+    The worker running a call records the text it streams and, at the end,
+    its result or error; workers with the same request poll that record
+    instead of calling the model. A running call whose worker stops sending
+    heartbeats for ``stale_after`` seconds is treated as abandoned.
+
+    Args:
+        path: SQLite database file shared by the workers
+        stale_after: Seconds without a heartbeat after which a call is abandoned
+        retention: Seconds a finished call is kept for slow followers to read
+    """
+
+    def __init__(self, path: Path = DEFAULT_FLIGHT_DB_PATH, stale_after: float = 30.0, retention: float = 60.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.stale_after = stale_after
+        self.retention = retention
+        self._local = threading.local()
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection; sqlite3 connections are not shared across threads."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def join(self, key: str, owner: str) -> Tuple[str, bool]:
+        """Join the running call for a key, or register a new one.
+
+        Returns:
+            Tuple of the call id and whether the caller owns the call and must run it
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM flights WHERE status != ? AND finished_at < ?", (RUNNING, now - self.retention))
+            row = conn.execute(
+                "SELECT id FROM flights WHERE key = ? AND status = ? AND heartbeat_at >= ? "
+                "ORDER BY started_at DESC LIMIT 1",
+                (key, RUNNING, now - self.stale_after),
+            ).fetchone()
+            if row:
+                conn.execute("UPDATE flights SET followers = followers + 1 WHERE id = ?", (row["id"],))
+                conn.execute("COMMIT")
+                return row["id"], False
+            flight_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO flights (id, key, owner, status, started_at, heartbeat_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (flight_id, key, owner, RUNNING, now, now),
+            )
+            conn.execute("COMMIT")
+            return flight_id, True
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def heartbeat(self, flight_id: str, text: Optional[str] = None):
+        """Mark a call as alive, optionally publishing the text streamed so far."""
+        if text is None:
+            self._connect().execute("UPDATE flights SET heartbeat_at = ? WHERE id = ?", (time.time(), flight_id))
+        else:
+            self._connect().execute("UPDATE flights SET heartbeat_at = ?, text = ? WHERE id = ?",
+                                    (time.time(), text, flight_id))
+
+    def finish(self, flight_id: str, text: str, result: Optional[str] = None, error: Optional[str] = None):
+        now = time.time()
+        self._connect().execute(
+            "UPDATE flights SET status = ?, text = ?, result = ?, error = ?, heartbeat_at = ?, finished_at = ? "
+            "WHERE id = ?",
+            (FAILED if error is not None else SUCCEEDED, text, result, error, now, now, flight_id),
+        )
+
+    def get(self, flight_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute("SELECT * FROM flights WHERE id = ?", (flight_id,)).fetchone()
+        return dict(row) if row else None
+
+    def is_stale(self, flight: Dict[str, Any]) -> bool:
+        return flight["status"] == RUNNING and flight["heartbeat_at"] < time.time() - self.stale_after
+
+class SingleFlight:
+    """Run identical concurrent requests once and fan the outcome out to every caller.
+
+    The first caller for a key runs the call; callers arriving while it runs
+    wait for it and receive the same result or exception, and the streamed
+    pieces of text, replayed from the start. Each caller's ``on_token`` runs
+    in the caller's own thread; the first caller runs the call in its thread. Nothing is cached: a request arriving after the call
+    finished starts a new one.
+
+    With a FlightStore, callers in other worker processes join the call too.
+    They receive the streamed text in chunks as it is published, and the
+    result through ``encode`` and ``decode``.
+
+    Args:
+        store: Store shared with other workers; coalescing stays in-process without one
+        poll_interval: Seconds between checks of a call running in another worker
+        publish_interval: Seconds between publications of streamed text to the store
+    """
+
+    def __init__(self, store: Optional[FlightStore] = None, poll_interval: float = 0.05,
+                 publish_interval: float = 0.1):
+        self.store = store
+        self.poll_interval = poll_interval
+        self.publish_interval = publish_interval
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self._stats = CoalescingStats()
+
+    def stats(self) -> CoalescingStats:
+        with self._lock:
+            return self._stats.model_copy()
+
+    def _count(self, field: str):
+        with self._lock:
+            setattr(self._stats, field, getattr(self._stats, field) + 1)
+
+    def run(self, key: str, call: Callable[[Callable[[str], None]], Any],
+            on_token: Optional[Callable[[str], None]] = None,
+            encode: Callable[[Any], str] = json.dumps, decode: Callable[[str], Any] = json.loads) -> Any:
+        """Run ``call`` for a key, or wait for the identical call already running.
+
+        Args:
+            key: Coalescing key, see request_key()
+            call: Function doing the work; it receives an ``emit(piece)``
+                callback to stream text to every caller
+            on_token: Callback receiving each streamed piece for this caller
+            encode: Serializes the result for callers in other workers
+            decode: Inverse of ``encode``
+
+        Returns:
+            The result of the call, shared by every caller
+        """
+        with self._lock:
+            self._stats.requests += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self._stats.coalesced += 1
+        if not leader:
+            return flight.follow(on_token)
+
+        def emit(piece: str):
+            flight.emit(piece)
+            if on_token:
+                on_token(piece)
+
+        try:
+            if self.store is None:
+                self._count("calls")
+                result = call(emit)
+            else:
+                result = self._lead_shared(key, emit, call, encode, decode)
+        except BaseException as e:
+            self._count("failures")
+            self._land(key, flight, error=e)
+            raise
+        self._land(key, flight, result=result)
+        return result
+
+    def _land(self, key: str, flight: _Flight, result: Any = None, error: Optional[BaseException] = None):
+        # Unregister before waking the followers, so later requests start a new call
+        with self._lock:
+            self._flights.pop(key, None)
+        flight.finish(result, error)
+
+    def _lead_shared(self, key: str, emit: Callable[[str], None], call: Callable, encode: Callable,
+                     decode: Callable) -> Any:
+        while True:
+            flight_id, owner = self.store.join(key, self.owner)
+            if owner:
+                self._count("calls")
+                return self._run_owned(flight_id, emit, call, encode)
+            self._count("coalesced_shared")
+            outcome = self._follow_shared(flight_id, emit)
+            if outcome is not None:
+                status, payload = outcome
+                if status == FAILED:
+                    raise RuntimeError(payload)
+                return decode(payload)
+            # The other worker abandoned the call; try to take it over
+
+    def _run_owned(self, flight_id: str, relay: Callable[[str], None], call: Callable, encode: Callable) -> Any:
+        text: List[str] = []
+        published = time.monotonic()
+        stop = threading.Event()
+
+        def emit(piece: str):
+            nonlocal published
+            text.append(piece)
+            relay(piece)
+            if time.monotonic() - published >= self.publish_interval:
+                published = time.monotonic()
+                self.store.heartbeat(flight_id, "".join(text))
+
+        def keep_alive():
+            # Prefill of a long prompt can take a while before the first piece arrives
+            while not stop.wait(self.store.stale_after / 3):
+                self.store.heartbeat(flight_id)
+
+        beat = threading.Thread(target=keep_alive, daemon=True)
+        beat.start()
+        try:
+            result = call(emit)
+        except BaseException as e:
+            self.store.finish(flight_id, "".join(text), error=f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            stop.set()
+        self.store.finish(flight_id, "".join(text), result=encode(result))
+        return result
+
+    def _follow_shared(self, flight_id: str, relay: Callable[[str], None]) -> Optional[Tuple[str, str]]:
+        """Relay a call running in another worker; None if that worker abandoned it."""
+        sent = 0
+        while True:
+            record = self.store.get(flight_id)
+            if record is None or self.store.is_stale(record):
+                return None
+            if len(record["text"]) > sent:
+                relay(record["text"][sent:])
+                sent = len(record["text"])
+            if record["status"] != RUNNING:
+                return record["status"], record["error"] if record["status"] == FAILED else record["result"]
+            time.sleep(self.poll_interval)
+
+@lru_cache(maxsize=1)
+def get_coalescer() -> Optional[SingleFlight]:
+    """Get the process-wide coalescer.
+
+    AI_AGENTS_HUB_COALESCE selects the scope: "process" (the default) shares
+    calls between the threads of this process, "shared" also between worker
+    processes through AI_AGENTS_HUB_COALESCE_STORE (default
+    .praison/inflight.sqlite3), and "off" disables coalescing.
+    """
+    scope = os.environ.get("AI_AGENTS_HUB_COALESCE", "process").lower()
+    if scope == "off":
+        return None
+    if scope == "shared":
+        return SingleFlight(FlightStore(Path(os.environ.get("AI_AGENTS_HUB_COALESCE_STORE", DEFAULT_FLIGHT_DB_PATH))))
+    return SingleFlight()
+
+def run_agent(agent, prompt: str, coalescer: Optional[SingleFlight] = None) -> str:
+    """Start a praisonaiagents agent on a prompt, sharing the call with identical requests in flight.
+
+    Requests are identical when the agent's name, model, instructions and
+    chat history, which the agent resends with the prompt, and the normalized
+    prompt match. Agents that followed another one's call get the exchange
+    appended to their own history, as if they had made the call.
+    """
+    coalescer = coalescer or get_coalescer()
+    if coalescer is None:
+        return str(agent.start(prompt))
+    history = getattr(agent, "chat_history", None)
+    history_length = len(history) if history is not None else 0
+    key = request_key("agent", name=getattr(agent, "name", type(agent).__name__), llm=str(getattr(agent, "llm", "")),
+                      instructions=getattr(agent, "instructions", ""), history=history or [], prompt=prompt)
+    reply = coalescer.run(key, lambda emit: str(agent.start(prompt)))
+    if history is not None and agent.chat_history is history and len(history) == history_length:
+        history.extend([{"role": "user", "content": prompt}, {"role": "assistant", "content": reply}])
+    return reply
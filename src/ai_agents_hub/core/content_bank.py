@@ -0,0 +1,222 @@
+"""Persistent bank of generated learning material, reused across students."""
+
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple, Type
+
+from pydantic import BaseModel
+
+from ai_agents_hub.core.embeddings import TOKEN_PATTERN, HashingEmbedder, cosine_similarity, normalize_text
+
+DEFAULT_CONTENT_BANK_PATH = Path(".praison") / "content_bank.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic TEXT NOT NULL,
+    topic_key TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    content TEXT NOT NULL,
+    embedding TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_served_at REAL,
+    serve_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_entries_key ON entries (difficulty, content_type, topic_key);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# Words that do not change a topic; unlike the embedder's stopwords, "i" stays as in "World War I"
+TOPIC_FILLER = frozenset("a an and for in of on the to with".split())
+
+def topic_words(topic: str) -> frozenset:
+    """Content words of a topic, numerals included, with plural "s" dropped."""
+    words = (word for word in TOKEN_PATTERN.findall(topic.lower()) if word not in TOPIC_FILLER)
+    return frozenset(word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+                     for word in words)
+
+class ContentBank:
+    """SQLite-backed store of learning content indexed by (topic, difficulty, content_type).
+
+    Topics are matched exactly after normalization first and then by embedding
+    similarity, so "Python programming" can serve material banked for
+    "programming in Python". A fuzzy match must also have the same content
+    words, so "World War I" never gets "World War II" material. Among matching entries the least-served one is
+    returned, which spreads variety across students. Generation runs in a
+    background thread only when coverage for a key is thin or its entries
+    have been served too often.
+
+    Args:
+        model: Pydantic model the content is stored as; it must expose
+            ``topic``, ``difficulty`` and ``content_type`` attributes
+        path: SQLite database file
+        embedder: Object with an ``embed(text)`` method used for topic matching
+        similarity_threshold: Minimum topic similarity for a fuzzy match
+        min_variants: Entries a key should have before generation stops
+        max_serves_per_entry: Serve count after which a key wants fresh variants
+    """
+
+    def __init__(self, model: Type[BaseModel], path: Path = DEFAULT_CONTENT_BANK_PATH, embedder=None,
+                 similarity_threshold: float = 0.8, min_variants: int = 3,
+                 max_serves_per_entry: int = 50, max_workers: int = 1):
+        self.model = model
+        self.path = Path(path)
+        self.embedder = embedder or HashingEmbedder()
+        self.similarity_threshold = similarity_threshold
+        self.min_variants = min_variants
+        self.max_serves_per_entry = max_serves_per_entry
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="content-bank")
+        self._pending: Set[Tuple[str, str, str]] = set()
+
+    def _bump(self, name: str, amount: int = 1):
+        self._conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+
+    def add(self, content: BaseModel) -> int:
+        """Store a piece of content and return its entry id."""
+        topic = content.topic
+        embedding = self.embedder.embed(topic)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO entries (topic, topic_key, difficulty, content_type, content, embedding, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (topic, normalize_text(topic), content.difficulty, content.content_type,
+                 content.model_dump_json(), json.dumps(embedding), time.time()),
+            )
+            self._bump("generated")
+            return cursor.lastrowid
+
+    def _matching_rows(self, topic: str, difficulty: str, content_type: str):
+        """Return entries for the key, preferring exact topic matches over similar ones."""
+        rows = self._conn.execute(
+            "SELECT * FROM entries WHERE difficulty = ? AND content_type = ? AND topic_key = ?",
+            (difficulty, content_type, normalize_text(topic)),
+        ).fetchall()
+        if rows:
+            return rows
+        query, words = self.embedder.embed(topic), topic_words(topic)
+        candidates = self._conn.execute(
+            "SELECT * FROM entries WHERE difficulty = ? AND content_type = ?",
+            (difficulty, content_type),
+        ).fetchall()
+        return [
+            row for row in candidates
+            if topic_words(row["topic"]) == words
+            and cosine_similarity(query, json.loads(row["embedding"])) >= self.similarity_threshold
+        ]
+
+    def lookup(self, topic: str, difficulty: str, content_type: str) -> Optional[BaseModel]:
+        """Serve banked content for a key, or None on a miss.
+
+        The least-served matching entry is returned and its serve count updated.
+        """
+        with self._lock, self._conn:
+            rows = self._matching_rows(topic, difficulty, content_type)
+            if not rows:
+                self._bump("misses")
+                return None
+            row = min(rows, key=lambda r: (r["serve_count"], r["id"]))
+            self._conn.execute(
+                "UPDATE entries SET serve_count = serve_count + 1, last_served_at = ? WHERE id = ?",
+                (time.time(), row["id"]),
+            )
+            self._bump("hits")
+        return self.model.model_validate_json(row["content"])
+
+    def coverage(self, topic: str, difficulty: str, content_type: str) -> int:
+        """Number of banked variants that would match a key."""
+        with self._lock:
+            return len(self._matching_rows(topic, difficulty, content_type))
+
+    def needs_generation(self, topic: str, difficulty: str, content_type: str) -> bool:
+        """Whether a key has too few variants or its variants are overused."""
+        with self._lock:
+            rows = self._matching_rows(topic, difficulty, content_type)
+        if len(rows) < self.min_variants:
+            return True
+        return min(row["serve_count"] for row in rows) >= self.max_serves_per_entry
+
+    def generate_in_background(self, topic: str, difficulty: str, content_type: str,
+                               generator: Callable[[], BaseModel]) -> Optional[Future]:
+        """Run ``generator`` in a worker thread and bank its result.
+
+        Returns None without scheduling anything when generation for the same
+        key is already pending.
+        """
+        key = (normalize_text(topic), difficulty, content_type)
+        with self._lock:
+            if key in self._pending:
+                return None
+            self._pending.add(key)
+
+        def run():
+            try:
+                content = generator()
+                if content is not None:
+                    self.add(content)
+                return content
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+
+        return self._executor.submit(run)
+
+    def evict_stale(self, max_age_days: float = 30.0, min_serves: int = 0) -> int:
+        """Delete entries not served within ``max_age_days``.
+
+        Entries that were never served count from their creation time. Entries
+        served at least ``min_serves`` times are kept when ``min_serves`` is set.
+
+        Returns:
+            Number of evicted entries
+        """
+        cutoff = time.time() - max_age_days * 86400
+        query = "DELETE FROM entries WHERE COALESCE(last_served_at, created_at) < ?"
+        params = [cutoff]
+        if min_serves:
+            query += " AND serve_count < ?"
+            params.append(min_serves)
+        with self._lock, self._conn:
+            evicted = self._conn.execute(query, params).rowcount
+            self._bump("evicted", evicted)
+        return evicted
+
+    def stats(self) -> Dict[str, float]:
+        """Report bank size, hit/miss counts and the reuse rate of served content."""
+        with self._lock:
+            counters = {row["name"]: row["value"] for row in self._conn.execute("SELECT * FROM counters")}
+            entries, serves = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(serve_count), 0) FROM entries"
+            ).fetchone()
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        return {
+            "entries": entries,
+            "serves": serves,
+            "hits": hits,
+            "misses": misses,
+            "generated": counters.get("generated", 0),
+            "evicted": counters.get("evicted", 0),
+            "reuse_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "pending_generations": len(self._pending),
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self._conn.close()
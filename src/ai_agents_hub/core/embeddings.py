@@ -0,0 +1,83 @@
+"""Text embedding helpers for local similarity lookups."""
+
+import hashlib
+import json
+import math
+import re
+import urllib.request
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+from ai_agents_hub.config import get_agent_config
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9_]+")
+
+STOPWORDS = frozenset("""
+a about an and are as at be can could do does for from give how i in is it its me my of on or
+please say says that the this to was what whats when where which who why will with would you your
+""".split())
+
+def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    """Cosine similarity of two vectors, 0.0 when either is all zeros."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = math.sqrt(sum(x * x for x in a))
+    norm_b = math.sqrt(sum(y * y for y in b))
+    if not norm_a or not norm_b:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace so equivalent inputs compare equal."""
+    return " ".join(text.lower().split())
+
+class HashingEmbedder:
+    """Embed text locally by hashing words and character trigrams.
+
+    This needs no model or network round trip, so a lookup costs microseconds.
+    It captures lexical rather than semantic similarity, which is enough for
+    routing and topic matching over short inputs.
+    """
+
+    def __init__(self, dims: int = 256, stopwords=STOPWORDS):
+        self.dims = dims
+        self.stopwords = stopwords
+
+    def _index(self, feature: str) -> int:
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=4).digest()
+        return int.from_bytes(digest, "little") % self.dims
+
+    def embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dims
+        for word in TOKEN_PATTERN.findall(text.lower()):
+            if word in self.stopwords:
+                continue
+            vector[self._index(word)] += 1.0
+            padded = f"#{word}#"
+            for i in range(len(padded) - 2):
+                vector[self._index(padded[i:i + 3])] += 0.25
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+class OllamaEmbedder:
+    """Embed text with the Ollama embedding model from the agent config.
+
+    Results are memoized per text, so repeated topics and exemplars only cost
+    one request each.
+    """
+
+    def __init__(self, model: Optional[str] = None, base_url: Optional[str] = None,
+                 timeout: float = 30.0, cache_size: int = 4096):
+        embedder_config = get_agent_config()["embedder"]["config"]
+        self.model = model or embedder_config["model"]
+        self.base_url = (base_url or embedder_config["ollama_base_url"]).rstrip("/")
+        self.timeout = timeout
+        self.embed = lru_cache(maxsize=cache_size)(self._embed)
+
+    def _embed(self, text: str) -> List[float]:
+        request = urllib.request.Request(
+            f"{self.base_url}/api/embeddings",
+            data=json.dumps({"model": self.model, "prompt": text}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())["embedding"]
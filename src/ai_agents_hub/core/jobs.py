@@ -0,0 +1,309 @@
+"""Persistent background job queue backed by SQLite."""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+DEFAULT_JOB_DB_PATH = Path(".praison") / "jobs.sqlite3"
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    dedupe_key TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs (status, priority DESC, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_dedupe ON jobs (dedupe_key, status);
+"""
+
+logger = logging.getLogger(__name__)
+
+class Job(BaseModel):
+    """Snapshot of a job's state."""
+    id: str
+    kind: str
+    payload: Dict[str, Any]
+    priority: int
+    status: str
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    attempts: int
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+def dedupe_key(kind: str, payload: Dict[str, Any]) -> str:
+    """Hash a job's kind and canonical payload."""
+    canonical = json.dumps({"kind": kind, "payload": payload}, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class JobQueue:
+    """Priority job queue persisted in SQLite and executed by a worker pool.
+
+    Jobs survive Streamlit reruns and restarts, and several processes can share
+    one database: claiming a job is a single transaction, so each job runs once.
+    Submitting the same kind and payload as a queued, running or recently
+    succeeded job returns the existing job id instead of queueing a duplicate.
+
+    A running job holds a lease that its worker renews while the handler runs.
+    Idle workers requeue jobs whose lease expired, i.e. whose worker died.
+
+    Args:
+        path: SQLite database file
+        handlers: Mapping of job kind to a function taking the payload and
+            returning a JSON-serializable result
+        dedupe_ttl: Seconds a succeeded job keeps answering identical submissions
+        dedupe_ttls: Per-kind overrides of ``dedupe_ttl``; 0 only merges
+            submissions with a queued or running job
+        lease: Seconds without a heartbeat after which a running job is requeued
+        poll_interval: Seconds an idle worker waits before checking again
+    """
+
+    def __init__(self, path: Path = DEFAULT_JOB_DB_PATH,
+                 handlers: Optional[Dict[str, Callable[[Dict[str, Any]], Any]]] = None,
+                 dedupe_ttl: float = 3600.0, dedupe_ttls: Optional[Dict[str, float]] = None,
+                 lease: float = 60.0, poll_interval: float = 0.5):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.handlers = dict(handlers or {})
+        self.dedupe_ttl = dedupe_ttl
+        self.dedupe_ttls = dict(dedupe_ttls or {})
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        self._wakeup = threading.Condition()
+        self._stop = threading.Event()
+        self._workers: List[threading.Thread] = []
+        self._last_requeue = 0.0
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "heartbeat_at" not in columns:
+                # Databases created before leases existed
+                conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection; sqlite3 connections are not shared across threads."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def register(self, kind: str, handler: Callable[[Dict[str, Any]], Any]):
+        self.handlers[kind] = handler
+
+    def submit(self, kind: str, payload: Dict[str, Any], priority: int = 0) -> str:
+        """Queue a job, or return the id of an identical job already known.
+
+        Args:
+            kind: Registered job kind
+            payload: JSON-serializable arguments for the handler
+            priority: Higher priorities run first
+
+        Returns:
+            str: Job id to poll with get()
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        key = dedupe_key(kind, payload)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            existing = conn.execute(
+                "SELECT id FROM jobs WHERE dedupe_key = ? AND "
+                "(status IN (?, ?) OR (status = ? AND finished_at >= ?)) "
+                "ORDER BY created_at DESC LIMIT 1",
+                (key, QUEUED, RUNNING, SUCCEEDED, time.time() - self.dedupe_ttls.get(kind, self.dedupe_ttl)),
+            ).fetchone()
+            if existing:
+                conn.execute("COMMIT")
+                return existing["id"]
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, kind, payload, dedupe_key, priority, status, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(payload, default=str), key, priority, QUEUED, time.time()),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def _to_job(self, row: sqlite3.Row) -> Job:
+        return Job(
+            id=row["id"],
+            kind=row["kind"],
+            payload=json.loads(row["payload"]),
+            priority=row["priority"],
+            status=row["status"],
+            result=json.loads(row["result"]) if row["result"] is not None else None,
+            error=row["error"],
+            attempts=row["attempts"],
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+        )
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by id, or None if it does not exist."""
+        row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def recent(self, status: Optional[str] = None, limit: int = 50) -> List[Job]:
+        """Return the most recent jobs, optionally filtered by status."""
+        query = "SELECT * FROM jobs"
+        params: List[Any] = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        return [self._to_job(row) for row in self._connect().execute(query, params)]
+
+    def claim(self) -> Optional[Job]:
+        """Atomically move the highest-priority queued job to running."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY priority DESC, created_at LIMIT 1",
+                (QUEUED,),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, heartbeat_at = ?, attempts = attempts + 1 WHERE id = ?",
+                (RUNNING, now, now, row["id"]),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(row["id"])
+
+    def _finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None):
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+            (status, json.dumps(result, default=str) if result is not None else None, error, time.time(), job_id),
+        )
+
+    def heartbeat(self, job_id: str):
+        """Renew the lease of a running job."""
+        self._connect().execute(
+            "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ?", (time.time(), job_id, RUNNING)
+        )
+
+    def run_job(self, job: Job):
+        """Execute a claimed job with its handler and store the outcome.
+
+        The job's lease is renewed in the background while the handler runs.
+        """
+        stop = threading.Event()
+
+        def keep_alive():
+            while not stop.wait(self.lease / 3):
+                self.heartbeat(job.id)
+
+        beat = threading.Thread(target=keep_alive, name=f"job-heartbeat-{job.id[:8]}", daemon=True)
+        beat.start()
+        try:
+            result = self.handlers[job.kind](job.payload)
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            self._finish(job.id, FAILED, error=f"{type(e).__name__}: {e}")
+        else:
+            self._finish(job.id, SUCCEEDED, result=result)
+        finally:
+            stop.set()
+
+    def requeue_stale(self, older_than: Optional[float] = None) -> int:
+        """Requeue jobs left running by a worker that died.
+
+        Args:
+            older_than: Seconds since the last heartbeat; the lease by default
+
+        Returns:
+            Number of requeued jobs
+        """
+        older_than = self.lease if older_than is None else older_than
+        self._last_requeue = time.time()
+        cursor = self._connect().execute(
+            "UPDATE jobs SET status = ?, started_at = NULL, heartbeat_at = NULL "
+            "WHERE status = ? AND COALESCE(heartbeat_at, started_at) < ?",
+            (QUEUED, RUNNING, time.time() - older_than),
+        )
+        if cursor.rowcount:
+            logger.warning("Requeued %d job(s) whose worker stopped renewing the lease", cursor.rowcount)
+        return cursor.rowcount
+
+    def _worker_loop(self, max_backoff: float = 30.0):
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                if time.time() - self._last_requeue >= self.lease:
+                    self.requeue_stale()
+                job = self.claim()
+                if job is None:
+                    with self._wakeup:
+                        self._wakeup.wait(self.poll_interval)
+                else:
+                    self.run_job(job)
+                failures = 0
+            except Exception:
+                # e.g. "database is locked"; a job left running is requeued once its lease expires
+                failures += 1
+                backoff = min(max_backoff, self.poll_interval * 2 ** failures)
+                logger.exception("Job worker error, retrying in %.1fs", backoff)
+                self._stop.wait(backoff)
+
+    def start_workers(self, count: int = 2):
+        """Start ``count`` daemon worker threads."""
+        self._stop.clear()
+        for i in range(count):
+            worker = threading.Thread(target=self._worker_loop, name=f"job-worker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def stop_workers(self, timeout: Optional[float] = None):
+        """Ask workers to stop after their current job and wait for them."""
+        self._stop.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
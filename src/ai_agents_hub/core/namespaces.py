@@ -0,0 +1,322 @@
+"""Per-user memory namespaces with quotas and LRU eviction to disk."""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from ai_agents_hub.core.embeddings import HashingEmbedder, cosine_similarity
+
+DEFAULT_NAMESPACE_ROOT = Path(".praison") / "namespaces"
+
+# Namespace of the reference documents bundled with the agents, shared by all users
+SHARED_NAMESPACE = "shared"
+
+# Kinds holding structured records rather than notes; search() skips them, entries() lists them
+RECORD_KINDS = {"performance"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    source TEXT,
+    text TEXT NOT NULL,
+    embedding TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries (last_used_at);
+"""
+
+class MemoryEntry(BaseModel):
+    """One remembered item of a namespace."""
+    id: str
+    kind: str
+    source: Optional[str] = None
+    text: str
+    score: float = 0.0
+
+class NamespaceUsage(BaseModel):
+    """Size of a namespace against its quotas."""
+    namespace: str
+    items: int
+    bytes: int
+    max_items: int
+    max_bytes: int
+    hot: bool
+
+def namespace_for(caller: str) -> str:
+    """Derive a stable, filesystem-safe namespace from a user, session or API caller id.
+
+    The readable prefix helps when browsing the namespace directory; the hash
+    keeps ids that only differ in punctuation or case apart.
+    """
+    caller = caller.strip()
+    if not caller:
+        raise ValueError("caller id must not be empty")
+    slug = re.sub(r"[^a-z0-9]+", "-", caller.lower()).strip("-")[:32] or "user"
+    digest = hashlib.blake2b(caller.encode("utf-8"), digest_size=6).hexdigest()
+    return f"{slug}-{digest}"
+
+class _Namespace:
+    """Open database and in-memory vectors of a hot namespace."""
+
+    def __init__(self, path: Path):
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.closed = False
+        self.vectors: Dict[str, List[float]] = {
+            row["id"]: json.loads(row["embedding"]) for row in self.conn.execute("SELECT id, embedding FROM entries")
+        }
+
+    def totals(self) -> Tuple[int, int]:
+        row = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return row[0], row[1]
+
+    def close(self):
+        self.conn.close()
+        self.vectors = {}
+        self.closed = True
+
+class NamespaceManager:
+    """Isolated memory stores, one SQLite file per namespace.
+
+    Searching a namespace only scans that namespace's vectors, so latency
+    depends on one user's data and not on how many users exist. At most
+    ``max_hot`` namespaces keep their vectors in memory; touching another one
+    evicts the least recently used, which then lives on disk only until it is
+    needed again. Within a namespace, going over ``max_items`` or ``max_bytes``
+    drops the least recently used entries.
+
+    Args:
+        root: Directory holding one database per namespace
+        embedder: Object with an ``embed(text)`` method
+        max_items: Entry quota per namespace
+        max_bytes: Text size quota per namespace, in UTF-8 bytes
+        max_hot: Namespaces kept loaded in memory
+    """
+
+    def __init__(self, root: Path = DEFAULT_NAMESPACE_ROOT, embedder=None, max_items: int = 2000,
+                 max_bytes: int = 5_000_000, max_hot: int = 32):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.embedder = embedder or HashingEmbedder()
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.max_hot = max_hot
+        self._hot: "OrderedDict[str, _Namespace]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, namespace: str) -> Path:
+        if not re.fullmatch(r"[a-z0-9][a-z0-9-]*", namespace):
+            raise ValueError(f"Invalid namespace: {namespace!r}; derive one with namespace_for()")
+        return self.root / f"{namespace}.sqlite3"
+
+    def _open(self, namespace: str) -> _Namespace:
+        """Return a loaded namespace, evicting the coldest one if too many are loaded."""
+        path = self._path(namespace)
+        with self._lock:
+            store = self._hot.get(namespace)
+            if store is not None:
+                self._hot.move_to_end(namespace)
+                return store
+            store = _Namespace(path)
+            self._hot[namespace] = store
+            while len(self._hot) > self.max_hot:
+                _, cold = self._hot.popitem(last=False)
+                with cold.lock:
+                    cold.close()
+            return store
+
+    @contextmanager
+    def _locked(self, namespace: str):
+        """Hold a loaded namespace's lock, reloading it if it was evicted meanwhile."""
+        while True:
+            store = self._open(namespace)
+            with store.lock:
+                if not store.closed:
+                    yield store
+                    return
+
+    def evict(self, namespace: str) -> bool:
+        """Unload a namespace from memory; its data stays on disk."""
+        with self._lock:
+            store = self._hot.pop(namespace, None)
+        if store is None:
+            return False
+        with store.lock:
+            store.close()
+        return True
+
+    def hot_namespaces(self) -> List[str]:
+        """Loaded namespaces, least recently used first."""
+        with self._lock:
+            return list(self._hot)
+
+    def remember(self, namespace: str, text: str, kind: str = "note", source: Optional[str] = None) -> str:
+        """Store an entry in a namespace, enforcing its quotas.
+
+        Args:
+            namespace: Namespace from namespace_for()
+            text: Text to remember
+            kind: Free-form category, e.g. "chat" or "learning"
+            source: Where the entry came from, e.g. a chat session id
+
+        Returns:
+            str: Entry id
+        """
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            raise ValueError(f"Entry of {size} bytes exceeds the namespace quota of {self.max_bytes} bytes")
+        embedding = self.embedder.embed(text)
+        entry_id = uuid.uuid4().hex
+        now = time.time()
+        with self._locked(namespace) as store, store.conn:
+            store.conn.execute(
+                "INSERT INTO entries (id, kind, source, text, embedding, size, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (entry_id, kind, source, text, json.dumps(embedding), size, now, now),
+            )
+            store.vectors[entry_id] = embedding
+            self._enforce_quota(store)
+        return entry_id
+
+    def _enforce_quota(self, store: _Namespace):
+        items, total = store.totals()
+        if items <= self.max_items and total <= self.max_bytes:
+            return
+        evicted = []
+        for row in store.conn.execute("SELECT id, size FROM entries ORDER BY last_used_at, created_at"):
+            if items <= self.max_items and total <= self.max_bytes:
+                break
+            evicted.append(row["id"])
+            items -= 1
+            total -= row["size"]
+        store.conn.executemany("DELETE FROM entries WHERE id = ?", [(entry_id,) for entry_id in evicted])
+        for entry_id in evicted:
+            store.vectors.pop(entry_id, None)
+
+    def search(self, namespace: str, query: str, limit: int = 3, min_score: float = 0.2,
+               exclude_source: Optional[str] = None) -> List[MemoryEntry]:
+        """Return the entries of a namespace most similar to a query.
+
+        Args:
+            namespace: Namespace to search
+            query: Query text
+            limit: Maximum number of entries
+            min_score: Minimum cosine similarity
+            exclude_source: Skip entries from this source, e.g. the current session
+
+        Returns:
+            List[MemoryEntry]: Best matches first; entries of RECORD_KINDS are never returned
+        """
+        if not self._path(namespace).exists():
+            return []
+        query_vector = self.embedder.embed(query)
+        with self._locked(namespace) as store:
+            scored = sorted(
+                ((cosine_similarity(query_vector, vector), entry_id) for entry_id, vector in store.vectors.items()),
+                reverse=True,
+            )
+            results = []
+            for score, entry_id in scored:
+                if score < min_score or len(results) >= limit:
+                    break
+                row = store.conn.execute("SELECT * FROM entries WHERE id = ?", (entry_id,)).fetchone()
+                if row["kind"] in RECORD_KINDS or (exclude_source is not None and row["source"] == exclude_source):
+                    continue
+                results.append(MemoryEntry(id=row["id"], kind=row["kind"], source=row["source"],
+                                           text=row["text"], score=round(score, 4)))
+            if results:
+                with store.conn:
+                    store.conn.executemany(
+                        "UPDATE entries SET last_used_at = ? WHERE id = ?",
+                        [(time.time(), entry.id) for entry in results],
+                    )
+        return results
+
+    def entries(self, namespace: str, kind: str, limit: int = 500) -> List[MemoryEntry]:
+        """Return the latest entries of one kind, oldest first.
+
+        Listed entries count as used, so the quota evicts them after entries
+        that are never searched or listed.
+
+        Args:
+            namespace: Namespace to read
+            kind: Kind of the entries, e.g. "performance"
+            limit: Maximum number of entries, the most recent ones
+
+        Returns:
+            List[MemoryEntry]: Matching entries in the order they were stored
+        """
+        if not self._path(namespace).exists():
+            return []
+        with self._locked(namespace) as store:
+            rows = store.conn.execute(
+                "SELECT * FROM entries WHERE kind = ? ORDER BY created_at DESC, rowid DESC LIMIT ?", (kind, limit)
+            ).fetchall()
+            if rows:
+                with store.conn:
+                    store.conn.executemany(
+                        "UPDATE entries SET last_used_at = ? WHERE id = ?", [(time.time(), row["id"]) for row in rows]
+                    )
+        return [MemoryEntry(id=row["id"], kind=row["kind"], source=row["source"], text=row["text"])
+                for row in reversed(rows)]
+
+    def usage(self, namespace: str) -> NamespaceUsage:
+        """Report a namespace's size against its quotas."""
+        path = self._path(namespace)
+        items, total = 0, 0
+        if path.exists():
+            # Read the totals without loading a cold namespace's vectors
+            conn = sqlite3.connect(str(path))
+            try:
+                items, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            finally:
+                conn.close()
+        return NamespaceUsage(namespace=namespace, items=items, bytes=total, max_items=self.max_items,
+                              max_bytes=self.max_bytes, hot=namespace in self.hot_namespaces())
+
+    def clear(self, namespace: str):
+        """Delete everything stored for a namespace."""
+        self.evict(namespace)
+        self._path(namespace).unlink(missing_ok=True)
+
+    def namespaces(self) -> List[str]:
+        """All namespaces with data on disk."""
+        return sorted(path.stem for path in self.root.glob("*.sqlite3"))
+
+    def close(self):
+        with self._lock:
+            stores, self._hot = list(self._hot.values()), OrderedDict()
+        for store in stores:
+            with store.lock:
+                store.close()
+
+@lru_cache(maxsize=1)
+def get_namespace_manager() -> NamespaceManager:
+    """Get the process-wide namespace manager.
+
+    Quotas are read from AI_AGENTS_HUB_NAMESPACE_MAX_ITEMS (default 2000),
+    AI_AGENTS_HUB_NAMESPACE_MAX_BYTES (default 5000000) and
+    AI_AGENTS_HUB_NAMESPACE_MAX_HOT (default 32).
+    """
+    return NamespaceManager(
+        max_items=int(os.environ.get("AI_AGENTS_HUB_NAMESPACE_MAX_ITEMS", "2000")),
+        max_bytes=int(os.environ.get("AI_AGENTS_HUB_NAMESPACE_MAX_BYTES", "5000000")),
+        max_hot=int(os.environ.get("AI_AGENTS_HUB_NAMESPACE_MAX_HOT", "32")),
+    )
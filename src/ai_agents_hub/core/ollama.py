@@ -0,0 +1,132 @@
+"""Minimal client for Ollama's native generate API with context reuse."""
+
+import json
+import time
+import urllib.request
+from typing import Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from ai_agents_hub.config import get_agent_config, get_ollama_keep_alive
+from ai_agents_hub.core.coalescing import SingleFlight, get_coalescer, request_key
+
+class GenerateResult(BaseModel):
+    """Outcome of one generate call."""
+    text: str
+    context: List[int]
+    prompt_eval_count: int
+    eval_count: int
+    time_to_first_token: float
+    total_time: float
+
+class OllamaClient:
+    """Stream completions from ``/api/generate`` and carry context across turns.
+
+    Ollama returns the token context of every completion. Sending it back with
+    the next prompt means only the new tokens are prefilled, and keeping the
+    model loaded with ``keep_alive`` keeps that KV state warm between turns.
+    The system prompt is only sent on the first turn of a context, so the
+    cached prefix is always the same instructions followed by the history.
+    Identical calls in flight at the same time share one generation (see
+    core.coalescing).
+    """
+
+    def __init__(self, base_url: Optional[str] = None, keep_alive: Optional[str] = None,
+                 timeout: float = 600.0, coalescer: Optional[SingleFlight] = None):
+        llm_config = get_agent_config()["llm"]["config"]
+        self.base_url = (base_url or llm_config["ollama_base_url"]).rstrip("/")
+        self.keep_alive = keep_alive or get_ollama_keep_alive()
+        self.options = {"temperature": llm_config["temperature"], "num_predict": llm_config["max_tokens"]}
+        self.timeout = timeout
+        self.coalescer = coalescer or get_coalescer()
+
+    def generate(self, model: str, prompt: str, system: Optional[str] = None,
+                 context: Optional[List[int]] = None, options: Optional[Dict] = None,
+                 on_token: Optional[Callable[[str], None]] = None) -> GenerateResult:
+        """Generate a completion, optionally continuing a previous context.
+
+        Args:
+            model: Ollama model name
+            prompt: New user input for this turn
+            system: System instructions, sent only when starting a new context
+            context: Context returned by the previous turn
+            options: Model options overriding the configured defaults
+            on_token: Callback receiving each streamed piece of text
+
+        Returns:
+            GenerateResult: Text, new context and timing of the call
+        """
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": True,
+            "options": dict(self.options, **(options or {})),
+        }
+        if context:
+            payload["context"] = context
+        elif system:
+            payload["system"] = system
+        if self.keep_alive:
+            payload["keep_alive"] = self.keep_alive
+
+        if self.coalescer is None:
+            return self._stream(payload, on_token)
+
+        start = time.perf_counter()
+        first_token = None
+
+        def relay(piece: str):
+            nonlocal first_token
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            if on_token:
+                on_token(piece)
+
+        key = request_key("generate", base_url=self.base_url, **payload)
+        result = self.coalescer.run(key, lambda emit: self._stream(payload, emit), on_token=relay,
+                                    encode=GenerateResult.model_dump_json, decode=GenerateResult.model_validate_json)
+        # Report this caller's own wait, which is shorter when it joined a call already streaming
+        total = time.perf_counter() - start
+        return result.model_copy(update={
+            "context": list(result.context),
+            "time_to_first_token": first_token if first_token is not None else total,
+            "total_time": total,
+        })
+
+    def _stream(self, payload: Dict, on_token: Optional[Callable[[str], None]] = None) -> GenerateResult:
+        context = payload.get("context")
+        request = urllib.request.Request(
+            f"{self.base_url}/api/generate",
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        start = time.perf_counter()
+        first_token = None
+        pieces = []
+        final = {}
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            for line in response:
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    raise RuntimeError(f"Ollama error: {chunk['error']}")
+                piece = chunk.get("response", "")
+                if piece:
+                    if first_token is None:
+                        first_token = time.perf_counter() - start
+                    pieces.append(piece)
+                    if on_token:
+                        on_token(piece)
+                if chunk.get("done"):
+                    final = chunk
+                    break
+        total = time.perf_counter() - start
+        return GenerateResult(
+            text="".join(pieces),
+            context=final.get("context") or list(context or []),
+            prompt_eval_count=final.get("prompt_eval_count", 0),
+            eval_count=final.get("eval_count", 0),
+            time_to_first_token=first_token if first_token is not None else total,
+            total_time=total,
+        )
@@ -0,0 +1,202 @@
+"""Opt-in profiling of individual requests with cProfile and tracemalloc."""
+
+import cProfile
+import os
+import pstats
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+class FunctionStat(BaseModel):
+    """Time spent in one function during a profiled request."""
+    function: str
+    location: str
+    calls: int
+    total_time: float
+    cumulative_time: float
+
+class AllocationStat(BaseModel):
+    """Memory allocated at one source line during a profiled request."""
+    location: str
+    size_kb: float
+    count: int
+
+class ProfileReport(BaseModel):
+    """Summary of one profiled request."""
+    label: str
+    started_at: datetime
+    elapsed: float
+    peak_memory_kb: float
+    allocated_kb: float
+    top_functions: List[FunctionStat]
+    top_allocations: List[AllocationStat]
+    error: Optional[str] = None
+    overlapped: bool = False  # Other profiled requests ran meanwhile; memory figures include theirs
+    functions_profiled: bool = True  # False when another request held the profiler; top_functions is empty
+
+class ProfileCapture:
+    """Filled in when a profile_request block exits."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.report: Optional[ProfileReport] = None
+        self.prof_data: bytes = b""
+
+# tracemalloc is process-wide: the first active capture starts it and the last one stops it
+_tracing_lock = threading.Lock()
+_active_captures = 0
+_captures_begun = 0
+_started_tracing = False
+# From Python 3.12 only one cProfile profiler can be active in the whole process
+_profiler_lock = threading.Lock()
+
+def _begin_tracing() -> Tuple[int, bool]:
+    """Register a capture; return its serial number and whether no other capture is active."""
+    global _active_captures, _captures_begun, _started_tracing
+    with _tracing_lock:
+        if _active_captures == 0:
+            _started_tracing = not tracemalloc.is_tracing()
+            if _started_tracing:
+                tracemalloc.start()
+        _active_captures += 1
+        _captures_begun += 1
+        alone = _active_captures == 1
+        if alone:
+            # Resetting the peak while another capture runs would corrupt its figure
+            tracemalloc.reset_peak()
+        return _captures_begun, alone
+
+def _end_tracing():
+    """Unregister a capture, and stop tracemalloc after the last one if a capture started it."""
+    global _active_captures, _started_tracing
+    with _tracing_lock:
+        _active_captures -= 1
+        if _active_captures == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+def profiling_enabled_by_default() -> bool:
+    """Whether AI_AGENTS_HUB_DEBUG asks for every request to be profiled."""
+    return os.environ.get("AI_AGENTS_HUB_DEBUG", "").lower() in ("1", "true", "yes", "on")
+
+def _short_location(filename: str, line: int) -> str:
+    # Keep the path from the package directory on, site-packages prefixes add nothing
+    for marker in ("site-packages/", "src/"):
+        if marker in filename:
+            filename = filename.split(marker, 1)[1]
+            break
+    return f"{filename}:{line}"
+
+def _function_stats(profiler: cProfile.Profile, top_n: int) -> List[FunctionStat]:
+    stats = pstats.Stats(profiler)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top_n]
+    return [
+        FunctionStat(
+            function=name,
+            location=_short_location(filename, line),
+            calls=total_calls,
+            total_time=round(total_time, 6),
+            cumulative_time=round(cumulative_time, 6),
+        )
+        for (filename, line, name), (_, total_calls, total_time, cumulative_time, _) in rows
+    ]
+
+def _allocation_stats(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, top_n: int) -> List[AllocationStat]:
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+    differences = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+    grown = [diff for diff in differences if diff.size_diff > 0][:top_n]
+    return [
+        AllocationStat(
+            location=_short_location(diff.traceback[0].filename, diff.traceback[0].lineno),
+            size_kb=round(diff.size_diff / 1024, 2),
+            count=diff.count_diff,
+        )
+        for diff in grown
+    ]
+
+@contextmanager
+def profile_request(label: str, top_n: int = 15) -> Iterator[ProfileCapture]:
+    """Profile the code inside the block with cProfile and tracemalloc.
+
+    Only the calling thread is profiled, so work handed to other threads
+    shows up as time spent waiting for it. One request is profiled with
+    cProfile at a time; a request that overlaps it only gets memory figures,
+    and its report has ``functions_profiled`` set to False. tracemalloc is started for the
+    block if it is not already tracing, and stopped again after the last
+    overlapping profiled request, so requests that are not profiled pay
+    nothing. Memory figures of overlapping requests include each other's
+    allocations, and their reports say so. Exceptions propagate; the
+    report is still filled in and records the error.
+
+    Args:
+        label: Name of the request, e.g. the agent it went to
+        top_n: Number of functions and allocation sites to keep
+
+    Yields:
+        ProfileCapture: Holds the report and the raw .prof data after the block
+    """
+    capture = ProfileCapture(label)
+    serial, alone = _begin_tracing()
+    try:
+        before = tracemalloc.take_snapshot()
+        baseline, _ = tracemalloc.get_traced_memory()
+        started_at = datetime.now()
+        profiler = cProfile.Profile()
+        profiling = _profiler_lock.acquire(blocking=False)
+        if profiling:
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiling tool, e.g. a debugger, is active in this process
+                _profiler_lock.release()
+                profiling = False
+        error = None
+        start = time.perf_counter()
+        try:
+            yield capture
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            if profiling:
+                profiler.disable()
+                _profiler_lock.release()
+            elapsed = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+            try:
+                top_allocations = _allocation_stats(before, tracemalloc.take_snapshot(), top_n)
+            except RuntimeError:
+                # tracemalloc was stopped elsewhere; that must not mask the request's own outcome
+                top_allocations = []
+            capture.report = ProfileReport(
+                label=label,
+                started_at=started_at,
+                elapsed=round(elapsed, 6),
+                peak_memory_kb=round(max(peak - baseline, current - baseline, 0) / 1024, 2),
+                allocated_kb=round((current - baseline) / 1024, 2),
+                top_functions=_function_stats(profiler, top_n) if profiling else [],
+                top_allocations=top_allocations,
+                error=error,
+                overlapped=not alone or _captures_begun != serial,
+                functions_profiled=profiling,
+            )
+            capture.prof_data = dump_stats(profiler) if profiling else b""
+    finally:
+        _end_tracing()
+
+def dump_stats(profiler: cProfile.Profile) -> bytes:
+    """Serialize a profile in the .prof format read by pstats, snakeviz and friends."""
+    with tempfile.NamedTemporaryFile(suffix=".prof", delete=False) as handle:
+        path = handle.name
+    try:
+        profiler.dump_stats(path)
+        with open(path, "rb") as handle:
+            return handle.read()
+    finally:
+        os.unlink(path)
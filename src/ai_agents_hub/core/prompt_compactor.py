@@ -0,0 +1,175 @@
+"""Shrink code before it is put into a prompt, keeping a map to the original lines."""
+
+import math
+import re
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel
+
+LICENSE_WORDS = re.compile(r"(?i)licen[cs]e|copyright|spdx|all rights reserved|warrant")
+# Only tool-written markers: hand-written "do not edit" notes must not hide the rest of a file
+GENERATED_FILE_MARKER = re.compile(r"@generated\b|^\W*Code generated .* DO NOT EDIT\.$")
+REGION_START = re.compile(r"(?i)\b(begin|start)\b.*\b(generated|vendor(ed)?|third[- ]party)\b")
+REGION_END = re.compile(r"(?i)\bend\b.*\b(generated|vendor(ed)?|third[- ]party)\b")
+# "#" starts a comment unless it is a C preprocessor directive
+COMMENT_LINE = re.compile(
+    r"^\s*(#(?!\s*(include|define|undef|if|ifdef|ifndef|elif|else|endif|pragma|import)\b)|//|/\*|\*/|\*(\s|$)|--\s)"
+)
+BLOB_LITERAL = re.compile(r"(['\"])([A-Za-z0-9+/=_\-]{200,})\1")
+TOKEN_PIECES = re.compile(r"\w+|[^\w\s]|\s{2,}")
+
+class CompactedCode(BaseModel):
+    """Compacted code with the original line number of each of its lines."""
+    text: str
+    line_map: List[int]
+    original_tokens: int
+    compact_tokens: int
+    omitted: List[str]
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.compact_tokens
+
+    def original_line(self, line: int) -> int:
+        """Translate a 1-based line number of the compacted text to the original code."""
+        if 1 <= line <= len(self.line_map):
+            return self.line_map[line - 1]
+        return line
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the token count of code the way BPE tokenizers split it.
+
+    Words cost one token per four characters, punctuation one token each, and
+    runs of whitespace such as indentation one token.
+    """
+    return sum(math.ceil(len(piece) / 4) if piece[0].isalnum() or piece[0] == "_" else 1
+               for piece in TOKEN_PIECES.findall(text))
+
+def _placeholder(like: str, comment: str, message: str) -> str:
+    indent = like[:len(like) - len(like.lstrip())]
+    return f"{indent}{comment} [{message}]"
+
+def _span(lines: List[Tuple[int, str]], start: int, end: int) -> str:
+    first, last = lines[start][0], lines[end - 1][0]
+    return f"line {first}" if first == last else f"lines {first}-{last}"
+
+def compact_code(code: str, line_numbers: Optional[List[int]] = None, max_comment_lines: int = 5,
+                 max_line_chars: int = 400, generated_keep_lines: int = 20) -> CompactedCode:
+    """Remove prompt-wasting parts of code while keeping a map to the original lines.
+
+    The code is dedented and stripped of trailing whitespace, a leading
+    license header is collapsed, generated or vendored regions and long
+    comment runs are shortened, minified lines and long data literals are
+    elided, and blank runs are squeezed. Each collapsed section leaves a
+    one-line comment saying which original lines it replaces.
+
+    Args:
+        code: Code as submitted by the user
+        line_numbers: Original line number of each line of ``code``;
+            defaults to 1..n
+        max_comment_lines: Longest comment run kept in full
+        max_line_chars: Lines longer than this with almost no spaces are
+            treated as minified
+        generated_keep_lines: Lines kept after an ``@generated`` marker in the
+            first 10 lines or a "Code generated ... DO NOT EDIT." first line
+
+    Returns:
+        CompactedCode: Compacted text, line map and token counts
+    """
+    raw_lines = code.splitlines()
+    numbers = line_numbers or list(range(1, len(raw_lines) + 1))
+    lines = [(number, line.rstrip()) for number, line in zip(numbers, raw_lines)]
+    comment = "//" if any(line.lstrip().startswith("//") for _, line in lines) else "#"
+    omitted: List[str] = []
+
+    # Indentation shared by every line, e.g. from a pasted indented block
+    indents = [len(line) - len(line.lstrip()) for _, line in lines if line.strip()]
+    common = min(indents, default=0)
+    if common:
+        lines = [(number, line[common:]) for number, line in lines]
+
+    out: List[Tuple[int, str]] = []
+    i = 0
+    # Leading license header: the first comment block, after a shebang or encoding line
+    while i < len(lines) and (lines[i][1].startswith("#!") or "coding" in lines[i][1][:30] and lines[i][1].startswith("#")):
+        out.append(lines[i])
+        i += 1
+    j = i
+    while j < len(lines) and (COMMENT_LINE.match(lines[j][1]) or not lines[j][1].strip()):
+        j += 1
+    header = " ".join(line for _, line in lines[i:j])
+    if j - i > 2 and LICENSE_WORDS.search(header):
+        span = _span(lines, i, j)
+        out.append((lines[i][0], f"{comment} [license header omitted: {span}]"))
+        omitted.append(f"license header ({span})")
+        i = j
+
+    generated_file = bool(lines) and (any("@generated" in line for _, line in lines[:10])
+                                      or bool(GENERATED_FILE_MARKER.search(lines[0][1])))
+    while i < len(lines):
+        number, line = lines[i]
+        if REGION_START.search(line) and COMMENT_LINE.match(line):
+            end = next((k for k in range(i + 1, len(lines)) if REGION_END.search(lines[k][1])), None)
+            if end is not None and end - i > 1:
+                span = _span(lines, i, end + 1)
+                out.append((number, _placeholder(line, comment, f"generated/vendored section omitted: {span}")))
+                omitted.append(f"generated section ({span})")
+                i = end + 1
+                continue
+        if COMMENT_LINE.match(line):
+            end = i
+            while end < len(lines) and COMMENT_LINE.match(lines[end][1]):
+                end += 1
+            if end - i > max_comment_lines:
+                out.extend(lines[i:i + 2])
+                span = _span(lines, i + 2, end)
+                out.append((lines[i + 2][0], _placeholder(line, comment, f"{end - i - 2} comment lines omitted: {span}")))
+                omitted.append(f"long comment ({span})")
+                i = end
+                continue
+        if BLOB_LITERAL.search(line):
+            line = BLOB_LITERAL.sub(lambda m: f"{m.group(1)}{m.group(2)[:16]}...<{len(m.group(2))} chars>{m.group(1)}", line)
+            omitted.append(f"data literal on line {number}")
+        if len(line) > max_line_chars and line.count(" ") < len(line) * 0.05:
+            out.append((number, _placeholder(line, comment, f"minified line {number} omitted: {len(line)} chars")))
+            omitted.append(f"minified line {number}")
+            i += 1
+            continue
+        if not line.strip() and out and not out[-1][1].strip():
+            i += 1
+            continue
+        out.append((number, line))
+        i += 1
+
+    if generated_file:
+        # The marker may have been folded into the license header placeholder
+        marker = next((k for k, (_, line) in enumerate(out) if GENERATED_FILE_MARKER.search(line)), 0)
+        keep = marker + 1 + generated_keep_lines
+        if len(out) > keep + 1:
+            span = f"lines {out[keep][0]}-{out[-1][0]}"
+            out = out[:keep] + [(out[keep][0], f"{comment} [rest of generated file omitted: {span}]")]
+            omitted.append(f"generated file ({span})")
+
+    while out and not out[-1][1].strip():
+        out.pop()
+    text = "\n".join(line for _, line in out)
+    return CompactedCode(
+        text=text,
+        line_map=[number for number, _ in out],
+        original_tokens=estimate_tokens(code),
+        compact_tokens=estimate_tokens(text),
+        omitted=omitted,
+    )
+
+LINE_REFERENCE = re.compile(r"\b([Ll]ines?|LINES?|L(?=\d))(\s*)(\d+)(?:(\s*(?:-|–|to)\s*)(\d+))?")
+
+def remap_line_references(text: str, compacted: CompactedCode) -> str:
+    """Rewrite "line N" and "lines N-M" in a model's reply to original line numbers."""
+    def replace(match: re.Match) -> str:
+        word, space, start, separator, end = match.groups()
+        mapped = f"{word}{space}{compacted.original_line(int(start))}"
+        if end:
+            mapped += f"{separator}{compacted.original_line(int(end))}"
+        return mapped
+
+    return LINE_REFERENCE.sub(replace, text)
@@ -0,0 +1,196 @@
+"""Local intent router for dispatching General Chat input to specialized agents."""
+
+import re
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from ai_agents_hub.core.embeddings import HashingEmbedder, cosine_similarity
+
+ROUTES = ["chat", "knowledge", "code_analysis", "code_review", "learning"]
+
+ROUTE_LABELS = {
+    "chat": "General Chat",
+    "knowledge": "Knowledge Agent",
+    "code_analysis": "Code Analysis",
+    "code_review": "Code Review",
+    "learning": "Adaptive Learning",
+}
+
+DEFAULT_EXEMPLARS: Dict[str, List[str]] = {
+    "chat": [
+        "hello how are you",
+        "can you help me organize my tasks for today",
+        "what is the capital of france",
+        "give me some ideas for a weekend trip",
+        "thanks that was helpful",
+        "write a short email to my team",
+    ],
+    "knowledge": [
+        "what does the document say about retrieval",
+        "summarize the paper",
+        "according to the pdf how are pages indexed",
+        "what are the main findings of the document",
+        "find the section about vision language models",
+        "what does the knowledge base say about embeddings",
+    ],
+    "code_analysis": [
+        "analyze the quality of this code",
+        "what is the complexity of this function",
+        "evaluate the architecture and maintainability of this module",
+        "give me code metrics for this class",
+        "assess the test coverage and documentation of this code",
+    ],
+    "code_review": [
+        "review this code",
+        "is there a bug in this function",
+        "find security issues in this snippet",
+        "why does this code crash",
+        "suggest fixes for this pull request",
+    ],
+    "learning": [
+        "teach me python programming",
+        "i want to learn about recursion",
+        "give me exercises on sql joins",
+        "start a lesson on linear algebra",
+        "quiz me on data structures",
+        "help me study for my exam on algorithms",
+    ],
+}
+
+CODE_FENCE = re.compile(r"```")
+# A trailing ";" or "{" alone is common in prose; it only counts on lines with code punctuation
+CODE_LINE = re.compile(
+    r"^\s*(def |class |import |from \S+ import |return\b|if .*:\s*$|for .*:\s*$|while .*:\s*$|"
+    r"function\b|const |let |var |public |private |#include|package |func |fn |SELECT\b|"
+    r"[\w.\[\]]+\s*[-+*/%|&^]?=[^=]|.*[=()\[\]].*[{;]\s*$|[}\])]+;?\s*$|.*=>|.*\)\s*:\s*$)"
+)
+MIN_CODE_LINES = 3
+REVIEW_HINTS = re.compile(r"\b(review|bugs?|fix|wrong|broken|crash|error|issues?|security|vulnerab\w*|pr|pull request)\b", re.I)
+ANALYSIS_HINTS = re.compile(r"\b(analy[sz]\w*|quality|complexity|metrics?|architecture|maintainab\w*|coverage|structure)\b", re.I)
+LEARNING_HINTS = re.compile(
+    r"\b(teach me|i want to learn|learn about|(lesson|tutorial) (on|about)|quiz me|exercises? (on|for|about)|(?<!best )practice (on|for)|practice exercises?|study(ing)? for)\b", re.I
+)
+KNOWLEDGE_HINTS = re.compile(
+    r"\b(the (document|doc|pdf|paper|report|knowledge base)|according to|in the (document|doc|pdf|paper)|cite|source document)\b", re.I
+)
+LEARNING_TOPIC = re.compile(
+    r"(?:teach me|learn about|learn|(?:lesson|tutorial) (?:on|about)|quiz me on|exercises? (?:on|for|about)|(?<!best )practice (?:on|for)|study for)\s+(?:about\s+)?(.+)",
+    re.I,
+)
+
+class RouteDecision(BaseModel):
+    """Result of routing one message."""
+    route: str
+    confidence: float
+    reason: str
+    scores: Dict[str, float]
+    elapsed_ms: float
+
+def code_line_ratio(text: str) -> float:
+    """Fraction of non-empty lines that look like source code."""
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return 0.0
+    return sum(1 for line in lines if CODE_LINE.match(line)) / len(lines)
+
+def contains_code(text: str) -> bool:
+    """Whether a message carries code: a fenced block, or several code-shaped lines making up half of it."""
+    if CODE_FENCE.search(text):
+        return True
+    return (sum(1 for line in text.splitlines() if CODE_LINE.match(line)) >= MIN_CODE_LINES
+            and code_line_ratio(text) >= 0.5)
+
+def extract_code(text: str) -> str:
+    """Return the fenced code in a message, or the message itself."""
+    blocks = re.findall(r"```[^\n]*\n(.*?)```", text, re.S)
+    return "\n\n".join(block.rstrip() for block in blocks) if blocks else text
+
+def extract_learning_topic(text: str) -> str:
+    """Pull the learning topic out of a request such as "teach me recursion"."""
+    match = LEARNING_TOPIC.search(text)
+    topic = match.group(1) if match else text
+    return topic.strip().rstrip("?.!") or text.strip()
+
+class IntentRouter:
+    """Route messages with keyword rules plus an exemplar similarity classifier.
+
+    Rules catch unambiguous signals (pasted code, explicit learning or document
+    requests) with high confidence. Everything else is scored by cosine
+    similarity against per-route centroids of cached exemplar embeddings;
+    the code routes are only candidates when the message contains code.
+    Messages that match nothing well stay with the chat agent.
+    """
+
+    def __init__(self, exemplars: Optional[Dict[str, List[str]]] = None,
+                 embedder=None, min_similarity: float = 0.3):
+        self.embedder = embedder or HashingEmbedder()
+        self.min_similarity = min_similarity
+        self.centroids = {
+            route: self._centroid([self.embedder.embed(text) for text in texts])
+            for route, texts in (exemplars or DEFAULT_EXEMPLARS).items()
+        }
+
+    @staticmethod
+    def _centroid(vectors: List[List[float]]) -> List[float]:
+        return [sum(values) / len(vectors) for values in zip(*vectors)]
+
+    def _apply_rules(self, text: str) -> Optional[RouteDecision]:
+        if contains_code(text):
+            confidence = 0.95 if CODE_FENCE.search(text) else round(0.6 + 0.35 * code_line_ratio(text), 3)
+            if ANALYSIS_HINTS.search(text) and not REVIEW_HINTS.search(text):
+                return RouteDecision(route="code_analysis", confidence=confidence,
+                                     reason="code with analysis request", scores={}, elapsed_ms=0.0)
+            return RouteDecision(route="code_review", confidence=confidence,
+                                 reason="code submitted", scores={}, elapsed_ms=0.0)
+        if LEARNING_HINTS.search(text):
+            return RouteDecision(route="learning", confidence=0.85,
+                                 reason="learning request", scores={}, elapsed_ms=0.0)
+        if KNOWLEDGE_HINTS.search(text):
+            return RouteDecision(route="knowledge", confidence=0.8,
+                                 reason="document question", scores={}, elapsed_ms=0.0)
+        return None
+
+    def _classify(self, text: str) -> Dict[str, float]:
+        vector = self.embedder.embed(text)
+        return {route: cosine_similarity(vector, centroid) for route, centroid in self.centroids.items()}
+
+    def route(self, text: str) -> RouteDecision:
+        """Pick the agent that should handle ``text``.
+
+        Args:
+            text: The raw user message
+
+        Returns:
+            RouteDecision: The chosen route, its confidence in [0, 1], the
+            per-route similarity scores and the time spent routing
+        """
+        start = time.perf_counter()
+        scores = self._classify(text)
+        decision = self._apply_rules(text)
+        if decision is None:
+            # Without code there is nothing for the review and analysis agents to work on
+            ranked = sorted(((route, score) for route, score in scores.items()
+                             if route not in ("code_review", "code_analysis")),
+                            key=lambda item: item[1], reverse=True)
+            best, best_score = ranked[0]
+            runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+            if best_score < self.min_similarity:
+                decision = RouteDecision(route="chat", confidence=round(1.0 - best_score, 3),
+                                         reason="no specialized intent", scores={}, elapsed_ms=0.0)
+            else:
+                # Confidence grows with both the absolute match and the margin over the runner-up.
+                margin = (best_score - runner_up) / best_score if best_score else 0.0
+                confidence = min(1.0, 0.5 * best_score + 0.5 * margin + 0.25)
+                decision = RouteDecision(route=best, confidence=round(confidence, 3),
+                                         reason="exemplar similarity", scores={}, elapsed_ms=0.0)
+        decision.scores = {route: round(score, 3) for route, score in scores.items()}
+        decision.elapsed_ms = (time.perf_counter() - start) * 1000
+        return decision
+
+@lru_cache(maxsize=1)
+def get_intent_router() -> IntentRouter:
+    """Return the process-wide router, building exemplar centroids once."""
+    return IntentRouter()
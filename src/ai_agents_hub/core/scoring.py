@@ -0,0 +1,188 @@
+"""Local grading of exercise answers and difficulty adaptation from past scores."""
+
+import math
+import re
+from fractions import Fraction
+from typing import Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from ai_agents_hub.core.embeddings import HashingEmbedder, cosine_similarity
+
+DIFFICULTY_LEVELS = ["beginner", "intermediate", "advanced"]
+
+# Rasch item difficulty of each level, on the same logit scale as student ability
+LEVEL_DIFFICULTY = {"beginner": -1.0, "intermediate": 0.0, "advanced": 1.0}
+
+# Exercise types whose answers are compared as text or numbers, never by similarity
+STRICT_TYPES = {"multiple_choice", "true_false", "numeric", "fill_in_the_blank", "short_answer"}
+
+THOUSANDS = re.compile(r"^[-+]?\d{1,3}([,_])\d{3}(\1\d{3})*(\.\d*)?$")
+NUMBER = re.compile(r"^[-+]?(\d+(\.\d*)?|\.\d+)(e[-+]?\d+)?$|^[-+]?\d+/\d+$")
+ARTICLES = re.compile(r"\b(a|an|the)\b")
+
+class AnswerGrade(BaseModel):
+    """Outcome of grading one answer."""
+    score: float
+    correct: bool
+    method: str  # exact, normalized, numeric, similarity or ungraded
+
+class DifficultyRecommendation(BaseModel):
+    """Estimated ability of a student and the level to serve next."""
+    ability: float
+    level: str
+    adjustment: str  # increase, maintain or decrease
+    expected_success: float
+    answers: int
+
+def normalize_answer(text: str, drop_articles: bool = True) -> str:
+    """Lowercase, drop punctuation and, optionally, articles, and collapse whitespace."""
+    text = re.sub(r"[^\w\s.+\-/]", " ", text.lower())
+    if drop_articles:
+        text = ARTICLES.sub(" ", text)
+    return " ".join(text.split()).strip(" .")
+
+def parse_number(text: str) -> Optional[float]:
+    """Read an answer as a number, accepting 1,000, 2.5e3, 3/4 and 75%.
+
+    Commas and underscores are only read as thousands separators between
+    groups of three digits, so "1,2,3" is not a number.
+    """
+    text = text.strip()
+    scale = 1.0
+    if text.endswith("%"):
+        text, scale = text[:-1].strip(), 0.01
+    if THOUSANDS.match(text):
+        text = text.replace(",", "").replace("_", "")
+    if not NUMBER.match(text.lower()):
+        return None
+    try:
+        return float(Fraction(text)) * scale if "/" in text else float(text) * scale
+    except (ValueError, ZeroDivisionError):
+        return None
+
+def grade_answer(expected: Optional[str], response: str, exercise_type: str = "", embedder=None,
+                 rel_tolerance: float = 0.01, abs_tolerance: float = 1e-9,
+                 similarity_threshold: float = 0.7) -> AnswerGrade:
+    """Grade an answer against the expected one without calling a model.
+
+    Answers are tried, in order, as an exact match, a normalized match
+    (case, punctuation, articles and whitespace ignored) and a number within
+    tolerance. Free-text answers that none of these accept are scored by the
+    cosine similarity of their embeddings; exercise types in STRICT_TYPES
+    never are, so a wrong choice does not earn partial credit. Articles are
+    kept in one-word answers, where "A" may be the answer itself, and an
+    answer without any letter or digit is only accepted as an exact match.
+
+    Args:
+        expected: Reference answer; the answer is ungraded without one
+        response: The student's answer
+        exercise_type: Exercise type, e.g. "multiple_choice" or "open"
+        embedder: Object with an ``embed(text)`` method; HashingEmbedder by default
+        rel_tolerance: Relative tolerance for numeric answers
+        abs_tolerance: Absolute tolerance for numeric answers, for answers near zero
+        similarity_threshold: Similarity from which a free-text answer counts as correct
+
+    Returns:
+        AnswerGrade: Score between 0 and 1 and how it was obtained
+    """
+    if expected is None or not expected.strip():
+        return AnswerGrade(score=0.0, correct=False, method="ungraded")
+    if response.strip() == expected.strip():
+        return AnswerGrade(score=1.0, correct=True, method="exact")
+    if not re.search(r"[^\W_]", response):
+        return AnswerGrade(score=0.0, correct=False, method="normalized")
+    drop_articles = len(expected.split()) > 1
+    if normalize_answer(response, drop_articles) == normalize_answer(expected, drop_articles):
+        return AnswerGrade(score=1.0, correct=True, method="normalized")
+
+    expected_number, response_number = parse_number(expected), parse_number(response)
+    if expected_number is not None:
+        correct = response_number is not None and math.isclose(
+            response_number, expected_number, rel_tol=rel_tolerance, abs_tol=abs_tolerance
+        )
+        return AnswerGrade(score=1.0 if correct else 0.0, correct=correct, method="numeric")
+    if exercise_type in STRICT_TYPES:
+        return AnswerGrade(score=0.0, correct=False, method="normalized")
+
+    embedder = embedder or HashingEmbedder()
+    similarity = max(0.0, cosine_similarity(embedder.embed(expected), embedder.embed(response)))
+    return AnswerGrade(score=round(similarity, 4), correct=similarity >= similarity_threshold, method="similarity")
+
+def success_probability(ability: float, difficulty: float) -> float:
+    """Chance that a student of this ability gets an item of this difficulty right (Rasch model)."""
+    return 1.0 / (1.0 + math.exp(difficulty - ability))
+
+def estimate_ability(observations: Iterable[Tuple[str, float]], prior: float = 0.0,
+                     k_factor: float = 0.8, min_k_factor: float = 0.2) -> Tuple[float, int]:
+    """Estimate a student's ability from graded answers, oldest first.
+
+    Each answer moves the estimate Elo-style by ``k * (score - expected)``,
+    where the expected score comes from the Rasch model for the level of the
+    exercise. The step shrinks as answers accumulate, so the first answers
+    place the student quickly and later ones refine the estimate.
+
+    Args:
+        observations: (difficulty level, score between 0 and 1) pairs
+        prior: Ability before any answer, 0.0 being an intermediate student
+        k_factor: Step size for the first answer
+        min_k_factor: Smallest step size, so the estimate can still follow progress
+
+    Returns:
+        Tuple of the ability estimate and the number of answers used
+    """
+    ability, count = prior, 0
+    for level, score in observations:
+        difficulty = LEVEL_DIFFICULTY.get(level, 0.0)
+        k = max(min_k_factor, k_factor / math.sqrt(1 + count))
+        ability += k * (min(1.0, max(0.0, score)) - success_probability(ability, difficulty))
+        count += 1
+    return ability, count
+
+def recommend_difficulty(observations: List[Tuple[str, float]], current_level: Optional[str] = None,
+                         target_success: float = 0.7) -> DifficultyRecommendation:
+    """Choose the level at which a student is expected to succeed ``target_success`` of the time.
+
+    The level moves at most one step from ``current_level`` per session.
+    Without a current level, the level of the latest answer is used, and a
+    student without answers starts at beginner.
+
+    Args:
+        observations: (difficulty level, score) pairs, oldest first
+        current_level: Level of the session that just ended
+        target_success: Desired chance of answering correctly
+
+    Returns:
+        DifficultyRecommendation: Ability estimate and the next level
+    """
+    ability, count = estimate_ability(observations)
+    current = current_level or (observations[-1][0] if observations else None)
+    if count == 0:
+        level = current if current in LEVEL_DIFFICULTY else DIFFICULTY_LEVELS[0]
+        return DifficultyRecommendation(ability=ability, level=level, adjustment="maintain",
+                                        expected_success=round(success_probability(ability, LEVEL_DIFFICULTY[level]), 3),
+                                        answers=0)
+
+    best = min(DIFFICULTY_LEVELS,
+               key=lambda level: abs(success_probability(ability, LEVEL_DIFFICULTY[level]) - target_success))
+    if current in LEVEL_DIFFICULTY:
+        position, target = DIFFICULTY_LEVELS.index(current), DIFFICULTY_LEVELS.index(best)
+        best = DIFFICULTY_LEVELS[position + max(-1, min(1, target - position))]
+        adjustment = "increase" if target > position else "decrease" if target < position else "maintain"
+    else:
+        adjustment = "maintain"
+    return DifficultyRecommendation(
+        ability=round(ability, 4),
+        level=best,
+        adjustment=adjustment,
+        expected_success=round(success_probability(ability, LEVEL_DIFFICULTY[best]), 3),
+        answers=count,
+    )
+
+def performance_band(scores: List[float], window: int = 5) -> str:
+    """Summarize the latest scores as low, medium or high."""
+    recent = scores[-window:]
+    if not recent:
+        return "medium"
+    mean = sum(recent) / len(recent)
+    return "low" if mean < 0.5 else "medium" if mean < 0.8 else "high"
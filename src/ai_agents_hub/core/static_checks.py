@@ -0,0 +1,142 @@
+"""Local static checks used to triage code before it reaches an LLM."""
+
+import ast
+import re
+import textwrap
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+class StaticFinding(BaseModel):
+    """Issue detected without a model."""
+    type: str
+    severity: str
+    line_number: Optional[int]
+    description: str
+
+class CodeChunk(BaseModel):
+    """Contiguous slice of a source file, with 1-based inclusive line numbers."""
+    start_line: int
+    end_line: int
+    text: str
+
+class ChunkSignals(BaseModel):
+    """Static signals for one chunk."""
+    chunk: CodeChunk
+    findings: List[StaticFinding]
+    parse_confidence: float
+    security_sensitive: bool
+    complexity: int
+
+    @property
+    def max_severity(self) -> str:
+        for severity in ("high", "medium", "low"):
+            if any(f.severity == severity for f in self.findings):
+                return severity
+        return "none"
+
+# (pattern, type, severity, description) checked line by line, for any language
+LINE_RULES = [
+    (re.compile(r"\beval\s*\(|\bexec\s*\("), "security", "high", "Dynamic code execution with eval/exec"),
+    (re.compile(r"\bos\.system\s*\(|shell\s*=\s*True"), "security", "high", "Shell command execution"),
+    (re.compile(r"\bpickle\.loads?\s*\(|\bmarshal\.loads?\s*\("), "security", "high", "Deserialization of untrusted data"),
+    (re.compile(r"\byaml\.load\s*\((?!.*Loader\s*=\s*yaml\.SafeLoader)"), "security", "high", "yaml.load without SafeLoader"),
+    (re.compile(r"(?i)\b(password|passwd|secret|api_key|token)\s*=\s*['\"][^'\"]{4,}['\"]"), "security", "high", "Hard-coded credential"),
+    (re.compile(r"(?i)\.execute\s*\(\s*(f['\"]|['\"].*['\"]\s*(%|\+|\.format))"), "security", "high", "SQL built from string formatting"),
+    (re.compile(r"verify\s*=\s*False"), "security", "medium", "TLS certificate verification disabled"),
+    (re.compile(r"\bhashlib\.(md5|sha1)\s*\("), "security", "medium", "Weak hash function"),
+    (re.compile(r"^\s*except\s*:"), "bug", "medium", "Bare except hides errors"),
+    (re.compile(r"[!=]=\s*None\b"), "style", "low", "Comparison to None should use 'is'"),
+    (re.compile(r"\brange\s*\(\s*len\s*\("), "style", "low", "Iterate directly instead of range(len(...))"),
+    (re.compile(r"\bTODO\b|\bFIXME\b"), "maintainability", "low", "Unresolved TODO/FIXME"),
+]
+
+# Modules whose use is risky in itself: process execution, deserialization,
+# raw memory and remote shells. Common modules such as os or requests are
+# left to the line rules, or nearly every chunk would be escalated.
+SENSITIVE_IMPORTS = re.compile(
+    r"^\s*(import|from)\s+(subprocess|pickle|cPickle|marshal|shelve|dill|ctypes|pty|pexpect|paramiko|"
+    r"telnetlib|ftplib)\b|^\s*from\s+os\s+import\s+.*\b(system|popen|exec\w*|spawn\w*)\b",
+    re.M,
+)
+CHUNK_BOUNDARY = re.compile(r"^(def |class |async def |@)")
+# Lines that look like statements in C-like and scripting languages
+STRUCTURED_LINE = re.compile(
+    r"[{}()\[\];=:,]\s*$|^\s*[{}\])]|^\s*(if|else|for|while|return|switch|case|func|function|fn|def|class|"
+    r"package|import|export|const|let|var|pub|public|private|protected|static|struct|interface|type|"
+    r"#include|using|namespace)\b|^\s*(//|/\*|\*)"
+)
+BRANCH_NODES = (ast.If, ast.For, ast.While, ast.Try, ast.With, ast.BoolOp, ast.IfExp, ast.comprehension)
+
+def chunk_code(code: str, max_lines: int = 80) -> List[CodeChunk]:
+    """Split code into chunks at top-level definitions, at most ``max_lines`` long."""
+    lines = code.splitlines()
+    chunks: List[CodeChunk] = []
+    start = 0
+    for i, line in enumerate(lines):
+        at_boundary = CHUNK_BOUNDARY.match(line) and i > start
+        # Keep decorators attached to the definition that follows them
+        if at_boundary and i > 0 and lines[i - 1].startswith("@"):
+            at_boundary = False
+        if at_boundary or i - start >= max_lines:
+            chunks.append(CodeChunk(start_line=start + 1, end_line=i, text="\n".join(lines[start:i])))
+            start = i
+    if start < len(lines):
+        chunks.append(CodeChunk(start_line=start + 1, end_line=len(lines), text="\n".join(lines[start:])))
+    return [chunk for chunk in chunks if chunk.text.strip()]
+
+def mutable_default_findings(tree: ast.AST, line_offset: int) -> List[StaticFinding]:
+    findings = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for default in node.args.defaults + node.args.kw_defaults:
+                if isinstance(default, (ast.List, ast.Dict, ast.Set)):
+                    findings.append(StaticFinding(
+                        type="bug", severity="medium", line_number=node.lineno + line_offset,
+                        description=f"Mutable default argument in {node.name}()",
+                    ))
+    return findings
+
+def analyze_chunk(chunk: CodeChunk) -> ChunkSignals:
+    """Run the static checks on one chunk."""
+    findings = []
+    for offset, line in enumerate(chunk.text.splitlines()):
+        for pattern, issue_type, severity, description in LINE_RULES:
+            if pattern.search(line):
+                findings.append(StaticFinding(
+                    type=issue_type, severity=severity,
+                    line_number=chunk.start_line + offset, description=description,
+                ))
+
+    complexity = 1
+    try:
+        # Chunks cut from inside a class or function keep their indentation
+        tree = ast.parse(textwrap.dedent(chunk.text))
+    except SyntaxError:
+        # Not Python, or a fragment cut mid-statement: judge how code-like the
+        # text is, so well-formed JavaScript or Go is as trusted as Python and
+        # prose or a cut-off fragment is not.
+        code_lines = [l for l in chunk.text.splitlines() if l.strip()]
+        structured = sum(1 for l in code_lines if STRUCTURED_LINE.search(l))
+        parse_confidence = 0.9 * structured / len(code_lines) if code_lines else 0.0
+        if chunk.text.count("{") != chunk.text.count("}") or chunk.text.count("(") != chunk.text.count(")"):
+            parse_confidence /= 2
+    else:
+        parse_confidence = 1.0
+        complexity += sum(isinstance(node, BRANCH_NODES) for node in ast.walk(tree))
+        findings.extend(mutable_default_findings(tree, chunk.start_line - 1))
+
+    security_sensitive = bool(SENSITIVE_IMPORTS.search(chunk.text)) or any(
+        f.type == "security" for f in findings
+    )
+    return ChunkSignals(
+        chunk=chunk,
+        findings=findings,
+        parse_confidence=round(parse_confidence, 3),
+        security_sensitive=security_sensitive,
+        complexity=complexity,
+    )
+
+def analyze_code(code: str, max_lines: int = 80) -> List[ChunkSignals]:
+    """Chunk code and run the static checks on every chunk."""
+    return [analyze_chunk(chunk) for chunk in chunk_code(code, max_lines)]
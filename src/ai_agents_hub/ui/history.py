@@ -0,0 +1,104 @@
+"""Compact per-agent chat history for the Streamlit UI."""
+
+import re
+import zlib
+from typing import Dict, List, NamedTuple, Optional, Union
+
+CODE_BLOCK = re.compile(r"```[^\n]*\n(.*?)```", re.S)
+
+class HistoryEntry(NamedTuple):
+    """One stored message.
+
+    Short messages keep their content as ``payload`` and have no preview.
+    Long messages keep a zlib-compressed ``payload`` and a ``preview`` that is
+    computed once when the message is stored, so reruns never reprocess them.
+    """
+    role: str
+    payload: Union[str, bytes]
+    preview: Optional[str]
+
+    @property
+    def truncated(self) -> bool:
+        return self.preview is not None
+
+    @property
+    def display(self) -> str:
+        return self.preview if self.preview is not None else self.payload
+
+def make_preview(content: str, max_code_lines: int = 15, max_chars: int = 4000) -> str:
+    """Shorten long code blocks and very long messages for display.
+
+    Args:
+        content: Full markdown content of a message
+        max_code_lines: Lines of each code block kept in the preview
+        max_chars: Length above which the remaining text is cut
+
+    Returns:
+        str: The preview markdown, identical to ``content`` when nothing was cut
+    """
+    def shorten(match):
+        lines = match.group(1).splitlines()
+        if len(lines) <= max_code_lines:
+            return match.group(0)
+        fence = match.group(0).split("\n", 1)[0]
+        kept = "\n".join(lines[:max_code_lines])
+        return f"{fence}\n{kept}\n# ... {len(lines) - max_code_lines} more lines\n```"
+
+    preview = CODE_BLOCK.sub(shorten, content)
+    if len(preview) > max_chars:
+        # Close an unterminated code fence so the rest of the page renders normally.
+        preview = preview[:max_chars]
+        if preview.count("```") % 2:
+            preview += "\n```"
+        preview += "\n\n*... message truncated*"
+    return preview
+
+class ChatHistory:
+    """Chat messages kept separately for each agent.
+
+    Messages with long code blocks or long text are stored compressed next to
+    a precomputed preview, so the cost of a rerun depends on how many
+    messages are displayed rather than on the session length.
+    """
+
+    def __init__(self, max_code_lines: int = 15, max_chars: int = 4000):
+        self.max_code_lines = max_code_lines
+        self.max_chars = max_chars
+        self._entries: Dict[str, List[HistoryEntry]] = {}
+
+    def append(self, agent: str, role: str, content: str):
+        """Store a message in an agent's history."""
+        content = str(content)
+        preview = make_preview(content, self.max_code_lines, self.max_chars)
+        if preview == content:
+            entry = HistoryEntry(role=role, payload=content, preview=None)
+        else:
+            entry = HistoryEntry(role=role, payload=zlib.compress(content.encode("utf-8")), preview=preview)
+        self._entries.setdefault(agent, []).append(entry)
+
+    def count(self, agent: str) -> int:
+        return len(self._entries.get(agent, []))
+
+    def window(self, agent: str, limit: int) -> List[tuple]:
+        """Return the latest ``limit`` messages as (index, entry) pairs, oldest first."""
+        entries = self._entries.get(agent, [])
+        start = max(0, len(entries) - limit)
+        return list(enumerate(entries[start:], start=start))
+
+    def content(self, agent: str, index: int) -> str:
+        """Return the full content of a message, decompressing it if needed."""
+        payload = self._entries[agent][index].payload
+        if isinstance(payload, bytes):
+            return zlib.decompress(payload).decode("utf-8")
+        return payload
+
+    def stored_bytes(self, agent: Optional[str] = None) -> int:
+        """Approximate memory held by message payloads."""
+        agents = [agent] if agent else list(self._entries)
+        return sum(
+            len(entry.payload) + len(entry.preview or "")
+            for name in agents for entry in self._entries.get(name, [])
+        )
+
+    def clear(self, agent: str):
+        self._entries.pop(agent, None)
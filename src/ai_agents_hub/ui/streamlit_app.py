@@ -3,17 +3,38 @@
 import streamlit as st
 from rich.console import Console
 import sys
-import tracemalloc
+import time
+import uuid
 import warnings
+from datetime import datetime
 
-from ai_agents_hub.agents.code_analysis_agent import create_code_analysis_agent
-from ai_agents_hub.agents.code_review_agent import create_code_review_agent
-from ai_agents_hub.agents.knowledge_agent import create_knowledge_agent
-from ai_agents_hub.agents.chat_agent import create_chat_agent, process_chat
-from ai_agents_hub.agents.adaptive_learning_agent import create_adaptive_learning_agent, process_learning
+from ai_agents_hub.agents.knowledge_agent import create_knowledge_agent, process_knowledge_query
+from ai_agents_hub.agents.chat_agent import ChatSession, process_chat
+from ai_agents_hub.agents.adaptive_learning_agent import (
+    Exercise,
+    grade_exercise,
+    load_performance_history,
+    record_performance,
+)
+from ai_agents_hub.agents.background import JOB_HANDLERS, get_job_queue
+from ai_agents_hub.core.coalescing import get_coalescer
+from ai_agents_hub.core.jobs import FAILED
+from ai_agents_hub.core.namespaces import get_namespace_manager, namespace_for
+from ai_agents_hub.core.profiling import profile_request, profiling_enabled_by_default
+from ai_agents_hub.ui.history import ChatHistory
+from ai_agents_hub.core.router import ROUTE_LABELS, extract_code, extract_learning_topic, get_intent_router
 
-# Enable tracemalloc for better resource tracking
-tracemalloc.start()
+# Routed messages below this confidence stay with the chat agent
+AUTO_ROUTE_MIN_CONFIDENCE = 0.6
+
+# Number of history messages rendered per page
+HISTORY_PAGE_SIZE = 20
+
+# Seconds between reruns while background jobs are pending
+JOB_POLL_INTERVAL = 1.5
+
+# Profiles kept per browser session in debug mode
+MAX_PROFILES = 10
 
 # Filter ResourceWarnings about unclosed sockets
 warnings.filterwarnings("ignore", category=ResourceWarning, message="unclosed.*socket")
@@ -25,14 +46,235 @@ sys.stdout = console.file
 def init_session_state():
     """Initialize Streamlit session state."""
     if "agents_initialized" not in st.session_state:
-        st.session_state.messages = []
+        st.session_state.chat_history = ChatHistory()
+        st.session_state.history_limit = {}
+        st.session_state.llm_sessions = {}
+        st.session_state.pending_jobs = {}
         st.session_state.agents_initialized = True
         st.session_state.knowledge_agent_initialized = False
         st.session_state.code_analysis_agent_initialized = False
         st.session_state.code_review_agent_initialized = False
-        st.session_state.chat_agent_initialized = False
         st.session_state.adaptive_learning_initialized = False
         st.session_state.current_student_id = None
+        # Anonymous caller id until a student id is entered
+        st.session_state.session_user = f"session-{uuid.uuid4().hex}"
+        st.session_state.auto_route = True
+        st.session_state.debug_profiling = profiling_enabled_by_default()
+        st.session_state.profiles = []
+        st.session_state.open_exercises = None
+
+def run_profiled(label, fn, *args, **kwargs):
+    """Call an agent function, profiling it when debug profiling is on."""
+    if not st.session_state.get("debug_profiling"):
+        return fn(*args, **kwargs)
+    capture = None
+    try:
+        with profile_request(label) as capture:
+            return fn(*args, **kwargs)
+    finally:
+        if capture is not None and capture.report is not None:
+            st.session_state.profiles = (st.session_state.profiles + [capture])[-MAX_PROFILES:]
+
+def show_profiles():
+    """Show the profiles of recent requests in the sidebar, with downloads."""
+    st.session_state.debug_profiling = st.sidebar.toggle(
+        "Debug profiling",
+        value=st.session_state.get("debug_profiling", False),
+        help="Profile each request with cProfile and tracemalloc (AI_AGENTS_HUB_DEBUG=1 turns it on by default)",
+    )
+    coalescer = get_coalescer()
+    if st.session_state.debug_profiling and coalescer is not None:
+        stats = coalescer.stats()
+        st.sidebar.caption(
+            f"LLM calls: {stats.calls} for {stats.requests} requests "
+            f"({stats.coalesced} shared in this process, {stats.coalesced_shared} with other workers)"
+        )
+    profiles = st.session_state.get("profiles", [])
+    if not st.session_state.debug_profiling or not profiles:
+        return
+    with st.sidebar.expander("Request profiles", expanded=True):
+        index = st.selectbox(
+            "Request",
+            range(len(profiles) - 1, -1, -1),
+            format_func=lambda i: f"{profiles[i].report.started_at:%H:%M:%S} {profiles[i].label}",
+        )
+        capture = profiles[index]
+        report = capture.report
+        st.caption(
+            f"{report.elapsed:.2f}s, peak {report.peak_memory_kb:.0f} KB, "
+            f"retained {report.allocated_kb:.0f} KB"
+            + (" (includes overlapping requests)" if report.overlapped else "")
+            + (f", failed: {report.error}" if report.error else "")
+        )
+        if report.functions_profiled:
+            st.markdown("**Top functions by cumulative time**")
+            st.dataframe([stat.model_dump() for stat in report.top_functions], hide_index=True)
+        else:
+            st.caption("No function profile: another request was being profiled at the same time.")
+        st.markdown("**Top allocation sites**")
+        st.dataframe([stat.model_dump() for stat in report.top_allocations], hide_index=True)
+        name = f"profile-{report.started_at:%Y%m%d-%H%M%S}"
+        if capture.prof_data:
+            st.download_button("Download .prof", capture.prof_data, file_name=f"{name}.prof",
+                               mime="application/octet-stream", key=f"prof_{index}")
+        st.download_button("Download JSON", report.model_dump_json(indent=2), file_name=f"{name}.json",
+                           mime="application/json", key=f"json_{index}")
+
+def get_user_id():
+    """Return the id of the current user: the student id once known, else this browser session."""
+    return st.session_state.get("current_student_id") or st.session_state.session_user
+
+def show_memory_usage():
+    """Show how much of the user's memory quota is used."""
+    usage = get_namespace_manager().usage(namespace_for(get_user_id()))
+    st.sidebar.caption(
+        f"Memory: {usage.items}/{usage.max_items} notes, "
+        f"{usage.bytes / 1024:.0f}/{usage.max_bytes / 1024:.0f} KB"
+    )
+
+def get_llm_session(agent_type):
+    """Return the chat session carrying an agent's Ollama context across reruns."""
+    sessions = st.session_state.llm_sessions
+    if agent_type not in sessions:
+        now = datetime.now()
+        sessions[agent_type] = ChatSession(
+            session_id=uuid.uuid4().hex,
+            messages=[],
+            start_time=now,
+            last_activity=now,
+            metadata={"agent": agent_type}
+        )
+    # The user can change mid-session when a student id is entered
+    sessions[agent_type].namespace = namespace_for(get_user_id())
+    return sessions[agent_type]
+
+def get_or_create_agent(state_key, factory, label):
+    """Return an agent cached in session state, creating it on first use."""
+    if state_key not in st.session_state:
+        with st.spinner(f"Initializing {label}..."):
+            st.session_state[state_key] = factory()
+            st.session_state[f"{state_key}_initialized"] = True
+    return st.session_state[state_key]
+
+def format_learning_results(results):
+    """Render adaptive learning session results as markdown."""
+    sections = [
+        ("assessment", "📊 Current Level"),
+        ("content", "📚 Learning Content"),
+        ("performance", "📈 Performance"),
+        ("adaptation", "🔄 Next Steps"),
+    ]
+    parts = [f"**{title}:** {results[key]}" for key, title in sections if results.get(key)]
+    if results.get("content_source") == "bank":
+        parts.append("*Content served from the content bank*")
+    return "\n\n".join(["**Learning Session Results**"] + parts)
+
+def offer_exercises(results):
+    """Keep the exercises of a learning session so the student can answer them."""
+    if results.get("exercises") and not results.get("error"):
+        st.session_state.open_exercises = {
+            "student_id": results["student_id"],
+            "topic": results["topic"],
+            "exercises": results["exercises"],
+            "shown_at": time.time(),
+        }
+
+def format_result(kind, result):
+    """Render the result of a job handler as a chat message."""
+    if kind == "learning":
+        if result.get("error"):
+            return f"Error during learning session: {result['error']}"
+        return format_learning_results(result)
+    return result
+
+def format_job_result(job):
+    """Render a finished job as a chat message."""
+    if job.status == FAILED:
+        return f"Error processing request: {job.error}"
+    return format_result(job.kind, job.result)
+
+def submit_job(agent_type, kind, payload):
+    """Queue agent work in the background and track it for this session.
+
+    In debug profiling mode the handler runs right away in this thread
+    instead, since cProfile only sees the thread it runs in.
+    """
+    if st.session_state.get("debug_profiling"):
+        try:
+            with st.spinner("Running with profiling..."):
+                raw = run_profiled(agent_type, JOB_HANDLERS[kind], payload)
+            if kind == "learning":
+                offer_exercises(raw)
+            result = format_result(kind, raw)
+        except Exception as e:
+            result = f"Error processing request: {str(e)}"
+        st.session_state.chat_history.append(agent_type, "assistant", result)
+        st.rerun()
+    job_id = get_job_queue().submit(kind, payload)
+    st.session_state.pending_jobs.setdefault(agent_type, []).append(job_id)
+    return job_id
+
+def collect_finished_jobs(agent_type):
+    """Move finished jobs of an agent into its chat history."""
+    queue = get_job_queue()
+    still_pending = []
+    for job_id in st.session_state.pending_jobs.get(agent_type, []):
+        job = queue.get(job_id)
+        if job is None:
+            continue
+        if job.done:
+            if job.kind == "learning" and job.status != FAILED:
+                offer_exercises(job.result)
+            st.session_state.chat_history.append(agent_type, "assistant", format_job_result(job))
+        else:
+            still_pending.append(job_id)
+    st.session_state.pending_jobs[agent_type] = still_pending
+
+def show_pending_jobs(agent_type):
+    """Show the status of an agent's unfinished jobs; returns True if any remain."""
+    queue = get_job_queue()
+    pending = st.session_state.pending_jobs.get(agent_type, [])
+    for job_id in pending:
+        job = queue.get(job_id)
+        if job is not None:
+            st.info(f"Job `{job_id}` is {job.status}. You can leave this page; the result will be kept.")
+    return bool(pending)
+
+def show_job_lookup():
+    """Let users fetch the result of any job by id from the sidebar."""
+    job_id = st.sidebar.text_input("Look up job by id")
+    if not job_id:
+        return
+    job = get_job_queue().get(job_id.strip())
+    if job is None:
+        st.sidebar.warning("No job with this id")
+    elif job.done:
+        st.sidebar.markdown(format_job_result(job))
+    else:
+        st.sidebar.info(f"Job is {job.status}")
+
+def routed_job(route, prompt):
+    """Return the background job kind and payload for a routed message, or None if it is answered inline."""
+    if route == "code_review":
+        return "code_review", {"code": extract_code(prompt), "cascade": st.session_state.get("review_cascade", True)}
+    if route == "code_analysis":
+        return "code_analysis", {"code": extract_code(prompt)}
+    if route == "learning":
+        student_id = get_user_id()
+        return "learning", {
+            "student_id": student_id,
+            "topic": extract_learning_topic(prompt),
+            "llm_evaluation": st.session_state.get("learning_llm_evaluation", False),
+            "history": [metric.model_dump(mode="json") for metric in load_performance_history(student_id)],
+        }
+    return None
+
+def dispatch_routed_message(route, prompt):
+    """Answer a General Chat message with the chat or knowledge agent chosen by the router."""
+    if route == "knowledge":
+        agent = get_or_create_agent("knowledge_agent", create_knowledge_agent, "Knowledge Agent")
+        return process_knowledge_query(prompt, get_llm_session("Knowledge Agent"), agent=agent).content
+    return process_chat(prompt, get_llm_session("General Chat")).content
 
 def handle_knowledge_agent():
     """Handle Knowledge Agent interactions."""
@@ -48,141 +290,117 @@ def handle_knowledge_agent():
     prompt = st.chat_input("Ask a question...")
     
     if prompt:
-        st.session_state.messages.append({"role": "user", "content": prompt})
+        st.session_state.chat_history.append("Knowledge Agent", "user", prompt)
         with st.chat_message("user"):
             st.markdown(prompt)
 
         with st.chat_message("assistant"):
             try:
                 with st.spinner("Processing your question..."):
-                    response = st.session_state.knowledge_agent.start(prompt)
+                    response = run_profiled(
+                        "Knowledge Agent", process_knowledge_query,
+                        prompt, get_llm_session("Knowledge Agent"), agent=st.session_state.knowledge_agent
+                    ).content
                 st.markdown(response)
-                st.session_state.messages.append({"role": "assistant", "content": response})
+                st.session_state.chat_history.append("Knowledge Agent", "assistant", response)
             except Exception as e:
                 error_msg = f"Error processing request: {str(e)}"
                 st.error(error_msg)
-                st.session_state.messages.append({"role": "assistant", "content": error_msg})
+                st.session_state.chat_history.append("Knowledge Agent", "assistant", error_msg)
 
 def handle_code_analysis():
     """Handle Code Analysis Agent interactions."""
-    if not st.session_state.get("code_analysis_agent_initialized"):
-        with st.spinner("Initializing Code Analysis Agent..."):
-            try:
-                st.session_state.code_analysis_agent = create_code_analysis_agent()
-                st.session_state.code_analysis_agent_initialized = True
-            except Exception as e:
-                st.error(f"Error initializing Code Analysis Agent: {str(e)}")
-                st.stop()
-
     st.subheader("Code Analysis")
     code_input = st.text_area("Paste your code here for analysis", height=200)
     analyze_button = st.button("Analyze Code")
     
     if analyze_button and code_input:
-        st.session_state.messages.append({"role": "user", "content": "Analyzing code:\n```\n" + code_input + "\n```"})
-        with st.chat_message("user"):
-            st.markdown("Analyzing code...")
-
-        with st.chat_message("assistant"):
-            try:
-                with st.spinner("Analyzing code..."):
-                    response = st.session_state.code_analysis_agent.start(
-                        f"""Please analyze this code and provide a detailed report:
-                        ```
-                        {code_input}
-                        ```
-                        """
-                    )
-                st.markdown(response)
-                st.session_state.messages.append({"role": "assistant", "content": response})
-            except Exception as e:
-                error_msg = f"Error analyzing code: {str(e)}"
-                st.error(error_msg)
-                st.session_state.messages.append({"role": "assistant", "content": error_msg})
+        st.session_state.chat_history.append("Code Analysis", "user", "Analyzing code:\n```\n" + code_input + "\n```")
+        submit_job("Code Analysis", "code_analysis", {"code": code_input})
 
 def handle_code_review():
     """Handle Code Review Agent interactions."""
-    if not st.session_state.get("code_review_agent_initialized"):
-        with st.spinner("Initializing Code Review Agent..."):
-            try:
-                st.session_state.code_review_agent = create_code_review_agent()
-                st.session_state.code_review_agent_initialized = True
-            except Exception as e:
-                st.error(f"Error initializing Code Review Agent: {str(e)}")
-                st.stop()
-
     st.subheader("Code Review")
     code_input = st.text_area("Paste your code here for review", height=200)
+    st.session_state.review_cascade = st.checkbox(
+        "Fast review (small model first, escalate risky code)",
+        value=st.session_state.get("review_cascade", True),
+    )
     review_button = st.button("Review Code")
     
     if review_button and code_input:
-        st.session_state.messages.append({"role": "user", "content": "Reviewing code:\n```\n" + code_input + "\n```"})
-        with st.chat_message("user"):
-            st.markdown("Reviewing code...")
-
-        with st.chat_message("assistant"):
-            try:
-                with st.spinner("Reviewing code..."):
-                    response = st.session_state.code_review_agent.start(
-                        f"""Please review this code and provide detailed feedback:
-                        ```
-                        {code_input}
-                        ```
-                        Focus on:
-                        1. Code quality and style
-                        2. Potential bugs and issues
-                        3. Security concerns
-                        4. Performance improvements
-                        5. Best practices
-                        """
-                    )
-                st.markdown(response)
-                st.session_state.messages.append({"role": "assistant", "content": response})
-            except Exception as e:
-                error_msg = f"Error reviewing code: {str(e)}"
-                st.error(error_msg)
-                st.session_state.messages.append({"role": "assistant", "content": error_msg})
+        st.session_state.chat_history.append("Code Review", "user", "Reviewing code:\n```\n" + code_input + "\n```")
+        submit_job("Code Review", "code_review", {"code": code_input, "cascade": st.session_state.review_cascade})
 
 def handle_chat_agent():
     """Handle Chat Agent interactions."""
-    if not st.session_state.get("chat_agent_initialized"):
-        with st.spinner("Initializing Chat Agent..."):
-            try:
-                st.session_state.chat_agent = create_chat_agent()
-                st.session_state.chat_agent_initialized = True
-            except Exception as e:
-                st.error(f"Error initializing Chat Agent: {str(e)}")
-                st.stop()
-
     prompt = st.chat_input("Type your message here...")
     
     if prompt:
-        st.session_state.messages.append({"role": "user", "content": prompt})
+        st.session_state.chat_history.append("General Chat", "user", prompt)
         with st.chat_message("user"):
             st.markdown(prompt)
 
         with st.chat_message("assistant"):
             try:
-                with st.spinner("Thinking..."):
-                    response = process_chat(prompt).content
-                st.markdown(response)
-                st.session_state.messages.append({"role": "assistant", "content": response})
+                route = "chat"
+                if st.session_state.get("auto_route", True):
+                    decision = get_intent_router().route(prompt)
+                    if decision.route != "chat" and decision.confidence >= AUTO_ROUTE_MIN_CONFIDENCE:
+                        route = decision.route
+                        st.caption(
+                            f"Routed to {ROUTE_LABELS[route]} ({decision.reason}, "
+                            f"confidence {decision.confidence:.2f}, {decision.elapsed_ms:.1f} ms)"
+                        )
+                job = routed_job(route, prompt)
+                if job is not None:
+                    # Reviews, analyses and learning sessions run as jobs, as on their own pages
+                    submit_job("General Chat", *job)
+                else:
+                    with st.spinner("Thinking..."):
+                        response = run_profiled(f"General Chat ({route})", dispatch_routed_message, route, prompt)
+                    st.markdown(response)
+                    st.session_state.chat_history.append("General Chat", "assistant", response)
             except Exception as e:
                 error_msg = f"Error processing request: {str(e)}"
                 st.error(error_msg)
-                st.session_state.messages.append({"role": "assistant", "content": error_msg})
+                st.session_state.chat_history.append("General Chat", "assistant", error_msg)
+
+def grade_open_exercises(answers):
+    """Grade the answered exercises, keep them in the student's history and report the scores."""
+    pending = st.session_state.open_exercises
+    elapsed = int(time.time() - pending["shown_at"])
+    lines = []
+    for number, (exercise, answer) in enumerate(zip(pending["exercises"], answers), 1):
+        if not answer.strip():
+            continue
+        exercise = Exercise(**exercise)
+        metric = grade_exercise(exercise, answer, pending["topic"], completion_time=elapsed)
+        record_performance(pending["student_id"], metric)
+        lines.append(f"{number}. {metric.score:.0%}, {metric.feedback}; expected: {exercise.answer}")
+    st.session_state.open_exercises = None
+    if lines:
+        st.session_state.chat_history.append(
+            "Adaptive Learning", "assistant", "**Exercise results**\n\n" + "\n".join(lines)
+        )
+
+def show_open_exercises(student_id):
+    """Let the student answer the exercises of their latest session."""
+    pending = st.session_state.get("open_exercises")
+    if not pending or pending["student_id"] != student_id:
+        return
+    with st.form("exercises"):
+        st.markdown(f"**Exercises on {pending['topic']}**")
+        answers = [
+            st.text_input(exercise["question"], key=f"answer_{pending['shown_at']}_{i}")
+            for i, exercise in enumerate(pending["exercises"])
+        ]
+        if st.form_submit_button("Submit answers"):
+            grade_open_exercises(answers)
+            st.rerun()
 
 def handle_adaptive_learning():
     """Handle Adaptive Learning Agent interactions."""
-    if not st.session_state.get("adaptive_learning_initialized"):
-        with st.spinner("Initializing Adaptive Learning Agent..."):
-            try:
-                st.session_state.adaptive_learning_agent = create_adaptive_learning_agent()
-                st.session_state.adaptive_learning_initialized = True
-            except Exception as e:
-                st.error(f"Error initializing Adaptive Learning Agent: {str(e)}")
-                st.stop()
-    
     # Student ID input
     if not st.session_state.current_student_id:
         student_id = st.text_input("Enter Student ID:")
@@ -192,53 +410,53 @@ def handle_adaptive_learning():
     if st.session_state.current_student_id:
         # Topic selection
         topic = st.text_input("Enter Learning Topic:")
+        st.session_state.learning_llm_evaluation = st.checkbox(
+            "Evaluate with the assessor, evaluator and adapter agents (slower)",
+            value=st.session_state.get("learning_llm_evaluation", False),
+        )
         
         if topic:
             if st.button("Start Learning Session"):
-                with st.spinner("Processing learning session..."):
-                    try:
-                        results = process_learning(st.session_state.current_student_id, topic)
-                        
-                        # Display results in an organized way
-                        st.subheader("Learning Session Results")
-                        
-                        # Assessment
-                        if results.get("assessment"):
-                            st.write("📊 Current Level:", results["assessment"])
-                        
-                        # Content
-                        if results.get("content"):
-                            st.write("📚 Learning Content:", results["content"])
-                        
-                        # Performance
-                        if results.get("performance"):
-                            st.write("📈 Performance:", results["performance"])
-                        
-                        # Adaptation
-                        if results.get("adaptation"):
-                            st.write("🔄 Next Steps:", results["adaptation"])
-                        
-                        # Error handling
-                        if results.get("error"):
-                            st.error(f"Error during learning session: {results['error']}")
-                        
-                        # Add to message history
-                        message = f"""Learning Session Summary:
-                        Topic: {topic}
-                        Level: {results.get('assessment', 'N/A')}
-                        Performance: {results.get('performance', 'N/A')}
-                        Next Steps: {results.get('adaptation', 'N/A')}
-                        """
-                        st.session_state.messages.append({"role": "assistant", "content": message})
-                        
-                    except Exception as e:
-                        st.error(f"Error during learning session: {str(e)}")
+                st.session_state.chat_history.append(
+                    "Adaptive Learning", "user", f"Start learning session on {topic}"
+                )
+                student_id = st.session_state.current_student_id
+                submit_job("Adaptive Learning", "learning", {
+                    "student_id": student_id,
+                    "topic": topic,
+                    "llm_evaluation": st.session_state.learning_llm_evaluation,
+                    "history": [metric.model_dump(mode="json") for metric in load_performance_history(student_id)]
+                })
+        
+        show_open_exercises(st.session_state.current_student_id)
         
         # Option to reset student
         if st.button("Change Student"):
             st.session_state.current_student_id = None
             st.rerun()
 
+def display_chat_history(agent_type):
+    """Render the latest messages of one agent's history.
+
+    Only a window of recent messages is rendered; older ones are loaded a page
+    at a time, and long messages show a precomputed preview until expanded.
+    """
+    history = st.session_state.chat_history
+    limit = st.session_state.history_limit.get(agent_type, HISTORY_PAGE_SIZE)
+    hidden = history.count(agent_type) - limit
+    if hidden > 0:
+        if st.button(f"Load {min(hidden, HISTORY_PAGE_SIZE)} older messages ({hidden} hidden)", key=f"older_{agent_type}"):
+            st.session_state.history_limit[agent_type] = limit + HISTORY_PAGE_SIZE
+            st.rerun()
+    for index, entry in history.window(agent_type, limit):
+        with st.chat_message(entry.role):
+            if entry.truncated and st.session_state.get(f"full_{agent_type}_{index}"):
+                st.markdown(history.content(agent_type, index))
+            else:
+                st.markdown(entry.display)
+            if entry.truncated:
+                st.toggle("Show full message", key=f"full_{agent_type}_{index}")
+
 def main():
     """Main application entry point."""
     st.title("AI Agents Hub")
@@ -251,12 +469,19 @@ def main():
         ["General Chat", "Knowledge Agent", "Code Analysis", "Code Review", "Adaptive Learning"],
         index=0  # Make General Chat the default
     )
+    if agent_type == "General Chat":
+        st.session_state.auto_route = st.sidebar.toggle(
+            "Route to specialized agents",
+            value=st.session_state.get("auto_route", True),
+            help="Send code, document questions and learning requests to the matching agent",
+        )
 
-    # Display chat history
-    if "messages" in st.session_state:
-        for message in st.session_state.messages:
-            with st.chat_message(message["role"]):
-                st.markdown(message["content"])
+    show_job_lookup()
+    show_memory_usage()
+    show_profiles()
+
+    collect_finished_jobs(agent_type)
+    display_chat_history(agent_type)
 
     # Handle different agent types
     if agent_type == "General Chat":
@@ -270,5 +495,9 @@ def main():
     else:  # Adaptive Learning
         handle_adaptive_learning()
 
+    if show_pending_jobs(agent_type):
+        time.sleep(JOB_POLL_INTERVAL)
+        st.rerun()
+
 if __name__ == "__main__":
     main()
@@ -18,13 +18,13 @@ class TestAgents(unittest.TestCase):
         """Test code analysis agent creation."""
         agent = create_code_analysis_agent()
         self.assertIsNotNone(agent)
-        self.assertEqual(agent.name, "Code Analysis Agent")
+        self.assertEqual(agent.name, "Code Analysis Expert")
     
     def test_code_review_agent_creation(self):
         """Test code review agent creation."""
         agent = create_code_review_agent()
         self.assertIsNotNone(agent)
-        self.assertEqual(agent.name, "Code Review Agent")
+        self.assertEqual(agent.name, "Code Review Expert")
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,110 @@
+"""Test cases for the sharded batch code analysis runner."""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from ai_agents_hub.agents.batch_analysis import (
+    ResultCache,
+    analyze_repository,
+    llm_cache_key,
+    make_shards,
+    pre_analyze,
+)
+
+FILES = {
+    "app/service.py": '''import subprocess
+
+def run(cmd):
+    """Run a command."""
+    subprocess.run(cmd, shell=True)
+
+def choose(a, b, c):
+    if a and b:
+        return 1
+    elif c:
+        for _ in range(3):
+            if a:
+                return 2
+    return 3
+''',
+    "app/utils.py": 'def add(a, b):\n    """Add two numbers."""\n    return a + b\n',
+    "tests/test_utils.py": "def test_add():\n    assert 1 + 1 == 2\n",
+    "web/app.js": "function f(x) { if (x && x.y) { return 1; } return 0; }\n",
+    "node_modules/lib/index.js": "eval('ignored')\n",
+}
+
+def make_repo():
+    root = Path(tempfile.mkdtemp())
+    for relative_path, text in FILES.items():
+        path = root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return root
+
+class TestBatchAnalysis(unittest.TestCase):
+    """Test cases for pre-analysis, sharding and aggregation."""
+
+    def test_shards_are_balanced(self):
+        """Test that shards get similar total sizes."""
+        sizes = {f"f{i}": size for i, size in enumerate([90, 50, 40, 30, 20, 10, 10])}
+        shards = make_shards(sizes, 2)
+        loads = sorted(sum(sizes[path] for path in shard) for shard in shards)
+        self.assertLessEqual(loads[1] - loads[0], 10)
+        self.assertEqual(sorted(path for shard in shards for path in shard), sorted(sizes))
+
+    def test_pre_analysis_metrics(self):
+        """Test function, docstring, complexity and finding extraction."""
+        analysis = pre_analyze("app/service.py", FILES["app/service.py"])
+        self.assertEqual(analysis.functions, 2)
+        self.assertEqual(analysis.documented_functions, 1)
+        self.assertEqual(analysis.max_complexity, 6)
+        self.assertEqual(analysis.imports, ["subprocess"])
+        self.assertIn("Shell command execution", [f.description for f in analysis.findings])
+        self.assertFalse(analysis.is_test)
+        self.assertTrue(pre_analyze("tests/test_utils.py", FILES["tests/test_utils.py"]).is_test)
+
+    def test_repository_report(self):
+        """Test that a pool run aggregates files into a report with hotspots."""
+        root, cache_dir = make_repo(), tempfile.mkdtemp()
+        analysis = analyze_repository(root, workers=2, top_n=2, cache_dir=cache_dir)
+        self.assertEqual([f.path for f in analysis.files],
+                         ["app/service.py", "app/utils.py", "tests/test_utils.py", "web/app.js"])
+        self.assertEqual(analysis.hotspots[0].path, "app/service.py")
+        self.assertIn("1 high-severity finding", analysis.hotspots[0].reasons)
+        report = analysis.report
+        self.assertEqual(report.complexity_metrics["files"], 4)
+        self.assertEqual(report.documentation_quality, 50)
+        self.assertIn("Python", report.tech_stack)
+        self.assertTrue(any("shell" in risk.lower() for risk in report.potential_risks))
+
+    def test_cache_is_reused(self):
+        """Test that a second run is served from the cache, LLM reports included."""
+        root, cache_dir = make_repo(), tempfile.mkdtemp()
+        first = analyze_repository(root, workers=1, cache_dir=cache_dir)
+        self.assertEqual(first.cache_hits, 0)
+        # A cached model report means no agent is needed for the hotspot
+        service = next(f for f in first.files if f.path == "app/service.py")
+        ResultCache(Path(cache_dir)).put(llm_cache_key(service.sha256), {"report": "Split run() out."})
+        second = analyze_repository(root, workers=1, cache_dir=cache_dir, llm_files=1)
+        self.assertEqual(second.cache_hits, 4)
+        self.assertEqual(next(f for f in second.files if f.path == "app/service.py").llm_report, "Split run() out.")
+        self.assertIn("app/service.py: Split run() out.", second.report.recommendations)
+
+    def test_cache_keys_follow_language_and_model(self):
+        """Test that identical content under another suffix, or another model, is not served from the cache."""
+        root, cache_dir = Path(tempfile.mkdtemp()), tempfile.mkdtemp()
+        (root / "pkg").mkdir()
+        (root / "web").mkdir()
+        (root / "pkg" / "__init__.py").write_text("")
+        (root / "web" / "index.ts").write_text("")
+        analysis = analyze_repository(root, workers=1, cache_dir=cache_dir)
+        self.assertEqual({f.path: f.language for f in analysis.files},
+                         {"pkg/__init__.py": "Python", "web/index.ts": "TypeScript"})
+        key = llm_cache_key("abc")
+        with mock.patch("ai_agents_hub.agents.batch_analysis.ANALYSIS_MODEL", "another-model"):
+            self.assertNotEqual(llm_cache_key("abc"), key)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""Test cases for the benchmark harness and stand-in Ollama server."""
+
+import json
+import unittest
+import urllib.request
+
+from benchmarks.fake_ollama import FakeOllamaConfig, FakeOllamaServer
+from benchmarks.harness import BenchmarkResult, find_regressions, measure, percentile
+from benchmarks.load_test import (
+    LoadRun,
+    StepTiming,
+    assign_scripts,
+    format_load_results,
+    parse_mix,
+    run_sessions,
+    summarize,
+)
+
+def post_json(url, payload):
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode("utf-8"), headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+class TestFakeOllamaServer(unittest.TestCase):
+    """Test cases for the deterministic stand-in server."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeOllamaServer(FakeOllamaConfig(response_tokens=8, embedding_dims=16)).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_openai_chat_is_deterministic(self):
+        """Test that identical chat requests produce identical completions."""
+        payload = {"model": "deepseek-r1:1.5b", "messages": [{"role": "user", "content": "hello"}]}
+        first = post_json(f"{self.server.openai_url}/chat/completions", payload)
+        second = post_json(f"{self.server.openai_url}/chat/completions", payload)
+        self.assertEqual(first["choices"][0]["message"]["content"], second["choices"][0]["message"]["content"])
+        self.assertEqual(first["usage"]["completion_tokens"], 8)
+
+    def test_embeddings_have_configured_dimensions(self):
+        """Test native embedding responses."""
+        response = post_json(f"{self.server.url}/api/embeddings", {"model": "nomic-embed-text", "prompt": "some text"})
+        self.assertEqual(len(response["embedding"]), 16)
+
+    def test_generate_returns_growing_context(self):
+        """Test that generate responses carry a context for the next turn."""
+        first = post_json(f"{self.server.url}/api/generate", {"model": "m", "prompt": "one two", "stream": False})
+        second = post_json(f"{self.server.url}/api/generate", {
+            "model": "m", "prompt": "three", "context": first["context"], "stream": False,
+        })
+        self.assertEqual(second["prompt_eval_count"], 1)
+        self.assertGreater(len(second["context"]), len(first["context"]))
+
+class TestHarness(unittest.TestCase):
+    """Test cases for timing and regression detection."""
+
+    def test_measure_collects_samples(self):
+        """Test that warmup calls are not recorded."""
+        calls = []
+        result = measure("noop", lambda: calls.append(1), repeat=3, warmup=2)
+        self.assertEqual(len(calls), 5)
+        self.assertEqual(result.stats()["n"], 3)
+
+    def test_measure_captures_errors(self):
+        """Test that a failing benchmark reports its error."""
+        result = measure("broken", lambda: 1 / 0, repeat=1)
+        self.assertIn("ZeroDivisionError", result.error)
+
+    def test_find_regressions(self):
+        """Test regression detection against the latest recorded run."""
+        history = [{"results": [{"key": "case", "stats": {"median": 1.0}}]}]
+        slower = BenchmarkResult(name="case", samples=[1.5, 1.5, 1.5])
+        similar = BenchmarkResult(name="case", samples=[1.05])
+        self.assertEqual(len(find_regressions([slower], history)), 1)
+        self.assertEqual(find_regressions([similar], history), [])
+
+    def test_regressions_only_compare_the_same_server_config(self):
+        """Test that runs against a differently configured server are not baselines."""
+        fast = {"server": {"latency": 0.0, "stats": {"requests": 3}},
+                "results": [{"key": "case", "stats": {"median": 1.0}}]}
+        slower = BenchmarkResult(name="case", samples=[1.5])
+        same = {"server": {"latency": 0.0, "stats": {"requests": 9}}}
+        self.assertEqual(len(find_regressions([slower], [fast], metadata=same)), 1)
+        self.assertEqual(find_regressions([slower], [fast], metadata={"server": {"latency": 0.5}}), [])
+
+    def test_percentile_uses_exact_ranks(self):
+        """Test nearest-rank percentiles where pct * n is a whole number."""
+        self.assertEqual(percentile(list(range(1, 11)), 50), 5)
+        self.assertEqual(percentile(list(range(1, 21)), 95), 19)
+        self.assertEqual(percentile(list(range(1, 11)), 100), 10)
+        self.assertEqual(percentile(list(range(1, 11)), 0), 1)
+        self.assertEqual(percentile(list(range(1, 101)), 7), 7)
+        self.assertEqual(percentile(list(range(1, 1001)), 99.9), 999)
+
+class TestLoadTest(unittest.TestCase):
+    """Test cases for the concurrent-session load generator."""
+
+    def test_scripts_follow_the_mix(self):
+        """Test that sessions get scripts in proportion to their weights."""
+        scripts = assign_scripts(9, parse_mix(["chat=2", "review"]))
+        self.assertEqual(scripts.count("chat"), 6)
+        self.assertEqual(scripts.count("review"), 3)
+        with self.assertRaises(ValueError):
+            parse_mix(["gossip=1"])
+
+    def test_summary_reports_percentiles_errors_and_memory(self):
+        """Test the per-operation summary of a run."""
+        timings = [StepTiming(0, "chat", "chat", 0.0, i / 100) for i in range(1, 101)]
+        timings.append(StepTiming(1, "review", "review", 0.0, 0.5, error="RuntimeError: down"))
+        run = LoadRun(sessions=2, wall_time=10.0, baseline_rss_kb=1000, peak_rss_kb=3000, timings=timings,
+                      coalesced=3)
+        results = {result.params["operation"]: result for result in summarize(run)}
+        chat = results["chat"].extra
+        self.assertEqual((chat["p50_ms"], chat["p95_ms"], chat["p99_ms"]), (500.0, 950.0, 990.0))
+        self.assertEqual(chat["throughput"], 10.0)
+        self.assertEqual(results["review"].error, "RuntimeError: down")
+        self.assertEqual(results["all"].extra["errors"], 1)
+        self.assertEqual(results["all"].extra["memory_per_session_kb"], 1000.0)
+        self.assertEqual(results["all"].extra["coalesced"], 3)
+        self.assertIn("coalesced: 3 requests", format_load_results(list(results.values())))
+
+    def test_chat_sessions_run_concurrently(self):
+        """Test a small run of chat sessions against the stand-in server."""
+        with FakeOllamaServer(FakeOllamaConfig(latency=0.05, response_tokens=4)) as server:
+            run = run_sessions(4, {"chat": 1}, think_time=0, ramp_up=0, ollama_url=server.url)
+        self.assertEqual(len(run.timings), 16)
+        self.assertFalse([timing.error for timing in run.timings if timing.error])
+        # Four sessions of four 50 ms turns overlap instead of taking 16 turns in a row
+        self.assertLess(run.wall_time, 16 * 0.05)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Test cases for context reuse across chat turns."""
+
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from ai_agents_hub.agents.chat_agent import ChatSession, process_chat, turn_prompt
+from ai_agents_hub.core.namespaces import NamespaceManager
+from ai_agents_hub.core.ollama import OllamaClient
+from benchmarks.fake_ollama import FakeOllamaConfig, FakeOllamaServer
+
+def new_session():
+    now = datetime.now()
+    return ChatSession(session_id="test", messages=[], start_time=now, last_activity=now, metadata={})
+
+class TestChatSession(unittest.TestCase):
+    """Test cases for process_chat with a session."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeOllamaServer(FakeOllamaConfig(response_tokens=5)).start()
+        cls.client = OllamaClient(base_url=cls.server.url)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_only_new_tokens_are_prefilled(self):
+        """Test that later turns send just the new message with the context."""
+        session = new_session()
+        first = process_chat("hello there", session, client=self.client)
+        second = process_chat("and again", session, client=self.client)
+        self.assertGreater(int(first.context["prompt_eval_count"]), 100)
+        self.assertEqual(int(second.context["prompt_eval_count"]), 2)
+        self.assertEqual([m.type for m in session.messages], ["user", "assistant", "user", "assistant"])
+
+    def test_context_grows_append_only(self):
+        """Test that each turn extends the previous context."""
+        session = new_session()
+        process_chat("one", session, client=self.client)
+        previous = list(session.llm_context)
+        process_chat("two", session, client=self.client)
+        self.assertEqual(session.llm_context[:len(previous)], previous)
+
+    def test_context_restarts_past_the_budget(self):
+        """Test that an oversized context is replaced by the latest messages."""
+        session = new_session()
+        for i in range(3):
+            process_chat(f"message {i}", session, client=self.client)
+        session.llm_context = list(range(5000))
+        prompt, _ = turn_prompt(session, "next")
+        self.assertIsNone(session.llm_context)
+        self.assertIn("message 2", prompt)
+        self.assertTrue(prompt.endswith("user: next"))
+        session.llm_context = list(range(5000))
+        process_chat("next", session, client=self.client)
+        self.assertLess(len(session.llm_context), 1000)
+
+    def test_recalled_notes_are_sent_once(self):
+        """Test that notes from earlier sessions are not repeated on later turns."""
+        with tempfile.TemporaryDirectory() as tmp:
+            memory = NamespaceManager(root=Path(tmp))
+            memory.remember("user-1", "the project database is PostgreSQL", kind="chat", source="earlier")
+            session = new_session()
+            session.namespace = "user-1"
+            first, notes = turn_prompt(session, "which database does the project use?", memory)
+            session.notes_in_context.extend(notes)
+            second, _ = turn_prompt(session, "which database does the project use again?", memory)
+            session.llm_context = list(range(5000))
+            restarted, _ = turn_prompt(session, "which database does the project use?", memory)
+            memory.close()
+        self.assertIn("PostgreSQL", first)
+        self.assertNotIn("PostgreSQL", second)
+        self.assertIn("PostgreSQL", restarted)
+
+    def test_notes_of_a_failed_turn_are_sent_again(self):
+        """Test that notes only count as sent once the model call succeeded."""
+        with tempfile.TemporaryDirectory() as tmp:
+            memory = NamespaceManager(root=Path(tmp))
+            memory.remember("user-1", "the project database is PostgreSQL", kind="chat", source="earlier")
+            session = new_session()
+            session.namespace = "user-1"
+            with self.assertRaises(Exception):
+                process_chat("which database does the project use?", session,
+                             client=OllamaClient(base_url="http://127.0.0.1:9", timeout=1), memory=memory)
+            self.assertEqual(session.notes_in_context, [])
+            process_chat("which database does the project use?", session, client=self.client, memory=memory)
+            memory.close()
+        self.assertEqual(session.notes_in_context, ["the project database is PostgreSQL"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+"""Test cases for coalescing identical in-flight requests."""
+
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from ai_agents_hub.core.coalescing import FlightStore, SingleFlight, request_key, run_agent
+from ai_agents_hub.core.ollama import OllamaClient
+from benchmarks.fake_ollama import FakeOllamaConfig, FakeOllamaServer
+
+def run_concurrently(n, target):
+    results = [None] * n
+    errors = [None] * n
+
+    def worker(i):
+        try:
+            results[i] = target(i)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+class SlowCall:
+    """Streams a few pieces slowly and counts how often it runs."""
+
+    def __init__(self, pieces=("a", "b", "c"), delay=0.05, error=None):
+        self.pieces = pieces
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, emit):
+        self.calls += 1
+        for piece in self.pieces:
+            time.sleep(self.delay)
+            emit(piece)
+        if self.error:
+            raise self.error
+        return "".join(self.pieces)
+
+class HistoryAgent:
+    """Agent stand-in that resends and extends its chat history like praisonaiagents agents."""
+    name, llm, instructions = "Reviewer", "m", "Review code."
+    calls = 0
+
+    def __init__(self, history=()):
+        self.chat_history = list(history)
+
+    def start(self, prompt):
+        HistoryAgent.calls += 1
+        time.sleep(0.05)
+        reply = f"reply {len(self.chat_history)}"
+        self.chat_history.extend([{"role": "user", "content": prompt}, {"role": "assistant", "content": reply}])
+        return reply
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for in-process coalescing."""
+
+    def test_identical_requests_share_one_call(self):
+        """Test that concurrent callers get one call's result and streamed pieces."""
+        flight, call = SingleFlight(), SlowCall()
+        streams = [[] for _ in range(5)]
+        results, errors = run_concurrently(5, lambda i: flight.run("key", call, on_token=streams[i].append))
+        self.assertEqual(call.calls, 1)
+        self.assertEqual(results, ["abc"] * 5)
+        self.assertEqual(errors, [None] * 5)
+        self.assertEqual(streams, [["a", "b", "c"]] * 5)
+        stats = flight.stats()
+        self.assertEqual((stats.requests, stats.calls, stats.coalesced), (5, 1, 4))
+
+    def test_late_joiner_gets_replay(self):
+        """Test that a caller joining mid-stream receives the earlier pieces first."""
+        flight, call = SingleFlight(), SlowCall(delay=0.1)
+        leader = threading.Thread(target=flight.run, args=("key", call))
+        leader.start()
+        time.sleep(0.15)
+        pieces = []
+        self.assertEqual(flight.run("key", call, on_token=pieces.append), "abc")
+        leader.join()
+        self.assertEqual((call.calls, pieces), (1, ["a", "b", "c"]))
+
+    def test_errors_reach_every_caller(self):
+        """Test that a failing call fails all of its callers."""
+        flight, call = SingleFlight(), SlowCall(error=RuntimeError("model down"))
+        _, errors = run_concurrently(3, lambda i: flight.run("key", call))
+        self.assertEqual(call.calls, 1)
+        self.assertTrue(all(isinstance(error, RuntimeError) for error in errors))
+
+    def test_nothing_is_cached(self):
+        """Test that different keys and later requests make their own calls."""
+        flight, call = SingleFlight(), SlowCall(delay=0)
+        flight.run("one", call)
+        flight.run("one", call)
+        flight.run("two", call)
+        self.assertEqual(call.calls, 3)
+
+    def test_keys_ignore_trailing_whitespace(self):
+        """Test prompt normalization in request keys."""
+        self.assertEqual(request_key("agent", prompt="review this  \n"), request_key("agent", prompt="review this"))
+        self.assertNotEqual(request_key("agent", prompt="a"), request_key("agent", prompt="b"))
+
+    def test_agents_with_different_histories_are_not_merged(self):
+        """Test that run_agent only shares calls between agents with the same chat history."""
+        flight = SingleFlight()
+        HistoryAgent.calls = 0
+        earlier = [{"role": "user", "content": "my code"}, {"role": "assistant", "content": "my review"}]
+        agents = [HistoryAgent(), HistoryAgent(earlier)]
+        results, errors = run_concurrently(2, lambda i: run_agent(agents[i], "review this", coalescer=flight))
+        self.assertEqual((HistoryAgent.calls, errors), (2, [None, None]))
+        self.assertEqual(results, ["reply 0", "reply 2"])
+
+        HistoryAgent.calls = 0
+        agents = [HistoryAgent(), HistoryAgent()]
+        results, _ = run_concurrently(2, lambda i: run_agent(agents[i], "review this", coalescer=flight))
+        self.assertEqual((HistoryAgent.calls, results), (1, ["reply 0", "reply 0"]))
+        self.assertEqual(agents[0].chat_history, agents[1].chat_history)
+
+class TestSharedFlights(unittest.TestCase):
+    """Test cases for coalescing across workers through the flight store."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "inflight.sqlite3"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_workers_share_one_call(self):
+        """Test that a second worker follows the first worker's call."""
+        workers = [SingleFlight(FlightStore(self.path), poll_interval=0.01, publish_interval=0) for _ in range(2)]
+        call = SlowCall()
+        streams = [[], []]
+        results, errors = run_concurrently(
+            2, lambda i: (time.sleep(0.02 * i), workers[i].run("key", call, on_token=streams[i].append))[1]
+        )
+        self.assertEqual(errors, [None, None])
+        self.assertEqual(call.calls, 1)
+        self.assertEqual(results, ["abc", "abc"])
+        self.assertEqual("".join(streams[1]), "abc")
+        self.assertEqual(workers[1].stats().coalesced_shared, 1)
+
+    def test_abandoned_call_is_taken_over(self):
+        """Test that a call whose worker stopped sending heartbeats is run again."""
+        store = FlightStore(self.path, stale_after=0.1)
+        store.join("key", "crashed-worker")
+        time.sleep(0.15)
+        call = SlowCall(delay=0)
+        self.assertEqual(SingleFlight(store).run("key", call), "abc")
+        self.assertEqual(call.calls, 1)
+
+class TestOllamaClientCoalescing(unittest.TestCase):
+    """Test cases for coalesced generate calls."""
+
+    def test_identical_generations_hit_the_server_once(self):
+        """Test that concurrent identical prompts make one request to the server."""
+        with FakeOllamaServer(FakeOllamaConfig(latency=0.1, response_tokens=8)) as server:
+            client = OllamaClient(base_url=server.url, coalescer=SingleFlight())
+            results, errors = run_concurrently(4, lambda i: client.generate("m", "What is retrieval?"))
+            requests = server.stats.get("requests:m")
+        self.assertEqual(errors, [None] * 4)
+        self.assertEqual(requests, 1)
+        self.assertEqual(len({result.text for result in results}), 1)
+        self.assertIsNot(results[0].context, results[1].context)
+
+if __name__ == '__main__':
+    unittest.main()
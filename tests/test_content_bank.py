@@ -0,0 +1,102 @@
+"""Test cases for the learning content bank."""
+
+import sqlite3
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from ai_agents_hub.agents.adaptive_learning_agent import LearningContent, process_learning
+from ai_agents_hub.core.content_bank import ContentBank
+from ai_agents_hub.core.namespaces import NamespaceManager
+
+class LockedBank:
+    """Content bank stand-in whose database is locked."""
+
+    def lookup(self, topic, difficulty, content_type):
+        raise sqlite3.OperationalError("database is locked")
+
+    def add(self, content):
+        raise sqlite3.OperationalError("database is locked")
+
+def make_content(topic, difficulty="beginner", text="material"):
+    return LearningContent(
+        topic=topic, difficulty=difficulty, content_type="lesson",
+        materials=[text], exercises=[], estimated_duration=5
+    )
+
+class TestContentBank(unittest.TestCase):
+    """Test cases for serving, generating and evicting banked content."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.bank = ContentBank(LearningContent, path=Path(self.tmp.name) / "bank.sqlite3", min_variants=2)
+
+    def tearDown(self):
+        self.bank.close()
+        self.tmp.cleanup()
+
+    def test_lookup_serves_least_used_variant(self):
+        """Test exact matches and rotation between variants."""
+        self.bank.add(make_content("Python Programming", text="first"))
+        self.bank.add(make_content("Python Programming", text="second"))
+        served = {self.bank.lookup("python  programming", "beginner", "lesson").materials[0] for _ in range(2)}
+        self.assertEqual(served, {"first", "second"})
+        self.assertIsNone(self.bank.lookup("Python Programming", "advanced", "lesson"))
+
+    def test_similar_topics_match(self):
+        """Test embedding-based topic matching."""
+        self.bank.add(make_content("Python Programming"))
+        self.assertIsNotNone(self.bank.lookup("programming in python", "beginner", "lesson"))
+        self.assertIsNone(self.bank.lookup("Linear Algebra", "beginner", "lesson"))
+
+    def test_near_miss_topics_do_not_match(self):
+        """Test that topics differing in a word or numeral get their own material."""
+        self.bank.add(make_content("World War II"))
+        self.bank.add(make_content("Data Structures and Algorithms"))
+        self.assertIsNone(self.bank.lookup("World War I", "beginner", "lesson"))
+        self.assertIsNone(self.bank.lookup("Data Structures", "beginner", "lesson"))
+        self.assertIsNotNone(self.bank.lookup("Algorithms and Data Structures", "beginner", "lesson"))
+
+    def test_background_generation_fills_thin_coverage(self):
+        """Test that generation is scheduled once per key and banked."""
+        self.assertTrue(self.bank.needs_generation("Recursion", "beginner", "lesson"))
+        future = self.bank.generate_in_background("Recursion", "beginner", "lesson",
+                                                  lambda: make_content("Recursion"))
+        future.result(timeout=5)
+        self.assertEqual(self.bank.coverage("Recursion", "beginner", "lesson"), 1)
+
+    def test_stats_and_eviction(self):
+        """Test reuse rate tracking and eviction of stale entries."""
+        self.bank.add(make_content("Recursion"))
+        self.bank.lookup("Recursion", "beginner", "lesson")
+        self.bank.lookup("Graphs", "beginner", "lesson")
+        self.assertEqual(self.bank.stats()["reuse_rate"], 0.5)
+        self.assertEqual(self.bank.evict_stale(max_age_days=1), 0)
+        time.sleep(0.01)
+        self.assertEqual(self.bank.evict_stale(max_age_days=0), 1)
+        self.assertEqual(self.bank.stats()["entries"], 0)
+
+class TestUnavailableContentBank(unittest.TestCase):
+    """Test cases for learning sessions when the content bank fails."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.memory = NamespaceManager(root=Path(self.tmp.name) / "namespaces")
+
+    def tearDown(self):
+        self.memory.close()
+        self.tmp.cleanup()
+
+    def test_unavailable_bank_falls_back_to_generation(self):
+        """Test that a failing bank lookup generates the content instead of failing the session."""
+        generated = make_content("Python", text="fresh lesson")
+        with mock.patch("ai_agents_hub.agents.adaptive_learning_agent.generate_learning_content",
+                        return_value=generated):
+            results = process_learning("student-1", "Python", content_bank=LockedBank(), memory=self.memory)
+        self.assertNotIn("error", results)
+        self.assertEqual((results["content"], results["content_source"]), ("fresh lesson", "generated"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+"""Test cases for the per-agent chat history."""
+
+import unittest
+
+from ai_agents_hub.ui.history import ChatHistory, make_preview
+
+class TestChatHistory(unittest.TestCase):
+    """Test cases for storing and windowing chat messages."""
+
+    def test_histories_are_per_agent(self):
+        """Test that agents do not share messages."""
+        history = ChatHistory()
+        history.append("General Chat", "user", "hello")
+        history.append("Code Review", "user", "review this")
+        self.assertEqual(history.count("General Chat"), 1)
+        self.assertEqual(history.window("Code Review", 10)[0][1].display, "review this")
+
+    def test_window_returns_latest_messages(self):
+        """Test that only the latest messages are returned, oldest first."""
+        history = ChatHistory()
+        for i in range(50):
+            history.append("General Chat", "user", f"message {i}")
+        window = history.window("General Chat", 3)
+        self.assertEqual([index for index, _ in window], [47, 48, 49])
+        self.assertEqual(window[-1][1].display, "message 49")
+
+    def test_long_code_is_compressed_with_preview(self):
+        """Test compact storage of large code blocks."""
+        code = "\n".join(f"x{i} = {i}" for i in range(500))
+        content = f"Analyzing code:\n```\n{code}\n```"
+        history = ChatHistory()
+        history.append("Code Analysis", "user", content)
+        entry = history.window("Code Analysis", 1)[0][1]
+        self.assertTrue(entry.truncated)
+        self.assertIn("485 more lines", entry.display)
+        self.assertEqual(history.content("Code Analysis", 0), content)
+        self.assertLess(history.stored_bytes(), len(content))
+
+    def test_preview_keeps_short_messages(self):
+        """Test that short messages are displayed unchanged."""
+        self.assertEqual(make_preview("```\nx = 1\n```"), "```\nx = 1\n```")
+
+if __name__ == '__main__':
+    unittest.main()
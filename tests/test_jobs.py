@@ -0,0 +1,127 @@
+"""Test cases for the background job queue."""
+
+import tempfile
+import time
+import sqlite3
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from ai_agents_hub.agents.background import _worker_agent
+from ai_agents_hub.core.jobs import FAILED, QUEUED, RUNNING, SUCCEEDED, JobQueue
+
+def fail(payload):
+    raise ValueError("bad input")
+
+class StubAgent:
+    """Agent stand-in that keeps a chat history like praisonaiagents agents."""
+
+    def __init__(self):
+        self.chat_history = []
+
+class TestJobQueue(unittest.TestCase):
+    """Test cases for submitting, claiming and running jobs."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.queue = JobQueue(
+            path=Path(self.tmp.name) / "jobs.sqlite3",
+            handlers={"echo": lambda payload: {"echo": payload["text"]}, "fail": fail},
+            poll_interval=0.05,
+        )
+
+    def tearDown(self):
+        self.queue.stop_workers(timeout=5)
+        self.tmp.cleanup()
+
+    def wait_for(self, job_id, timeout=5):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            job = self.queue.get(job_id)
+            if job.done:
+                return job
+            time.sleep(0.02)
+        self.fail(f"job {job_id} did not finish")
+
+    def test_identical_submissions_are_deduplicated(self):
+        """Test that the same kind and payload map to one job."""
+        first = self.queue.submit("echo", {"text": "hi"})
+        self.assertEqual(self.queue.submit("echo", {"text": "hi"}), first)
+        self.assertNotEqual(self.queue.submit("echo", {"text": "other"}), first)
+        self.assertEqual(self.queue.get(first).status, QUEUED)
+
+    def test_dedupe_ttl_per_kind(self):
+        """Test that a kind with no TTL only merges submissions with unfinished jobs."""
+        self.queue.dedupe_ttls["session"] = 0.0
+        self.queue.register("session", lambda payload: "started")
+        self.queue.start_workers(1)
+        echo = self.wait_for(self.queue.submit("echo", {"text": "hi"}))
+        session = self.wait_for(self.queue.submit("session", {"topic": "sql"}))
+        self.assertEqual(self.queue.submit("echo", {"text": "hi"}), echo.id)
+        self.assertNotEqual(self.queue.submit("session", {"topic": "sql"}), session.id)
+
+    def test_jobs_of_a_dead_worker_are_requeued_after_the_lease(self):
+        """Test that a running job without heartbeats is queued again, and one with them is not."""
+        self.queue.lease = 0.3
+        abandoned = self.queue.submit("echo", {"text": "abandoned"})
+        alive = self.queue.submit("echo", {"text": "alive"})
+        self.queue.claim()
+        self.queue.claim()
+        time.sleep(0.2)
+        self.queue.heartbeat(alive)
+        time.sleep(0.15)
+        self.assertEqual(self.queue.requeue_stale(), 1)
+        self.assertEqual(self.queue.get(abandoned).status, QUEUED)
+        self.assertEqual(self.queue.get(alive).status, RUNNING)
+
+    def test_workers_survive_database_errors(self):
+        """Test that a failing claim is logged and retried instead of stopping the worker."""
+        claim = self.queue.claim
+        errors = iter([sqlite3.OperationalError("database is locked")])
+
+        def flaky_claim():
+            error = next(errors, None)
+            if error is not None:
+                raise error
+            return claim()
+
+        job_id = self.queue.submit("echo", {"text": "hi"})
+        with mock.patch.object(self.queue, "claim", side_effect=flaky_claim), self.assertLogs("ai_agents_hub.core.jobs"):
+            self.queue.start_workers(1)
+            self.assertEqual(self.wait_for(job_id).status, SUCCEEDED)
+
+    def test_claim_respects_priority(self):
+        """Test that higher priorities are claimed first."""
+        low = self.queue.submit("echo", {"text": "low"})
+        high = self.queue.submit("echo", {"text": "high"}, priority=5)
+        self.assertEqual(self.queue.claim().id, high)
+        self.assertEqual(self.queue.claim().id, low)
+        self.assertIsNone(self.queue.claim())
+
+    def test_workers_store_results_and_errors(self):
+        """Test that workers run jobs and keep results retrievable by id."""
+        self.queue.start_workers(2)
+        ok = self.wait_for(self.queue.submit("echo", {"text": "done"}))
+        self.assertEqual(ok.status, SUCCEEDED)
+        self.assertEqual(ok.result, {"echo": "done"})
+        failed = self.wait_for(self.queue.submit("fail", {}))
+        self.assertEqual(failed.status, FAILED)
+        self.assertIn("bad input", failed.error)
+
+    def test_unknown_kind_is_rejected(self):
+        """Test that jobs without a handler cannot be queued."""
+        with self.assertRaises(ValueError):
+            self.queue.submit("missing", {})
+
+class TestWorkerAgents(unittest.TestCase):
+    """Test cases for the warm agents kept by job workers."""
+
+    def test_jobs_start_from_an_empty_history(self):
+        """Test that a reused agent does not carry earlier jobs' exchanges."""
+        agent = _worker_agent("stub", StubAgent)
+        agent.chat_history.append({"role": "user", "content": "another user's code"})
+        self.assertIs(_worker_agent("stub", StubAgent), agent)
+        self.assertEqual(agent.chat_history, [])
+
+if __name__ == '__main__':
+    unittest.main()
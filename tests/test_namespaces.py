@@ -0,0 +1,108 @@
+"""Test cases for per-user memory namespaces."""
+
+import tempfile
+import unittest
+from datetime import datetime
+
+from ai_agents_hub.agents.chat_agent import ChatSession, process_chat
+from ai_agents_hub.core.namespaces import NamespaceManager, namespace_for
+from ai_agents_hub.core.ollama import OllamaClient
+from benchmarks.fake_ollama import FakeOllamaConfig, FakeOllamaServer
+
+class TestNamespaceManager(unittest.TestCase):
+    """Test cases for isolation, quotas and eviction."""
+
+    def setUp(self):
+        self.manager = NamespaceManager(root=tempfile.mkdtemp(), max_items=3, max_bytes=10_000, max_hot=2)
+
+    def tearDown(self):
+        self.manager.close()
+
+    def test_namespace_for_is_stable_and_safe(self):
+        """Test that caller ids map to stable, distinct, path-safe names."""
+        self.assertEqual(namespace_for("Alice Smith"), namespace_for("Alice Smith"))
+        self.assertNotEqual(namespace_for("alice"), namespace_for("Alice"))
+        self.assertRegex(namespace_for("../../etc/passwd"), r"^[a-z0-9][a-z0-9-]*$")
+        with self.assertRaises(ValueError):
+            self.manager.search("../escape", "query")
+
+    def test_namespaces_are_isolated(self):
+        """Test that a search only sees the caller's own entries."""
+        alice, bob = namespace_for("alice"), namespace_for("bob")
+        self.manager.remember(alice, "my favourite language is rust")
+        self.manager.remember(bob, "my favourite language is haskell")
+        results = self.manager.search(alice, "favourite language")
+        self.assertEqual([entry.text for entry in results], ["my favourite language is rust"])
+
+    def test_item_quota_evicts_least_recently_used(self):
+        """Test that going over the quota drops the coldest entries."""
+        ns = namespace_for("carol")
+        self.manager.remember(ns, "python decorators wrap functions")
+        self.manager.remember(ns, "sql joins combine tables")
+        self.manager.remember(ns, "git rebase rewrites history")
+        self.manager.search(ns, "python decorators", limit=1)
+        self.manager.remember(ns, "docker images are layered")
+        texts = {entry.text for entry in self.manager.search(ns, "python sql git docker", limit=10, min_score=0)}
+        self.assertEqual(self.manager.usage(ns).items, 3)
+        self.assertIn("python decorators wrap functions", texts)
+        self.assertNotIn("sql joins combine tables", texts)
+
+    def test_records_are_listed_not_searched(self):
+        """Test that record kinds are kept out of similarity search and listed in order."""
+        ns = namespace_for("dave")
+        self.manager.remember(ns, '{"score": 1.0, "topic": "python"}', kind="performance")
+        self.manager.remember(ns, '{"score": 0.0, "topic": "python"}', kind="performance")
+        self.assertEqual(self.manager.search(ns, '{"score": 1.0, "topic": "python"}', min_score=0), [])
+        records = self.manager.entries(ns, "performance")
+        self.assertEqual([entry.text for entry in records],
+                         ['{"score": 1.0, "topic": "python"}', '{"score": 0.0, "topic": "python"}'])
+        self.assertEqual(len(self.manager.entries(ns, "performance", limit=1)), 1)
+
+    def test_oversized_entry_is_rejected(self):
+        """Test that a single entry larger than the byte quota is refused."""
+        with self.assertRaises(ValueError):
+            self.manager.remember(namespace_for("dave"), "x" * 20_000)
+
+    def test_cold_namespaces_are_evicted_to_disk(self):
+        """Test that only max_hot namespaces stay loaded and evicted data survives."""
+        names = [namespace_for(f"user-{i}") for i in range(3)]
+        for name in names:
+            self.manager.remember(name, f"note for {name}")
+        self.assertEqual(self.manager.hot_namespaces(), names[1:])
+        self.assertFalse(self.manager.usage(names[0]).hot)
+        self.assertEqual(len(self.manager.search(names[0], f"note for {names[0]}")), 1)
+        self.assertEqual(self.manager.hot_namespaces(), [names[2], names[0]])
+
+class TestChatMemory(unittest.TestCase):
+    """Test cases for memory recall in chat sessions."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeOllamaServer(FakeOllamaConfig(response_tokens=5)).start()
+        cls.client = OllamaClient(base_url=cls.server.url)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def new_session(self, session_id, namespace):
+        now = datetime.now()
+        return ChatSession(session_id=session_id, messages=[], start_time=now, last_activity=now,
+                           metadata={}, namespace=namespace)
+
+    def test_later_session_recalls_earlier_exchange(self):
+        """Test that a new session of the same user gets earlier notes, other users do not."""
+        manager = NamespaceManager(root=tempfile.mkdtemp())
+        alice = namespace_for("alice")
+        process_chat("my project uses fastapi and postgres", self.new_session("s1", alice),
+                     client=self.client, memory=manager)
+        same_user = process_chat("which database does my project use", self.new_session("s2", alice),
+                                 client=self.client, memory=manager)
+        other_user = process_chat("which database does my project use",
+                                  self.new_session("s3", namespace_for("bob")), client=self.client, memory=manager)
+        self.assertGreater(int(same_user.context["prompt_eval_count"]), int(other_user.context["prompt_eval_count"]))
+        self.assertEqual(manager.usage(alice).items, 2)
+        manager.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Test cases for per-request profiling."""
+
+import os
+import pstats
+import tempfile
+import threading
+import tracemalloc
+import unittest
+from unittest import mock
+
+from ai_agents_hub.core.profiling import profile_request, profiling_enabled_by_default
+
+def build_table(n):
+    return [str(i) * 10 for i in range(n)]
+
+class TestProfileRequest(unittest.TestCase):
+    """Test cases for profile_request."""
+
+    def test_report_has_functions_and_allocations(self):
+        """Test that the report names the hot function and its allocations."""
+        with profile_request("table") as capture:
+            table = build_table(20000)
+        report = capture.report
+        self.assertEqual(report.label, "table")
+        self.assertIn("build_table", [stat.function for stat in report.top_functions])
+        self.assertGreater(report.peak_memory_kb, 100)
+        self.assertTrue(any("test_profiling.py" in stat.location for stat in report.top_allocations))
+        self.assertEqual(len(table), 20000)
+
+    def test_prof_data_loads_with_pstats(self):
+        """Test that the downloadable .prof data is a valid pstats file."""
+        with profile_request("table") as capture:
+            build_table(100)
+        with tempfile.NamedTemporaryFile(suffix=".prof", delete=False) as handle:
+            handle.write(capture.prof_data)
+        try:
+            stats = pstats.Stats(handle.name)
+            self.assertTrue(any(name == "build_table" for _, _, name in stats.stats))
+        finally:
+            os.unlink(handle.name)
+
+    def test_tracemalloc_is_only_on_during_the_request(self):
+        """Test that profiling does not leave tracemalloc running."""
+        was_tracing = tracemalloc.is_tracing()
+        with profile_request("noop"):
+            self.assertTrue(tracemalloc.is_tracing())
+        self.assertEqual(tracemalloc.is_tracing(), was_tracing)
+
+    def test_overlapping_requests(self):
+        """Test that a request finishing first does not stop tracing under another one."""
+        was_tracing = tracemalloc.is_tracing()
+        first_inside, first_done = threading.Event(), threading.Event()
+        captures = {}
+
+        def first():
+            with profile_request("first") as captures["first"]:
+                first_inside.set()
+                first_done.wait(5)
+
+        thread = threading.Thread(target=first)
+        thread.start()
+        first_inside.wait(5)
+        with profile_request("second") as captures["second"]:
+            first_done.set()
+            thread.join(5)
+            self.assertTrue(tracemalloc.is_tracing())
+            build_table(1000)
+        self.assertEqual(tracemalloc.is_tracing(), was_tracing)
+        self.assertIsNone(captures["second"].report.error)
+        self.assertTrue(captures["first"].report.overlapped and captures["second"].report.overlapped)
+        # Only one request holds cProfile at a time, whatever the interpreter allows
+        self.assertTrue(captures["first"].report.functions_profiled)
+        self.assertFalse(captures["second"].report.functions_profiled)
+        self.assertEqual((captures["second"].report.top_functions, captures["second"].prof_data), ([], b""))
+        with profile_request("alone") as capture:
+            pass
+        self.assertFalse(capture.report.overlapped)
+        self.assertTrue(capture.report.functions_profiled)
+
+    def test_busy_profiler_runs_the_request_unprofiled(self):
+        """Test that a profiler already active in the process does not fail the request."""
+        with mock.patch("cProfile.Profile.enable", side_effect=ValueError("Another profiling tool is already active")):
+            with profile_request("busy") as capture:
+                build_table(100)
+        self.assertFalse(capture.report.functions_profiled)
+        self.assertIsNone(capture.report.error)
+        with profile_request("free") as capture:
+            build_table(100)
+        self.assertTrue(capture.report.functions_profiled)
+
+    def test_errors_are_recorded_and_raised(self):
+        """Test that a failing request still produces a report."""
+        capture = None
+        with self.assertRaises(ValueError):
+            with profile_request("failing") as capture:
+                raise ValueError("boom")
+        self.assertEqual(capture.report.error, "ValueError: boom")
+
+    def test_debug_env_var_enables_profiling(self):
+        """Test that AI_AGENTS_HUB_DEBUG turns profiling on by default."""
+        with mock.patch.dict(os.environ, {"AI_AGENTS_HUB_DEBUG": "1"}):
+            self.assertTrue(profiling_enabled_by_default())
+        with mock.patch.dict(os.environ, {"AI_AGENTS_HUB_DEBUG": "0"}):
+            self.assertFalse(profiling_enabled_by_default())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Test cases for the code prompt compactor."""
+
+import unittest
+
+from ai_agents_hub.agents.code_review_agent import build_review_prompt
+from ai_agents_hub.core.prompt_compactor import compact_code, estimate_tokens, remap_line_references
+
+LICENSED = """#!/usr/bin/env python
+# Copyright (c) 2024 Example Corp.
+# Licensed under the Apache License, Version 2.0.
+# You may not use this file except in compliance with the License.
+
+import os
+
+
+def main():
+    return os.getcwd()
+"""
+
+class TestPromptCompactor(unittest.TestCase):
+    """Test cases for compact_code and line remapping."""
+
+    def test_license_header_is_collapsed(self):
+        """Test that a license header becomes one placeholder line."""
+        compacted = compact_code(LICENSED)
+        lines = compacted.text.splitlines()
+        self.assertEqual(lines[0], "#!/usr/bin/env python")
+        self.assertEqual(lines[1], "# [license header omitted: lines 2-5]")
+        self.assertNotIn("Apache", compacted.text)
+        self.assertLess(compacted.compact_tokens, compacted.original_tokens)
+
+    def test_line_map_points_at_original_lines(self):
+        """Test that every kept line maps back to its original number."""
+        compacted = compact_code(LICENSED)
+        original = LICENSED.splitlines()
+        for index, line in enumerate(compacted.text.splitlines(), start=1):
+            if not line.lstrip().startswith("# ["):
+                self.assertEqual(original[compacted.original_line(index) - 1].strip(), line.strip())
+
+    def test_indentation_artefacts_are_removed(self):
+        """Test that a uniformly indented paste is dedented, keeping relative indentation."""
+        compacted = compact_code("        def f():\n            return 1   \n")
+        self.assertEqual(compacted.text, "def f():\n    return 1")
+
+    def test_generated_and_minified_sections(self):
+        """Test that generated regions, minified lines and data blobs are elided."""
+        code = "\n".join([
+            "x = 1",
+            "# BEGIN GENERATED CODE",
+            *[f"y{i} = {i}" for i in range(50)],
+            "# END GENERATED CODE",
+            "blob = '" + "QUJD" * 100 + "'",
+            "a=1;" * 150,
+            "z = 2",
+        ])
+        compacted = compact_code(code)
+        self.assertIn("# [generated/vendored section omitted: lines 2-53]", compacted.text)
+        self.assertIn("<400 chars>", compacted.text)
+        self.assertIn("minified line 55 omitted", compacted.text)
+        self.assertEqual(compacted.original_line(len(compacted.line_map)), 56)
+
+    def test_only_tool_markers_make_a_generated_file(self):
+        """Test that hand-written "do not edit" notes keep the whole file."""
+        body = [f"value_{i} = {i}" for i in range(60)]
+        compacted = compact_code("\n".join(["import os", "# Do not edit this without asking ops", *body]))
+        self.assertEqual(compacted.omitted, [])
+        self.assertTrue(compacted.text.endswith("value_59 = 59"))
+
+        go = compact_code("\n".join(["// Code generated by protoc-gen-go. DO NOT EDIT.", *body]))
+        self.assertIn("// [rest of generated file omitted: lines 22-61]", go.text)
+        flagged = compact_code("\n".join(["# @generated by tool", *body]))
+        self.assertIn("generated file (lines 22-61)", flagged.omitted)
+
+    def test_long_comments_keep_their_start(self):
+        """Test that a long comment run keeps its first lines."""
+        code = "\n".join(["def f():"] + [f"    # note {i}" for i in range(10)] + ["    return 1"])
+        compacted = compact_code(code, max_comment_lines=5)
+        self.assertIn("    # note 1", compacted.text)
+        self.assertIn("    # [8 comment lines omitted: lines 4-11]", compacted.text)
+        self.assertNotIn("note 5", compacted.text)
+
+    def test_preprocessor_directives_are_not_comments(self):
+        """Test that C includes are kept even in long runs."""
+        code = "\n".join(f"#include <lib{i}.h>" for i in range(8))
+        self.assertEqual(compact_code(code).text, code)
+
+    def test_remap_line_references(self):
+        """Test that line references in replies are rewritten."""
+        compacted = compact_code(LICENSED)
+        reply = remap_line_references("Problem on line 5, see lines 4-5 and L5.", compacted)
+        self.assertEqual(reply, "Problem on line 9, see lines 7-9 and L9.")
+
+    def test_review_prompt_has_no_indentation_artefacts(self):
+        """Test that the prompt template does not indent the code."""
+        prompt = build_review_prompt("a = 1\nb = 2")
+        self.assertIn("```\na = 1\nb = 2\n```", prompt)
+        self.assertFalse(any(line.startswith("    ") for line in prompt.splitlines()))
+
+    def test_estimate_tokens(self):
+        """Test the token estimate on simple input."""
+        self.assertEqual(estimate_tokens("x = 1"), 3)
+        self.assertEqual(estimate_tokens("    return"), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""Test cases for the local intent router."""
+
+import unittest
+
+from ai_agents_hub.core.router import IntentRouter, extract_code, extract_learning_topic
+
+class TestIntentRouter(unittest.TestCase):
+    """Test cases for routing General Chat input."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.router = IntentRouter()
+
+    def test_fenced_code_goes_to_review(self):
+        """Test that pasted code is sent to the code review agent."""
+        decision = self.router.route("Is this OK?\n```python\ndef f(x):\n    return x\n```")
+        self.assertEqual(decision.route, "code_review")
+        self.assertGreaterEqual(decision.confidence, 0.9)
+
+    def test_code_with_analysis_request(self):
+        """Test that analysis wording sends code to the analysis agent."""
+        decision = self.router.route("Analyze the complexity of this:\nfor i in a:\n    for j in b:\n        total += i * j")
+        self.assertEqual(decision.route, "code_analysis")
+
+    def test_learning_request(self):
+        """Test that learning requests go to the adaptive learning workflow."""
+        self.assertEqual(self.router.route("Teach me recursion in Python").route, "learning")
+        self.assertEqual(self.router.route("I want to practice for my SQL interview").route, "learning")
+
+    def test_best_practice_question_is_not_a_learning_request(self):
+        """Test that "best practice" wording does not start a learning session."""
+        decision = self.router.route("What is the best practice for error handling in Go?")
+        self.assertNotEqual(decision.route, "learning")
+
+    def test_requests_without_code_stay_with_chat(self):
+        """Test that review wording, stray ";" or "{" and lesson or tutorial mentions are not dispatched."""
+        for message in ["How do I fix this error in my code?", "Can you review my essay draft?",
+                        "what is a lesson plan template?", "Write me a cover letter for a tutorial writer job",
+                        "Buy milk;\nand eggs {\nthen call mom;"]:
+            with self.subTest(message=message):
+                self.assertEqual(self.router.route(message).route, "chat")
+
+    def test_unfenced_code_needs_several_code_lines(self):
+        """Test that a few pasted code lines are still recognized without a fence."""
+        decision = self.router.route("why does this crash\nx = load()\nprint(x[0]);\nreturn x")
+        self.assertEqual(decision.route, "code_review")
+
+    def test_document_question(self):
+        """Test that document questions go to the knowledge agent."""
+        self.assertEqual(self.router.route("What does the paper say about page retrieval?").route, "knowledge")
+
+    def test_small_talk_stays_with_chat(self):
+        """Test that general conversation is not dispatched."""
+        decision = self.router.route("What's the weather like today?")
+        self.assertEqual(decision.route, "chat")
+        self.assertEqual(set(decision.scores), {"chat", "knowledge", "code_analysis", "code_review", "learning"})
+
+    def test_routing_is_fast(self):
+        """Test that routing stays within single-digit milliseconds."""
+        decision = self.router.route("Can you help me organize my tasks for today and plan my week?")
+        self.assertLess(decision.elapsed_ms, 10)
+
+    def test_extractors(self):
+        """Test code and topic extraction helpers."""
+        self.assertEqual(extract_code("see\n```py\nx = 1\n```"), "x = 1")
+        self.assertEqual(extract_learning_topic("Teach me about graph theory!"), "graph theory")
+        self.assertEqual(extract_learning_topic("Let's practice on binary search"), "binary search")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+"""Test cases for local answer grading and difficulty adaptation."""
+
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from ai_agents_hub.agents.adaptive_learning_agent import (
+    Exercise,
+    LearningContent,
+    PerformanceMetric,
+    extract_exercises,
+    grade_exercise,
+    load_performance_history,
+    process_learning,
+    record_performance,
+)
+from ai_agents_hub.core.content_bank import ContentBank
+from ai_agents_hub.core.namespaces import NamespaceManager
+from ai_agents_hub.core.scoring import estimate_ability, grade_answer, parse_number, recommend_difficulty
+
+def make_history(scores, difficulty="beginner", topic="Python"):
+    start = datetime(2024, 1, 1)
+    return [
+        PerformanceMetric(score=score, topic=topic, timestamp=start + timedelta(minutes=i), difficulty=difficulty)
+        for i, score in enumerate(scores)
+    ]
+
+class TestGrading(unittest.TestCase):
+    """Test cases for grade_answer."""
+
+    def test_exact_and_normalized_matches(self):
+        """Test that case, punctuation and articles are ignored."""
+        self.assertEqual(grade_answer("list", "list").method, "exact")
+        grade = grade_answer("The Global Interpreter Lock", "global interpreter lock.")
+        self.assertEqual((grade.score, grade.method), (1.0, "normalized"))
+
+    def test_empty_and_article_answers_are_wrong(self):
+        """Test that a one-letter choice is not matched by blanks, articles or punctuation."""
+        for response in ["", "the", "an", "?", "  "]:
+            with self.subTest(response=response):
+                self.assertFalse(grade_answer("A", response, "multiple_choice").correct)
+        self.assertTrue(grade_answer("A", "a", "multiple_choice").correct)
+        self.assertTrue(grade_answer("A", "a.", "multiple_choice").correct)
+
+    def test_numeric_tolerance(self):
+        """Test numbers in different notations and within tolerance."""
+        self.assertEqual(parse_number("1,000"), 1000.0)
+        self.assertEqual(parse_number("3/4"), 0.75)
+        self.assertEqual(parse_number("75%"), 0.75)
+        self.assertEqual(parse_number("1,234,567.5"), 1234567.5)
+        self.assertIsNone(parse_number("1,2,3"))
+        self.assertFalse(grade_answer("123", "1,2,3").correct)
+        self.assertTrue(grade_answer("0.75", "3/4").correct)
+        self.assertTrue(grade_answer("3.14159", "3.14").correct)
+        grade = grade_answer("42", "41")
+        self.assertEqual((grade.correct, grade.method), (False, "numeric"))
+
+    def test_free_text_uses_similarity(self):
+        """Test partial credit for free text but not for strict exercise types."""
+        expected = "a function that calls itself until it reaches a base case"
+        close = grade_answer(expected, "a function calling itself until reaching the base case", "open")
+        off = grade_answer(expected, "a loop over a list", "open")
+        self.assertEqual(close.method, "similarity")
+        self.assertGreater(close.score, off.score)
+        self.assertEqual(grade_answer("B", "C", "multiple_choice").score, 0.0)
+
+    def test_missing_reference_is_ungraded(self):
+        """Test exercises without an answer."""
+        self.assertEqual(grade_answer(None, "anything").method, "ungraded")
+
+    def test_grade_exercise_builds_a_metric(self):
+        """Test that graded exercises become performance metrics."""
+        exercise = Exercise(question="2 + 2?", answer="4", difficulty="beginner", type="numeric")
+        metric = grade_exercise(exercise, "4.0", "Arithmetic")
+        self.assertEqual((metric.score, metric.difficulty, metric.topic), (1.0, "beginner", "Arithmetic"))
+        self.assertIn("numeric", metric.feedback)
+
+    def test_exercises_are_split_from_the_lesson(self):
+        """Test that generated exercises are parsed and their answers kept out of the lesson."""
+        raw = ("Recursion is a function calling itself.\n\n## Exercises\n"
+               "1. Q: What is 2 ** 3?\nA: 8\n\n"
+               "**Q2:** Which keyword returns a value?\n**A:** return\n"
+               "Q: Why does recursion need a base case?\nA: to stop the calls from going on forever")
+        lesson, exercises = extract_exercises(raw, "beginner")
+        self.assertEqual(lesson, "Recursion is a function calling itself.")
+        self.assertEqual([exercise.answer for exercise in exercises],
+                         ["8", "return", "to stop the calls from going on forever"])
+        self.assertEqual([exercise.type for exercise in exercises], ["numeric", "short_answer", "open"])
+        self.assertEqual(exercises[1].question, "Which keyword returns a value?")
+
+class TestDifficultyAdaptation(unittest.TestCase):
+    """Test cases for the ability estimate and level recommendation."""
+
+    def test_ability_follows_scores(self):
+        """Test that successes raise the estimate and failures lower it."""
+        strong, _ = estimate_ability([("intermediate", 1.0)] * 5)
+        weak, count = estimate_ability([("intermediate", 0.0)] * 5)
+        self.assertGreater(strong, 0)
+        self.assertLess(weak, 0)
+        self.assertEqual(count, 5)
+
+    def test_recommendation_moves_one_level_at_a_time(self):
+        """Test increase, decrease and the one-step limit."""
+        mastered = recommend_difficulty([("beginner", 1.0)] * 10)
+        self.assertEqual((mastered.level, mastered.adjustment), ("intermediate", "increase"))
+        struggling = recommend_difficulty([("advanced", 0.0)] * 10)
+        self.assertEqual((struggling.level, struggling.adjustment), ("intermediate", "decrease"))
+
+    def test_new_students_start_at_beginner(self):
+        """Test the recommendation without any graded answer."""
+        recommendation = recommend_difficulty([])
+        self.assertEqual((recommendation.level, recommendation.answers), ("beginner", 0))
+
+class TestLocalLearningSession(unittest.TestCase):
+    """Test cases for process_learning without the evaluation agents."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.bank = ContentBank(LearningContent, path=Path(self.tmp.name) / "bank.sqlite3", min_variants=1)
+        self.memory = NamespaceManager(root=Path(self.tmp.name) / "namespaces")
+
+    def tearDown(self):
+        self.bank.close()
+        self.memory.close()
+        self.tmp.cleanup()
+
+    def test_banked_session_needs_no_llm_call(self):
+        """Test that the level comes from the history and the content from the bank."""
+        self.bank.add(LearningContent(topic="Python", difficulty="intermediate", content_type="lesson",
+                                      materials=["banked lesson"], exercises=[], estimated_duration=5))
+        results = process_learning("student-1", "Python", content_bank=self.bank, memory=self.memory,
+                                   history=make_history([1.0] * 8))
+        self.assertNotIn("error", results)
+        self.assertEqual(results["difficulty"], "intermediate")
+        self.assertEqual(results["content"], "banked lesson")
+        self.assertIn("high", results["performance"])
+        self.assertTrue(results["adaptation"].startswith("increase"))
+
+    def test_graded_answers_are_kept_per_student(self):
+        """Test that recorded answers drive the next session and come back with its exercises."""
+        exercise = Exercise(question="2 + 2?", answer="4", difficulty="beginner", type="numeric")
+        self.bank.add(LearningContent(topic="Python", difficulty="intermediate", content_type="lesson",
+                                      materials=["banked lesson"], exercises=[exercise], estimated_duration=5))
+        for metric in make_history([1.0] * 8):
+            record_performance("student-1", metric, memory=self.memory)
+        self.assertEqual(len(load_performance_history("student-1", memory=self.memory)), 8)
+        self.assertEqual(load_performance_history("student-2", memory=self.memory), [])
+        results = process_learning("student-1", "Python", content_bank=self.bank, memory=self.memory)
+        self.assertEqual(results["difficulty"], "intermediate")
+        self.assertEqual(results["exercises"], [exercise.model_dump()])
+
+if __name__ == '__main__':
+    unittest.main()
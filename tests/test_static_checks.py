@@ -0,0 +1,196 @@
+"""Test cases for static checks and the review cascade routing."""
+
+import re
+import unittest
+
+from ai_agents_hub.agents.code_review_agent import (
+    REVIEW_MODEL,
+    TRIAGE_MODEL,
+    escalation_reasons,
+    process_review_cascade,
+    reports_high_severity,
+)
+from ai_agents_hub.core.static_checks import analyze_chunk, analyze_code, chunk_code
+
+CLEAN = '''def add(a, b):
+    return a + b
+
+
+@staticmethod
+def double(x):
+    return x * 2
+'''
+
+INSECURE = '''import subprocess
+
+def run(cmd):
+    subprocess.run(cmd, shell=True)
+'''
+
+GO = """package main
+
+import "fmt"
+
+// add returns the sum of two numbers.
+func add(a int, b int) int {
+	if a < 0 {
+		return b
+	}
+	return a + b
+}
+
+func main() {
+	fmt.Println(add(1, 2))
+}
+"""
+
+JAVASCRIPT = """const express = require('express');
+
+function total(items) {
+  let sum = 0;
+  for (const item of items) {
+    sum += item.price * item.quantity;
+  }
+  return sum;
+}
+
+module.exports = { total };
+"""
+
+class RecordingAgent:
+    """Stands in for an Agent, replying with a fixed review."""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.prompts = []
+
+    def start(self, prompt):
+        self.prompts.append(prompt)
+        return self.reply
+
+class CitingAgent:
+    """Stands in for an Agent, citing the prompt line that contains some text."""
+
+    def __init__(self, needle):
+        self.needle = needle
+        self.prompts = []
+
+    def start(self, prompt):
+        self.prompts.append(prompt)
+        code = re.search(r"```[^\n]*\n(.*?)```", prompt, re.S).group(1).splitlines()
+        line = next(i for i, text in enumerate(code, 1) if self.needle in text)
+        return f"Line {line}: shell=True runs a shell, see lines {line - 1}-{line}."
+
+class TestStaticChecks(unittest.TestCase):
+    """Test cases for chunking and static findings."""
+
+    def test_chunks_split_at_definitions(self):
+        """Test that decorators stay with their definition."""
+        chunks = chunk_code(CLEAN)
+        self.assertEqual([(c.start_line, c.end_line) for c in chunks], [(1, 4), (5, 7)])
+        self.assertTrue(chunks[1].text.startswith("@staticmethod"))
+
+    def test_chunks_respect_max_lines(self):
+        """Test that long definitions are cut at max_lines."""
+        code = "\n".join(f"x{i} = {i}" for i in range(25))
+        self.assertEqual(len(chunk_code(code, max_lines=10)), 3)
+
+    def test_findings_have_absolute_line_numbers(self):
+        """Test line rules and the mutable default check."""
+        code = "\n\ndef f(items=[]):\n    return eval(items[0])\n"
+        signals = analyze_code(code)[0]
+        found = {(f.description, f.line_number) for f in signals.findings}
+        self.assertIn(("Dynamic code execution with eval/exec", 4), found)
+        self.assertIn(("Mutable default argument in f()", 3), found)
+        self.assertEqual(signals.max_severity, "high")
+
+    def test_parse_confidence(self):
+        """Test that unparseable text gets a low parse confidence."""
+        self.assertEqual(analyze_code(CLEAN)[0].parse_confidence, 1.0)
+        chunk = chunk_code("this is not code at all\njust prose")[0]
+        self.assertLess(analyze_chunk(chunk).parse_confidence, 0.6)
+        self.assertLess(analyze_code("function f(x) {\n  if (x) {\n    return 1;\n")[0].parse_confidence, 0.6)
+
+    def test_only_risky_imports_are_security_sensitive(self):
+        """Test that everyday modules do not mark a chunk as security-sensitive."""
+        everyday = "import os\nimport hashlib\nimport requests\nfrom urllib.parse import urljoin\n"
+        self.assertFalse(analyze_code(everyday)[0].security_sensitive)
+        self.assertTrue(analyze_code("import pickle\n")[0].security_sensitive)
+        self.assertTrue(analyze_code("from os import system\n")[0].security_sensitive)
+
+    def test_indented_chunks_are_parsed(self):
+        """Test that a chunk cut from inside a class is dedented before parsing."""
+        chunk = chunk_code("    def method(self, items=[]):\n        return items\n")[0]
+        signals = analyze_chunk(chunk)
+        self.assertEqual(signals.parse_confidence, 1.0)
+        self.assertEqual([f.line_number for f in signals.findings], [1])
+
+    def test_escalation_reasons(self):
+        """Test which signals send a chunk to the full model."""
+        self.assertEqual(escalation_reasons(analyze_code(CLEAN)[0]), [])
+        reasons = escalation_reasons(analyze_code(INSECURE)[-1])
+        self.assertIn("high-severity static finding", reasons)
+        self.assertIn("security-sensitive code", reasons)
+
+class TestReviewCascade(unittest.TestCase):
+    """Test cases for cascade routing with stand-in agents."""
+
+    def test_clean_code_stays_on_triage_model(self):
+        """Test that clean code is reviewed by the small model only."""
+        triage, full = RecordingAgent("Looks fine."), RecordingAgent("Full review.")
+        result = process_review_cascade(CLEAN, triage_agent=triage, review_agent=full)
+        self.assertEqual(len(triage.prompts), 1)
+        self.assertEqual(full.prompts, [])
+        self.assertEqual(result.escalation_rate, 0.0)
+        self.assertTrue(all(chunk.model == TRIAGE_MODEL for chunk in result.chunks))
+
+    def test_clean_go_and_javascript_stay_on_triage_model(self):
+        """Test that well-formed non-Python code is not escalated for failing to parse as Python."""
+        for code in [GO, JAVASCRIPT]:
+            with self.subTest(code=code.splitlines()[0]):
+                triage, full = RecordingAgent("Looks fine."), RecordingAgent("Full review.")
+                result = process_review_cascade(code, triage_agent=triage, review_agent=full)
+                self.assertEqual(full.prompts, [])
+                self.assertEqual(result.escalation_rate, 0.0)
+
+    def test_risky_code_escalates(self):
+        """Test that only the risky chunks go to the full model."""
+        triage, full = RecordingAgent("Looks fine."), RecordingAgent("Full review.")
+        result = process_review_cascade(CLEAN + "\n" + INSECURE, triage_agent=triage, review_agent=full)
+        self.assertEqual(len(full.prompts), 1)
+        self.assertIn("shell=True", full.prompts[0])
+        self.assertNotIn("shell=True", triage.prompts[0])
+        self.assertEqual([chunk.model for chunk in result.chunks].count(REVIEW_MODEL), 2)
+        self.assertTrue(any(issue.description == "Shell command execution" for issue in result.static_issues))
+
+    def test_triage_high_severity_escalates(self):
+        """Test that a high-severity triage reply escalates its chunks."""
+        triage, full = RecordingAgent("Severity: high, possible data loss."), RecordingAgent("Full review.")
+        result = process_review_cascade(CLEAN, triage_agent=triage, review_agent=full)
+        self.assertEqual(len(full.prompts), 1)
+        self.assertEqual(result.escalation_rate, 1.0)
+        self.assertNotIn("data loss", result.review)
+
+    def test_cited_lines_survive_the_round_trip(self):
+        """Test that a line cited by the model comes back as the submitted line number."""
+        filler = "\n".join(f"x{i} = {i}" for i in range(25))
+        code = CLEAN + filler + "\n\ndef run(cmd):\n    subprocess.run(cmd, shell=True)\n"
+        line = code.splitlines().index("    subprocess.run(cmd, shell=True)") + 1
+        full = CitingAgent("shell=True")
+        result = process_review_cascade(code, triage_agent=RecordingAgent("Looks fine."), review_agent=full)
+        # Original numbers in the prompt would be mapped a second time when the model cites them
+        self.assertNotRegex(full.prompts[0], rf"\b{line - 1}\b|\b{line}\b")
+        self.assertIn(f"Line {line}: shell=True runs a shell, see lines {line - 1}-{line}.", result.review)
+
+    def test_negated_severity_does_not_escalate(self):
+        """Test that replies denying severe issues stay with the triage model."""
+        self.assertFalse(reports_high_severity("No vulnerabilities found. There are no critical issues."))
+        self.assertFalse(reports_high_severity("The code isn't vulnerable to injection."))
+        self.assertTrue(reports_high_severity("No tests, but a critical race in the cache."))
+        self.assertTrue(reports_high_severity("Severity: high. The token is logged."))
+        triage, full = RecordingAgent("No vulnerabilities found."), RecordingAgent("Full review.")
+        result = process_review_cascade(CLEAN, triage_agent=triage, review_agent=full)
+        self.assertEqual(full.prompts, [])
+
+if __name__ == '__main__':
+    unittest.main()